@@ -3,40 +3,30 @@
 Full analysis of course categories to plan fixes
 """
 
-import os
-import sys
-from dotenv import load_dotenv
-from supabase import create_client
+import argparse
 
-# Load environment variables
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-load_dotenv(os.path.join(project_root, '.env.local'))
+from catalog_mirror import add_catalog_arguments, catalog_from_args
 
-# Initialize Supabase
-supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+parser = argparse.ArgumentParser(description='Full analysis of course categories')
+add_catalog_arguments(parser)
+args = parser.parse_args()
 
-if not supabase_url or not supabase_key:
-    print("[ERROR] Supabase credentials not found")
-    sys.exit(1)
-
-supabase = create_client(supabase_url, supabase_key)
+# Live API, or the local mirror with --mirror
+catalog = catalog_from_args(args)
 
 print("="*80)
 print("FULL COURSE CATEGORY ANALYSIS")
 print("="*80)
 
 # Get all categories
-categories_result = supabase.table('categories').select('*').execute()
-categories = {cat['id']: cat for cat in categories_result.data}
+categories = {cat['id']: cat for cat in catalog.categories()}
 
 print("\nCategories in database:")
 for cat_id, cat in sorted(categories.items()):
     print(f"  {cat_id}: {cat['name']} (Suite {cat['suite_id']})")
 
 # Get all courses with their categories
-courses_result = supabase.table('courses').select('id, title, category_id').execute()
-courses = courses_result.data
+courses = catalog.courses('id, title, category_id')
 
 # Check for duplicates
 print("\n" + "="*80)
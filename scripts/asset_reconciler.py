@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Diff-based course asset reconciliation
+Compares the assets a run wants against what is already stored and writes
+only the difference, instead of deleting and re-inserting every row
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+from batch_writer import DEFAULT_BATCH_SIZE, format_throughput, write_in_batches
+from table_reader import iter_rows
+
+AssetKey = Tuple[int, str, str]
+
+def asset_key(asset: Dict) -> AssetKey:
+    """Identity of an asset row: (course_id, type, url)"""
+    return (asset['course_id'], asset['type'], asset['url'])
+
+def diff_assets(existing: Iterable[Dict], desired: Iterable[Dict]) -> Tuple[List[Dict], List[Dict], List[int]]:
+    """
+    Work out the writes needed to turn `existing` into `desired`.
+
+    existing rows carry their database id; desired rows do not. Returns
+    (inserts, updates, delete_ids) where updates are existing rows (with id)
+    whose label changed, and delete_ids covers rows no longer wanted plus
+    any duplicate rows sharing a key.
+    """
+    wanted: Dict[AssetKey, Dict] = {}
+    for asset in desired:
+        wanted.setdefault(asset_key(asset), asset)
+
+    kept: Dict[AssetKey, Dict] = {}
+    delete_ids: List[int] = []
+    for row in existing:
+        key = asset_key(row)
+        if key not in wanted or key in kept:
+            delete_ids.append(row['id'])
+        else:
+            kept[key] = row
+
+    inserts: List[Dict] = []
+    updates: List[Dict] = []
+    for key, asset in wanted.items():
+        row = kept.get(key)
+        if row is None:
+            inserts.append({
+                'course_id': asset['course_id'],
+                'type': asset['type'],
+                'url': asset['url'],
+                'label': asset['label']
+            })
+        elif row.get('label') != asset['label']:
+            updates.append({
+                'id': row['id'],
+                'course_id': row['course_id'],
+                'type': row['type'],
+                'url': row['url'],
+                'label': asset['label']
+            })
+
+    return inserts, updates, delete_ids
+
+def reconcile_assets(supabase, course_ids: Iterable[int], desired: List[Dict],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Bring course_assets for `course_ids` in line with `desired`.
+
+    Loads the existing assets (paginated), diffs them in memory and sends
+    only the needed inserts, updates and deletes as bulk requests.
+    """
+    course_ids = set(course_ids)
+
+    existing = [row for row in iter_rows(supabase, 'course_assets', 'id, course_id, type, url, label')
+                if row['course_id'] in course_ids]
+    desired = [asset for asset in desired if asset['course_id'] in course_ids]
+
+    inserts, updates, delete_ids = diff_assets(existing, desired)
+    unchanged = len(existing) - len(updates) - len(delete_ids)
+    print(f"  Assets: {len(inserts)} to insert, {len(updates)} to update, "
+          f"{len(delete_ids)} to delete, {unchanged} unchanged")
+
+    results = {}
+    if inserts:
+        results['Asset inserts'] = write_in_batches(
+            'course_assets insert', inserts,
+            lambda batch: supabase.table('course_assets').insert(batch).execute(),
+            batch_size
+        )
+    if updates:
+        results['Asset updates'] = write_in_batches(
+            'course_assets update', updates,
+            lambda batch: supabase.table('course_assets').upsert(batch).execute(),
+            batch_size
+        )
+    if delete_ids:
+        results['Asset deletes'] = write_in_batches(
+            'course_assets delete', [{'id': asset_id} for asset_id in delete_ids],
+            lambda batch: supabase.table('course_assets').delete().in_(
+                'id', [row['id'] for row in batch]).execute(),
+            batch_size
+        )
+
+    for label, stats in results.items():
+        print(f"  {format_throughput(label, stats)}")
+
+    def written(label: str) -> int:
+        return results[label]['written'] if label in results else 0
+
+    return {
+        'inserted': written('Asset inserts'),
+        'updated': written('Asset updates'),
+        'deleted': written('Asset deletes'),
+        'unchanged': unchanged,
+        'errors': sum(stats['errors'] for stats in results.values())
+    }
+
+def load_assets_by_course(supabase) -> Dict[int, List[Dict]]:
+    """Every stored asset (paginated), grouped by course_id"""
+    by_course: Dict[int, List[Dict]] = {}
+    for row in iter_rows(supabase, 'course_assets', 'id, course_id, type, url, label'):
+        by_course.setdefault(row['course_id'], []).append(row)
+    return by_course
+
+def reconcile_loaded(supabase, existing: List[Dict], desired: List[Dict]) -> Dict:
+    """
+    reconcile_assets for a small set of courses whose stored assets are
+    already loaded: one request per kind of change, nothing printed, so it
+    can run on a writer thread. Failed requests are returned in 'errors'.
+    """
+    inserts, updates, delete_ids = diff_assets(existing, desired)
+    result = {'inserted': 0, 'updated': 0, 'deleted': 0,
+              'unchanged': len(existing) - len(updates) - len(delete_ids), 'errors': []}
+
+    writes = [
+        ('inserted', 'insert', inserts, lambda: supabase.table('course_assets').insert(inserts).execute()),
+        ('updated', 'update', updates, lambda: supabase.table('course_assets').upsert(updates).execute()),
+        ('deleted', 'delete', delete_ids, lambda: supabase.table('course_assets').delete().in_('id', delete_ids).execute()),
+    ]
+    for key, action, rows, write in writes:
+        if not rows:
+            continue
+        try:
+            write()
+            result[key] = len(rows)
+        except Exception as e:
+            result['errors'].append(f"course_assets {action} ({len(rows)} rows) failed: {str(e)}")
+    return result
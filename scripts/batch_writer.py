@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Batched Supabase writes
+Sends rows to a table in fixed-size chunks instead of one request per row,
+either after all rows are known or (PipelinedWriter) on a pool of writer
+threads while the rows are still being produced
+"""
+
+import time
+import queue
+import threading
+from typing import Callable, Dict, Iterator, List
+
+# Rows per PostgREST request. Large enough that a full catalogue sync is a
+# handful of requests, small enough to stay well under request size limits.
+DEFAULT_BATCH_SIZE = 500
+
+# PipelinedWriter: concurrent requests, and full batches allowed to wait for
+# a writer before put() blocks the producer
+DEFAULT_WRITERS = 4
+DEFAULT_QUEUE_SIZE = 8
+
+def chunked(rows: List, size: int) -> Iterator[List]:
+    """Yield consecutive slices of at most `size` rows"""
+    if size < 1:
+        raise ValueError(f"Batch size must be at least 1 (got {size})")
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+def write_in_batches(label: str, rows: List[Dict], write_batch: Callable[[List[Dict]], object],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Dict:
+    """
+    Call write_batch once per chunk of rows and collect per-batch results.
+
+    A failing batch is reported and skipped; the remaining batches still run.
+    The rows of failed batches are returned in 'failed_rows' so callers can
+    avoid dependent writes for them.
+    """
+    stats = {
+        'rows': len(rows),
+        'written': 0,
+        'batches': 0,
+        'errors': 0,
+        'failed_rows': [],
+        'seconds': 0.0
+    }
+
+    total_batches = (len(rows) + batch_size - 1) // batch_size
+    started = time.perf_counter()
+
+    for number, batch in enumerate(chunked(rows, batch_size), start=1):
+        stats['batches'] += 1
+        try:
+            write_batch(batch)
+            stats['written'] += len(batch)
+        except Exception as e:
+            stats['errors'] += 1
+            stats['failed_rows'].extend(batch)
+            print(f"  [ERROR] {label} batch {number}/{total_batches} ({len(batch)} rows) failed: {str(e)}")
+
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+class PipelinedWriter:
+    """
+    write_in_batches for rows that arrive one at a time.
+
+    Rows passed to put() are grouped into batches, which a pool of worker
+    threads hands to write_batch while the producer keeps going. put()
+    blocks once queue_size full batches are waiting, so memory stays
+    bounded when the writers fall behind. close() flushes the last batch
+    (unless told not to), waits for the workers and returns the
+    write_in_batches stats (plus each successful batch's return value in
+    'results'); failures are reported by batch number in batch order,
+    whichever worker finished first.
+    """
+
+    def __init__(self, label: str, write_batch: Callable[[List[Dict]], object],
+                 batch_size: int = DEFAULT_BATCH_SIZE, workers: int = DEFAULT_WRITERS,
+                 queue_size: int = DEFAULT_QUEUE_SIZE):
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be at least 1 (got {batch_size})")
+        self.label = label
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.pending: List[Dict] = []
+        self.batches: List[List[Dict]] = []
+        self.outcomes: Dict[int, tuple] = {}
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.workers = [threading.Thread(target=self._work, daemon=True) for _ in range(max(workers, 1))]
+        for worker in self.workers:
+            worker.start()
+
+    def put(self, row: Dict):
+        self.pending.append(row)
+        if len(self.pending) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self.pending:
+            self.batches.append(self.pending)
+            self.queue.put((len(self.batches), self.pending))
+            self.pending = []
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            number, batch = item
+            try:
+                outcome = (True, self.write_batch(batch))
+            except Exception as e:
+                outcome = (False, e)
+            with self.lock:
+                self.outcomes[number] = outcome
+
+    def close(self, flush: bool = True) -> Dict:
+        """
+        Write what is left, stop the workers and collect the results in
+        batch order. With flush=False (after a failure upstream) the
+        unfinished batch is dropped; batches already queued still finish.
+        """
+        if flush:
+            self._flush()
+        else:
+            self.pending = []
+        for _ in self.workers:
+            self.queue.put(None)
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
+
+        stats = {
+            'rows': sum(len(batch) for batch in self.batches),
+            'written': 0,
+            'batches': len(self.batches),
+            'errors': 0,
+            'failed_rows': [],
+            'results': [],
+            'seconds': time.perf_counter() - self.started
+        }
+        for number, batch in enumerate(self.batches, start=1):
+            ok, value = self.outcomes[number]
+            if ok:
+                stats['written'] += len(batch)
+                stats['results'].append(value)
+            else:
+                stats['errors'] += 1
+                stats['failed_rows'].extend(batch)
+                print(f"  [ERROR] {self.label} batch {number}/{len(self.batches)} ({len(batch)} rows) failed: {str(value)}")
+        self.batches = []
+        self.outcomes = {}
+        return stats
+
+def format_throughput(label: str, stats: Dict) -> str:
+    """One-line summary of a write_in_batches result"""
+    seconds = stats['seconds']
+    rate = stats['written'] / seconds if seconds > 0 else float(stats['written'])
+    return (f"{label}: {stats['written']}/{stats['rows']} rows in {stats['batches']} batches, "
+            f"{stats['errors']} failed, {seconds:.2f}s ({rate:.0f} rows/s)")
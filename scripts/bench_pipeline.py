@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the scrape/parse/save pipeline
+Runs each VideoTileScraper stage and DescriptionParser.parse_html_file on
+the course-listings/ suite files and the admin page, scaled to 1x/10x/100x
+the course count, and writes wall time, peak memory and HTTP/database
+request counts per stage as JSON so runs can be compared (--compare)
+"""
+
+import io
+import os
+import re
+import copy
+import json
+import time
+import platform
+import argparse
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from fake_supabase import FakeSupabase, LatencyModel
+from http_cache import HTTPCache
+from parse_descriptions import DescriptionParser, parse_listing_file
+from scrape_videotile import ADMIN_URL, SUITE_MAPPING, VideoTileScraper
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LISTINGS_DIR = os.path.join(project_root, 'course-listings')
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'bench')
+
+DEFAULT_SCALES = (1, 10, 100)
+
+STAGES = ['fetch_page', 'parse_courses', 'construct_icons', 'parse_descriptions',
+          'construct_assets', 'save_to_supabase', 'parse_html_file']
+
+# Copy k of a page renumbers its course IDs by k * ID_OFFSET (real IDs are < 1000)
+ID_OFFSET = 100000
+ID_PATTERN = re.compile(r'(course|nid=|trial=|embed/|info_)(\d+)')
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+def scale_page(html: str, factor: int) -> str:
+    """
+    Repeat the course markup of a page `factor` times with distinct IDs.
+
+    The repeated region is the <body> contents, or everything after the
+    last stylesheet for the body-less suite files.
+    """
+    if factor == 1:
+        return html
+    match = re.search(r'<body[^>]*>(.*)</body>', html, re.S | re.I)
+    if match:
+        start, end = match.span(1)
+    else:
+        start = html.rfind('</style>')
+        start = 0 if start < 0 else start + len('</style>')
+        end = len(html)
+
+    region = html[start:end]
+    copies = [region]
+    for k in range(1, factor):
+        copies.append(ID_PATTERN.sub(lambda m: f"{m.group(1)}{int(m.group(2)) + k * ID_OFFSET}", region))
+    return html[:start] + ''.join(copies) + html[end:]
+
+def synthesize_admin_page(listing_files: List[str]) -> str:
+    """
+    Admin-page-shaped markup for the courses in the suite files.
+
+    Used when no recorded copy of the admin page is available: a suite
+    header per category, then per course the webContent_courseName
+    paragraph, its description textarea and a moduleListWhite block with
+    the purchase and free trial links.
+    """
+    suites = {name: suite_id for suite_id, name in SUITE_MAPPING.items()}
+    parts = ['<html><body>']
+    for file_path in listing_files:
+        category = os.path.splitext(os.path.basename(file_path))[0]
+        if category not in suites:
+            continue
+        parts.append(f'<h2>{category}</h2>')
+        for course_id, title, description in parse_listing_file(file_path)['entries']:
+            parts.append(
+                f'<p class="webContent_courseName">{title}:</p>'
+                f'<textarea>{description}</textarea>'
+                f'<div class="moduleListWhite">'
+                f'<a href="purchaseCourse.php?nid={course_id}">Buy Now</a> '
+                f'<a href="freeTrial.php?trial={course_id}">Free Trial</a>'
+                f'</div>'
+            )
+    parts.append('</body></html>')
+    return '\n'.join(parts)
+
+def load_admin_page(path: Optional[str], listing_files: List[str]):
+    """(content, source): a given file, the HTTP cache's copy, or a synthesized page"""
+    if path:
+        with open(path, 'rb') as f:
+            return f.read(), 'file'
+    recorded = HTTPCache().cached(ADMIN_URL)
+    if recorded is not None:
+        return recorded.content, 'recorded'
+    return synthesize_admin_page(listing_files).encode('utf-8'), 'synthetic'
+
+class FixtureAdapter(BaseAdapter):
+    """Serves one fixture body for every request and counts requests and bytes"""
+
+    def __init__(self, content: bytes):
+        super().__init__()
+        self.content = content
+        self.requests = 0
+        self.bytes = 0
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        self.bytes += len(self.content)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.content
+        response.headers = CaseInsensitiveDict({'Content-Type': 'text/html',
+                                                'Content-Length': str(len(self.content))})
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+# ============================================================================
+# STAGES
+# ============================================================================
+
+class ScaleFixture:
+    """
+    Fixtures for one scale, plus the scraper state after each stage so any
+    stage can be set up without re-running (or timing) the ones before it.
+    """
+
+    def __init__(self, scale: int, admin_page: bytes, listing_files: List[str], work_dir: str,
+                 latency_ms: float):
+        self.scale = scale
+        self.work_dir = work_dir
+        self.latency_ms = latency_ms
+        self.admin_page = scale_page(admin_page.decode('utf-8'), scale).encode('utf-8')
+        self.adapter = FixtureAdapter(self.admin_page)
+
+        self.listing_files = []
+        for file_path in listing_files:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                html = scale_page(f.read(), scale)
+            scaled_path = os.path.join(work_dir, os.path.basename(file_path))
+            with open(scaled_path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            self.listing_files.append(scaled_path)
+
+        self.soup = BeautifulSoup(self.admin_page, 'lxml')
+        self.snapshots: Dict[str, List[Dict]] = {}
+        scraper = self.scraper()
+        with redirect_stdout(io.StringIO()):
+            for stage in ('parse_courses', 'construct_icons', 'parse_descriptions', 'construct_assets'):
+                self.snapshots[stage] = copy.deepcopy(scraper.courses)
+                self.call(stage, scraper)
+        self.courses = len(scraper.courses)
+        self.snapshots['save_to_supabase'] = scraper.courses
+        self.db = None
+
+    def scraper(self, before: Optional[str] = None) -> VideoTileScraper:
+        """Scraper on the fixture page, holding the courses as they were before `before`"""
+        session = requests.Session()
+        session.mount('https://', self.adapter)
+        session.mount('http://', self.adapter)
+        cache = HTTPCache(cache_dir=os.path.join(self.work_dir, 'http'), ttl=0, session=session)
+        scraper = VideoTileScraper(supabase_client=self.client(), http_cache=cache)
+        if before:
+            scraper.courses = copy.deepcopy(self.snapshots[before])
+        return scraper
+
+    def client(self):
+        """Supabase client on a fresh fake database"""
+        latency = LatencyModel(base=self.latency_ms / 1000) if self.latency_ms else None
+        self.db = FakeSupabase(latency=latency)
+        return self.db.client()
+
+    def call(self, stage: str, scraper: VideoTileScraper):
+        if stage in ('parse_courses', 'parse_descriptions'):
+            getattr(scraper, stage)(self.soup)
+        else:
+            getattr(scraper, stage)()
+
+    def setup(self, stage: str) -> Callable[[], None]:
+        """A zero-argument callable that runs `stage` once from its starting state"""
+        if stage == 'fetch_page':
+            return self.scraper().fetch_page
+        if stage == 'parse_html_file':
+            parser = DescriptionParser(supabase_client=None, dry_run=True)
+            return lambda: [parser.parse_html_file(path) for path in self.listing_files]
+        scraper = self.scraper(before=stage)
+        return lambda: self.call(stage, scraper)
+
+    def counters(self) -> Dict[str, int]:
+        db_stats = self.db.stats if self.db else {}
+        return {
+            'http': self.adapter.requests,
+            'http_bytes': self.adapter.bytes,
+            'db': db_stats.get('requests', 0),
+            'db_rows_written': db_stats.get('rows_written', 0),
+            'db_rows_read': db_stats.get('rows_read', 0),
+        }
+
+def measure(fixture: ScaleFixture, stage: str, repeat: int) -> Dict:
+    """Best-of-repeat wall time, then one traced run for peak memory and request counts"""
+    times = []
+    for _ in range(repeat):
+        run = fixture.setup(stage)
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+
+    run = fixture.setup(stage)
+    before = fixture.counters()
+    tracemalloc.start()
+    try:
+        with redirect_stdout(io.StringIO()):
+            run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    after = fixture.counters()
+
+    return {
+        'wall_seconds': min(times),
+        'wall_seconds_runs': times,
+        'peak_memory_bytes': peak,
+        'requests': {name: after[name] - before[name] for name in after},
+    }
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def print_table(report: Dict, baseline: Optional[Dict] = None):
+    """Console summary; with a baseline report, times are also shown relative to it"""
+    previous = {}
+    if baseline:
+        for scale in baseline['scales']:
+            for stage, result in scale['stages'].items():
+                previous[(scale['scale'], stage)] = result
+
+    print("="*80)
+    print(f"PIPELINE BENCHMARK (admin page: {report['admin_page']}, best of {report['repeat']})")
+    print("="*80)
+    print(f"{'Scale':<7}{'Stage':<20}{'Wall (ms)':>11}{'Peak (KiB)':>12}{'HTTP':>6}{'DB':>6}{'vs base':>10}")
+    for scale in report['scales']:
+        for stage, result in scale['stages'].items():
+            old = previous.get((scale['scale'], stage))
+            ratio = f"{result['wall_seconds'] / old['wall_seconds']:.2f}x" \
+                if old and old['wall_seconds'] else ''
+            print(f"{str(scale['scale']) + 'x':<7}{stage:<20}{result['wall_seconds'] * 1000:>11.1f}"
+                  f"{result['peak_memory_bytes'] / 1024:>12.0f}{result['requests']['http']:>6}"
+                  f"{result['requests']['db']:>6}{ratio:>10}")
+    print("="*80)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scrape/parse/save pipeline stages')
+    parser.add_argument('--scales', default=','.join(str(s) for s in DEFAULT_SCALES),
+                        help='Comma-separated course count multipliers (default: 1,10,100)')
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f"Comma-separated stages to run (default: all of {', '.join(STAGES)})")
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is reported)')
+    parser.add_argument('--admin-page',
+                        help='Recorded admin page HTML (default: the HTTP cache copy, else a page '
+                             'synthesized from course-listings/)')
+    parser.add_argument('--db-latency-ms', type=float, default=0,
+                        help='Simulated round-trip time per database request (default: 0)')
+    parser.add_argument('--output', help='JSON report path (default: .cache/bench/pipeline-<time>.json)')
+    parser.add_argument('--compare', help='Earlier JSON report to compare wall times against')
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(',') if s.strip()]
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    if args.repeat < 1 or not scales or min(scales) < 1:
+        parser.error('--repeat and --scales must be at least 1')
+
+    listing_files = sorted(os.path.join(LISTINGS_DIR, name) for name in os.listdir(LISTINGS_DIR)
+                           if name.endswith('.html'))
+    admin_page, admin_source = load_admin_page(args.admin_page, listing_files)
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'admin_page': admin_source,
+        'repeat': args.repeat,
+        'db_latency_ms': args.db_latency_ms,
+        'scales': [],
+    }
+
+    for scale in scales:
+        print(f"Preparing {scale}x fixtures...")
+        with tempfile.TemporaryDirectory() as work_dir:
+            fixture = ScaleFixture(scale, admin_page, listing_files, work_dir, args.db_latency_ms)
+            result = {
+                'scale': scale,
+                'courses': fixture.courses,
+                'admin_page_bytes': len(fixture.admin_page),
+                'listing_bytes': sum(os.path.getsize(path) for path in fixture.listing_files),
+                'stages': {},
+            }
+            for stage in stages:
+                print(f"  {stage}...")
+                result['stages'][stage] = measure(fixture, stage, args.repeat)
+            report['scales'].append(result)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print()
+    print_table(report, baseline)
+    print(f"Report written to {output}")
+
+if __name__ == '__main__':
+    main()
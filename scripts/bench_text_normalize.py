@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for text_normalize
+Times normalize_title/slugify/expand_aliases/titles_match per call against
+the original uncompiled, unmemoized versions on the exported course titles
+"""
+
+import os
+import re
+import csv
+import sys
+import timeit
+import argparse
+from typing import List
+
+import text_normalize
+from text_normalize import ICON_ALIASES
+
+# Project root
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXPORTS_DIR = os.path.join(project_root, 'exports')
+
+# ============================================================================
+# ORIGINAL IMPLEMENTATIONS (baseline)
+# ============================================================================
+
+def legacy_normalize_title(title: str) -> str:
+    normalized = title.lower().strip()
+    normalized = re.sub(r'[^\w\s\-&]', '', normalized)
+    normalized = re.sub(r'\s+', ' ', normalized)
+    return normalized
+
+def legacy_slugify(title: str) -> str:
+    slug = title.lower().strip()
+    slug = re.sub(r'[\s_]+', '-', slug)
+    slug = re.sub(r'[^\w\-]', '', slug)
+    slug = slug.strip('-')
+    slug = re.sub(r'\-+', '-', slug)
+    return slug
+
+def legacy_expand_aliases(text: str) -> List[str]:
+    variants = [text]
+    for alias, expansion in ICON_ALIASES.items():
+        if alias in text:
+            variants.append(text.replace(alias, expansion))
+        if expansion in text:
+            variants.append(text.replace(expansion, alias))
+    return list(set(variants))
+
+def make_titles_match(normalize, expand):
+    """titles_match as in scrape_videotile, parameterized on the helpers"""
+    def titles_match(title1: str, title2: str) -> bool:
+        norm1 = normalize(title1)
+        norm2 = normalize(title2)
+        if norm1 == norm2 or norm1 in norm2 or norm2 in norm1:
+            return True
+        for v1 in expand(norm1):
+            for v2 in expand(norm2):
+                if v1 == v2 or v1 in v2 or v2 in v1:
+                    return True
+        tokens1 = set(norm1.split())
+        tokens2 = set(norm2.split())
+        if len(tokens1) == 0 or len(tokens2) == 0:
+            return False
+        return len(tokens1 & tokens2) / min(len(tokens1), len(tokens2)) >= 0.6
+    return titles_match
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def load_titles() -> List[str]:
+    """Course titles from the most recent courses export"""
+    exports = sorted(f for f in os.listdir(EXPORTS_DIR) if f.startswith('courses-export-') and f.endswith('.csv'))
+    if not exports:
+        print(f"[ERROR] No courses-export-*.csv found in {EXPORTS_DIR}")
+        sys.exit(1)
+    with open(os.path.join(EXPORTS_DIR, exports[-1]), 'r', encoding='utf-8') as f:
+        return [row['course_title'] for row in csv.DictReader(f)]
+
+def per_call_us(func, inputs: List, repeat: int) -> float:
+    """Best-of-repeat microseconds per call over inputs"""
+    def run():
+        for item in inputs:
+            func(*item) if isinstance(item, tuple) else func(item)
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(inputs) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark shared title normalization')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (best is reported)')
+    parser.add_argument('--pairs', type=int, default=20000, help='Title pairs for the titles_match benchmark')
+    args = parser.parse_args()
+
+    titles = load_titles()
+    normalized = [legacy_normalize_title(t) for t in titles]
+    pairs = [(titles[i % len(titles)], titles[(i * 7 + 3) % len(titles)]) for i in range(args.pairs)]
+
+    # The new helpers must be drop-in replacements
+    for title, norm in zip(titles, normalized):
+        assert text_normalize.normalize_title(title) == norm, title
+        assert text_normalize.slugify(title) == legacy_slugify(title), title
+        assert sorted(text_normalize.expand_aliases(norm)) == sorted(legacy_expand_aliases(norm)), title
+
+    legacy_match = make_titles_match(legacy_normalize_title, legacy_expand_aliases)
+    shared_match = make_titles_match(text_normalize.normalize_title, text_normalize.expand_aliases)
+
+    cases = [
+        ('normalize_title', legacy_normalize_title, text_normalize.normalize_title, titles),
+        ('slugify', legacy_slugify, text_normalize.slugify, titles),
+        ('expand_aliases', legacy_expand_aliases, text_normalize.expand_aliases, normalized),
+        ('titles_match', legacy_match, shared_match, pairs),
+    ]
+
+    print("="*72)
+    print(f"TEXT NORMALIZATION BENCHMARK ({len(titles)} titles, best of {args.repeat})")
+    print("="*72)
+    print(f"{'Function':<18}{'Before (us)':>13}{'Cold (us)':>13}{'Warm (us)':>13}{'Speedup':>11}")
+
+    for name, before_func, after_func, inputs in cases:
+        before = per_call_us(before_func, inputs, args.repeat)
+        text_normalize.clear_caches()
+        cold = per_call_us(after_func, inputs, 1)
+        warm = per_call_us(after_func, inputs, args.repeat)
+        print(f"{name:<18}{before:>13.2f}{cold:>13.2f}{warm:>13.2f}{before / warm:>10.1f}x")
+
+    print("="*72)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Local SQLite mirror of the Supabase catalogue
+sync-mirror copies categories, courses and course_assets into a local file,
+fetching only rows whose updated_at moved past the last sync. The read-only
+scripts read through a small data-access layer that is backed either by the
+live API or by the mirror (--mirror), so analysis runs never touch production
+
+Usage:
+    python catalog_mirror.py sync-mirror          # Incremental sync
+    python catalog_mirror.py sync-mirror --full   # Re-copy every row
+    python catalog_mirror.py status               # Row counts and last sync
+"""
+
+import os
+import sys
+import sqlite3
+import argparse
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from catalog_report import assets_by_course, fetch_counts
+from db_client import add_client_arguments, client_from_args
+from table_reader import DEFAULT_PAGE_SIZE, read_rows
+
+MIRROR_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'catalog.sqlite')
+
+PAGE_SIZE = DEFAULT_PAGE_SIZE
+
+# Mirrored tables and their columns (supabase/migrations/001 and 004)
+MIRRORED_TABLES = {
+    'categories': ['id', 'name', 'suite_id', 'purchase_url', 'created_at', 'updated_at'],
+    'courses': ['id', 'title', 'slug', 'category_id', 'icon_url', 'description',
+                'purchase_url', 'free_trial_url', 'created_at', 'updated_at'],
+    'course_assets': ['id', 'course_id', 'type', 'url', 'label', 'created_at', 'updated_at'],
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+  id INTEGER PRIMARY KEY,
+  name TEXT NOT NULL,
+  suite_id INTEGER NOT NULL,
+  purchase_url TEXT,
+  created_at TEXT,
+  updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS courses (
+  id INTEGER PRIMARY KEY,
+  title TEXT NOT NULL,
+  slug TEXT NOT NULL,
+  category_id INTEGER NOT NULL,
+  icon_url TEXT,
+  description TEXT,
+  purchase_url TEXT,
+  free_trial_url TEXT,
+  created_at TEXT,
+  updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_courses_category_id ON courses(category_id);
+CREATE TABLE IF NOT EXISTS course_assets (
+  id INTEGER PRIMARY KEY,
+  course_id INTEGER NOT NULL,
+  type TEXT NOT NULL,
+  url TEXT NOT NULL,
+  label TEXT,
+  created_at TEXT,
+  updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_course_assets_course_id ON course_assets(course_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+  table_name TEXT PRIMARY KEY,
+  high_water TEXT,
+  synced_at TEXT NOT NULL
+);
+"""
+
+# ============================================================================
+# SYNC
+# ============================================================================
+
+def _parse_timestamp(value: str) -> datetime:
+    """PostgREST timestamps trim trailing zeros, so compare them as datetimes"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def open_mirror(path: str = MIRROR_FILE) -> sqlite3.Connection:
+    """Open (and create if needed) the mirror database"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+def _changed_rows(supabase, table: str, high_water: Optional[str]) -> Iterable[List[Dict]]:
+    """
+    Pages of rows with updated_at >= high_water, keyset-paginated on
+    (updated_at, id) so rows sharing a timestamp (one bulk upsert) are
+    neither skipped nor fetched forever.
+
+    updated_at is nullable. A NULL row can be neither compared with the
+    high-water mark nor used as a cursor, so those rows are left out of the
+    timestamp pass and fetched on every sync, keyset-paginated on id.
+    """
+    columns = ', '.join(MIRRORED_TABLES[table])
+    unstamped = read_rows(supabase, table, columns, where=lambda query: query.is_('updated_at', 'null'),
+                          page_size=PAGE_SIZE)
+    for start in range(0, len(unstamped), PAGE_SIZE):
+        yield unstamped[start:start + PAGE_SIZE]
+
+    cursor = None
+    while True:
+        query = supabase.table(table).select(columns).not_.is_('updated_at', 'null') \
+            .order('updated_at').order('id').limit(PAGE_SIZE)
+        if cursor:
+            updated_at, last_id = cursor
+            query = query.or_(f'updated_at.gt."{updated_at}",and(updated_at.eq."{updated_at}",id.gt.{last_id})')
+        elif high_water:
+            query = query.gte('updated_at', high_water)
+
+        rows = query.execute().data
+        if rows:
+            yield rows
+        if len(rows) < PAGE_SIZE:
+            return
+        cursor = (rows[-1]['updated_at'], rows[-1]['id'])
+
+def _live_ids(supabase, table: str) -> set:
+    """Every id in the live table (one narrow column)"""
+    return {row['id'] for row in read_rows(supabase, table, 'id', page_size=PAGE_SIZE)}
+
+def sync_table(supabase, conn: sqlite3.Connection, table: str, full: bool = False) -> Dict:
+    """Bring one mirrored table up to date; returns {'fetched', 'deleted', 'high_water'}"""
+    columns = MIRRORED_TABLES[table]
+    state = conn.execute('SELECT high_water FROM sync_state WHERE table_name = ?', (table,)).fetchone()
+    high_water = None if full or state is None else state['high_water']
+
+    if full:
+        conn.execute(f'DELETE FROM {table}')
+
+    fetched = 0
+    newest = high_water
+    placeholders = ', '.join('?' for _ in columns)
+    for rows in _changed_rows(supabase, table, high_water):
+        conn.executemany(
+            f'INSERT OR REPLACE INTO {table} ({", ".join(columns)}) VALUES ({placeholders})',
+            [tuple(row[column] for column in columns) for row in rows]
+        )
+        fetched += len(rows)
+        for row in rows:
+            if row['updated_at'] and (newest is None or
+                                      _parse_timestamp(row['updated_at']) > _parse_timestamp(newest)):
+                newest = row['updated_at']
+
+    # Deleted rows leave no updated_at behind; compare id sets instead
+    deleted = 0
+    if not full:
+        live = _live_ids(supabase, table)
+        gone = [(row['id'],) for row in conn.execute(f'SELECT id FROM {table}') if row['id'] not in live]
+        conn.executemany(f'DELETE FROM {table} WHERE id = ?', gone)
+        deleted = len(gone)
+
+    conn.execute(
+        'INSERT OR REPLACE INTO sync_state (table_name, high_water, synced_at) VALUES (?, ?, ?)',
+        (table, newest, datetime.now(timezone.utc).isoformat())
+    )
+    return {'fetched': fetched, 'deleted': deleted, 'high_water': newest}
+
+def sync_mirror(supabase, path: str = MIRROR_FILE, full: bool = False) -> Dict[str, Dict]:
+    """Sync every mirrored table in one local transaction"""
+    conn = open_mirror(path)
+    try:
+        with conn:
+            return {table: sync_table(supabase, conn, table, full) for table in MIRRORED_TABLES}
+    finally:
+        conn.close()
+
+# ============================================================================
+# DATA ACCESS
+# ============================================================================
+
+class LiveCatalog:
+    """Catalogue reads against the Supabase API"""
+
+    source = 'live'
+
+    def __init__(self, supabase):
+        self.supabase = supabase
+
+    def counts(self) -> Dict:
+        """Same shape as catalog_report.fetch_counts"""
+        return fetch_counts(self.supabase)
+
+    def categories(self, columns: str = '*') -> List[Dict]:
+        return read_rows(self.supabase, 'categories', columns)
+
+    def courses(self, columns: str = '*', limit: Optional[int] = None) -> List[Dict]:
+        if limit is not None:
+            return self.supabase.table('courses').select(columns).order('id').limit(limit).execute().data
+        return read_rows(self.supabase, 'courses', columns)
+
+    def courses_without_description(self, columns: str = '*') -> List[Dict]:
+        """Courses whose description is NULL or empty"""
+        return read_rows(self.supabase, 'courses', columns,
+                         where=lambda query: query.or_('description.is.null,description.eq.'))
+
+    def assets(self, columns: str = '*') -> List[Dict]:
+        return read_rows(self.supabase, 'course_assets', columns)
+
+    def assets_by_course(self, course_ids: Iterable[int]) -> Dict[int, List[Dict]]:
+        return assets_by_course(self.supabase, course_ids)
+
+class MirrorCatalog:
+    """Catalogue reads against the local SQLite mirror (same methods as LiveCatalog)"""
+
+    source = 'mirror'
+
+    def __init__(self, path: str = MIRROR_FILE):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No catalogue mirror at {path} - run: python catalog_mirror.py sync-mirror")
+        self.path = path
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        self.conn.row_factory = sqlite3.Row
+
+    def _columns(self, table: str, columns: str) -> str:
+        if columns.strip() == '*':
+            return ', '.join(MIRRORED_TABLES[table])
+        names = [name.strip() for name in columns.split(',')]
+        unknown = [name for name in names if name not in MIRRORED_TABLES[table]]
+        if unknown:
+            raise ValueError(f"Unknown {table} columns: {', '.join(unknown)}")
+        return ', '.join(names)
+
+    def _select(self, table: str, columns: str, where: str = '', params: tuple = ()) -> List[Dict]:
+        sql = f'SELECT {self._columns(table, columns)} FROM {table} {where}'
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def synced_at(self) -> Optional[str]:
+        row = self.conn.execute('SELECT MIN(synced_at) AS synced_at FROM sync_state').fetchone()
+        return row['synced_at']
+
+    def counts(self) -> Dict:
+        counts = {
+            'courses': self.conn.execute('SELECT COUNT(*) FROM courses').fetchone()[0],
+            'assets': self.conn.execute('SELECT COUNT(*) FROM course_assets').fetchone()[0],
+            'asset_types': dict(self.conn.execute('SELECT type, COUNT(*) FROM course_assets GROUP BY type').fetchall()),
+            'categories': []
+        }
+        for row in self.conn.execute(
+            'SELECT cat.id, cat.name, COUNT(c.id) AS total FROM categories cat '
+            'LEFT JOIN courses c ON c.category_id = cat.id GROUP BY cat.id, cat.name ORDER BY cat.id'
+        ):
+            counts['categories'].append(dict(row))
+        return counts
+
+    def categories(self, columns: str = '*') -> List[Dict]:
+        return self._select('categories', columns, 'ORDER BY id')
+
+    def courses(self, columns: str = '*', limit: Optional[int] = None) -> List[Dict]:
+        if limit is not None:
+            return self._select('courses', columns, 'ORDER BY id LIMIT ?', (limit,))
+        return self._select('courses', columns, 'ORDER BY id')
+
+    def courses_without_description(self, columns: str = '*') -> List[Dict]:
+        return self._select('courses', columns, "WHERE description IS NULL OR description = '' ORDER BY id")
+
+    def assets(self, columns: str = '*') -> List[Dict]:
+        return self._select('course_assets', columns, 'ORDER BY id')
+
+    def assets_by_course(self, course_ids: Iterable[int]) -> Dict[int, List[Dict]]:
+        grouped: Dict[int, List[Dict]] = {course_id: [] for course_id in course_ids}
+        if grouped:
+            placeholders = ', '.join('?' for _ in grouped)
+            for row in self._select('course_assets', 'course_id, type, url, label',
+                                    f'WHERE course_id IN ({placeholders}) ORDER BY id', tuple(grouped)):
+                grouped[row['course_id']].append(row)
+        return grouped
+
+def add_catalog_arguments(parser: argparse.ArgumentParser):
+    """Add the shared --mirror/--mirror-file options to a read-only script's parser"""
+    parser.add_argument('--mirror', action='store_true',
+                        help='Read from the local catalogue mirror instead of Supabase '
+                             '(refresh it with: python catalog_mirror.py sync-mirror)')
+    parser.add_argument('--mirror-file', default=MIRROR_FILE, help='Mirror database path')
+    add_client_arguments(parser)
+
+def catalog_from_args(args: argparse.Namespace):
+    """LiveCatalog or MirrorCatalog, as chosen by add_catalog_arguments options"""
+    if not args.mirror:
+        return LiveCatalog(client_from_args(args))
+
+    try:
+        catalog = MirrorCatalog(args.mirror_file)
+    except FileNotFoundError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    print(f"Reading local mirror {args.mirror_file} (synced {catalog.synced_at() or 'never'})")
+    return catalog
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain the local catalogue mirror')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    sync_parser = subparsers.add_parser('sync-mirror', help='Copy changed rows from Supabase into the mirror')
+    sync_parser.add_argument('--full', action='store_true', help='Discard the mirror contents and copy every row')
+    subparsers.add_parser('status', help='Show mirror row counts and sync times')
+    parser.add_argument('--mirror-file', default=MIRROR_FILE, help='Mirror database path')
+    add_client_arguments(parser)
+    args = parser.parse_args()
+
+    if args.command == 'sync-mirror':
+        print("="*60)
+        print("SYNCING CATALOGUE MIRROR")
+        print("="*60)
+        results = sync_mirror(client_from_args(args), args.mirror_file, full=args.full)
+        for table, result in results.items():
+            print(f"  {table}: {result['fetched']} fetched, {result['deleted']} deleted "
+                  f"(high-water {result['high_water'] or 'none'})")
+        print(f"\nMirror: {args.mirror_file}")
+        return
+
+    conn = open_mirror(args.mirror_file)
+    for table in MIRRORED_TABLES:
+        total = conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        state = conn.execute('SELECT high_water, synced_at FROM sync_state WHERE table_name = ?', (table,)).fetchone()
+        synced = f"synced {state['synced_at']}, high-water {state['high_water']}" if state else 'never synced'
+        print(f"  {table}: {total} rows ({synced})")
+    conn.close()
+
+if __name__ == '__main__':
+    main()
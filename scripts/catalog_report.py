@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Shared catalogue reporting for the health-check scripts
+All counts come from the catalog_counts view in one request (or paginated
+reads where the view has not been created yet); course and asset lookups
+are single queries joined in memory
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from postgrest.exceptions import APIError
+
+from table_reader import iter_rows
+
+# "relation does not exist" (PGRST205 from PostgREST 12 on, 42P01 before)
+MISSING_RELATION_CODES = {'PGRST205', '42P01'}
+
+def fetch_counts(supabase) -> Dict:
+    """
+    Catalogue counts in one round trip.
+
+    Returns {'courses': n, 'assets': n, 'asset_types': {type: n},
+    'categories': [{'id', 'name', 'total'}, ...]} with categories in id order.
+    Uses the view from supabase/migrations/003_catalog_counts.sql; without
+    it the counts come from count_catalog() instead.
+    """
+    try:
+        rows = supabase.table('catalog_counts').select('kind, sort_key, name, total').execute().data
+    except APIError as e:
+        if e.code not in MISSING_RELATION_CODES:
+            raise
+        print("[WARN] catalog_counts view not found (run supabase/migrations/003_catalog_counts.sql); "
+              "counting rows instead")
+        return count_catalog(supabase)
+
+    counts = {'courses': 0, 'assets': 0, 'asset_types': {}, 'categories': []}
+    for row in rows:
+        if row['kind'] == 'category':
+            counts['categories'].append({'id': row['sort_key'], 'name': row['name'], 'total': row['total']})
+        elif row['kind'] == 'asset_type':
+            counts['asset_types'][row['name']] = row['total']
+        else:
+            counts[row['kind']] = row['total']
+
+    counts['categories'].sort(key=lambda category: category['id'])
+    return counts
+
+def count_catalog(supabase) -> Dict:
+    """fetch_counts() from paginated reads of the tables, for databases without the view"""
+    course_counts = Counter(row['category_id'] for row in iter_rows(supabase, 'courses', 'category_id'))
+    asset_types = Counter(row['type'] for row in iter_rows(supabase, 'course_assets', 'type'))
+    return {
+        'courses': sum(course_counts.values()),
+        'assets': sum(asset_types.values()),
+        'asset_types': dict(asset_types),
+        'categories': [{'id': category['id'], 'name': category['name'], 'total': course_counts[category['id']]}
+                       for category in iter_rows(supabase, 'categories', 'id, name')],
+    }
+
+def print_category_distribution(counts: Dict):
+    """One line per category, as the scripts have always printed it"""
+    for category in counts['categories']:
+        print(f"{category['name']}: {category['total']} courses")
+
+def match_titles(courses: List[Dict], needles: Iterable[str]) -> Dict[str, List[Dict]]:
+    """Courses whose title contains each needle, ignoring case (ilike '%needle%')"""
+    lowered = [(course['title'].lower(), course) for course in courses]
+    return {needle: [course for title, course in lowered if needle.lower() in title] for needle in needles}
+
+def assets_by_course(supabase, course_ids: Iterable[int]) -> Dict[int, List[Dict]]:
+    """Assets of the given courses (one paginated in_ query), grouped by course_id"""
+    grouped: Dict[int, List[Dict]] = {course_id: [] for course_id in course_ids}
+    if not grouped:
+        return grouped
+
+    rows = iter_rows(supabase, 'course_assets', 'course_id, type, url, label',
+                     where=lambda query: query.in_('course_id', list(grouped)))
+    grouped.update(group_by_course(rows))
+    return grouped
+
+def group_by_course(rows: Iterable[Dict]) -> Dict[int, List[Dict]]:
+    """Rows keyed by their course_id, in their original order"""
+    grouped: Dict[int, List[Dict]] = {}
+    for row in rows:
+        grouped.setdefault(row['course_id'], []).append(row)
+    return grouped
@@ -1,37 +1,33 @@
 #!/usr/bin/env python3
 """Check course assets in database"""
 
-import os
-from dotenv import load_dotenv
-from supabase import create_client
+import argparse
 
-# Load environment variables
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-load_dotenv(os.path.join(project_root, '.env.local'))
+from catalog_mirror import add_catalog_arguments, catalog_from_args
 
-supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
-supabase = create_client(supabase_url, supabase_key)
+parser = argparse.ArgumentParser(description='Check course assets')
+add_catalog_arguments(parser)
+args = parser.parse_args()
 
-# Get asset counts
-assets_response = supabase.table('course_assets').select('type', count='exact').execute()
-print(f"\nTotal assets in database: {assets_response.count}")
+# Live API, or the local mirror with --mirror
+catalog = catalog_from_args(args)
 
-# Count by type
-video_count = supabase.table('course_assets').select('id', count='exact').eq('type', 'video').execute()
-pdf_count = supabase.table('course_assets').select('id', count='exact').eq('type', 'pdf').execute()
+# Get asset counts (totals and per type in one request)
+counts = catalog.counts()
+print(f"\nTotal assets in database: {counts['assets']}")
 
-print(f"  Video assets: {video_count.count}")
-print(f"  PDF assets: {pdf_count.count}")
+print(f"  Video assets: {counts['asset_types'].get('video', 0)}")
+print(f"  PDF assets: {counts['asset_types'].get('pdf', 0)}")
 
 # Sample a few courses with assets
-sample_courses = supabase.table('courses').select('id, title, icon_url, description, purchase_url, free_trial_url').limit(3).execute()
+sample_courses = catalog.courses('id, title, icon_url, description, purchase_url, free_trial_url', limit=3)
+sample_assets = catalog.assets_by_course([course['id'] for course in sample_courses])
 
 print("\n" + "="*60)
 print("SAMPLE COURSES")
 print("="*60)
 
-for course in sample_courses.data:
+for course in sample_courses:
     print(f"\nCourse: {course['title']}")
     print(f"  ID: {course['id']}")
     print(f"  Icon: {course['icon_url'][:60] if course['icon_url'] else 'None'}...")
@@ -39,10 +35,9 @@ for course in sample_courses.data:
     print(f"  Purchase URL: {course['purchase_url'][:60] if course['purchase_url'] else 'None'}...")
     print(f"  Free Trial URL: {course['free_trial_url'][:60] if course['free_trial_url'] else 'None'}...")
 
-    # Get assets for this course
-    assets = supabase.table('course_assets').select('type, url, label').eq('course_id', course['id']).execute()
-    print(f"  Assets ({len(assets.data)}):")
-    for asset in assets.data:
+    assets = sample_assets[course['id']]
+    print(f"  Assets ({len(assets)}):")
+    for asset in assets:
         print(f"    - {asset['type']}: {asset['url'][:60]}...")
 
 print("\n" + "="*60)
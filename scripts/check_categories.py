@@ -3,28 +3,21 @@
 Check course categorization in Supabase
 """
 
-import os
-import sys
-from dotenv import load_dotenv
-from supabase import create_client
+import argparse
 
-# Load environment variables
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-load_dotenv(os.path.join(project_root, '.env.local'))
+from catalog_mirror import add_catalog_arguments, catalog_from_args
+from catalog_report import match_titles, print_category_distribution
 
-# Initialize Supabase
-supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+parser = argparse.ArgumentParser(description='Check course categorization')
+add_catalog_arguments(parser)
+args = parser.parse_args()
 
-if not supabase_url or not supabase_key:
-    print("[ERROR] Supabase credentials not found")
-    sys.exit(1)
+# Live API, or the local mirror with --mirror
+catalog = catalog_from_args(args)
 
-supabase = create_client(supabase_url, supabase_key)
-
-# Get all categories
-categories_result = supabase.table('categories').select('*').execute()
-categories = {cat['id']: cat['name'] for cat in categories_result.data}
+# All counts in one request; category names come with them
+counts = catalog.counts()
+categories = {cat['id']: cat['name'] for cat in counts['categories']}
 
 print("="*80)
 print("COURSE CATEGORIZATION ANALYSIS")
@@ -39,23 +32,22 @@ test_courses = [
     "Chat GPT Masterclass"
 ]
 
+# One query for every course, matched against the test titles in memory
+courses = catalog.courses('id, title, category_id')
+matches = match_titles(courses, test_courses)
+
 for course_title in test_courses:
-    result = supabase.table('courses').select('id, title, category_id').ilike('title', f'%{course_title}%').execute()
-    if result.data:
-        for course in result.data:
-            cat_name = categories.get(course['category_id'], 'Unknown')
-            print(f"\nCourse: {course['title']}")
-            print(f"  Current Category: {cat_name}")
-            print(f"  Course ID: {course['id']}")
+    for course in matches[course_title]:
+        cat_name = categories.get(course['category_id'], 'Unknown')
+        print(f"\nCourse: {course['title']}")
+        print(f"  Current Category: {cat_name}")
+        print(f"  Course ID: {course['id']}")
 
 # Get course count by category
 print("\n" + "="*80)
 print("COURSE DISTRIBUTION BY CATEGORY")
 print("="*80)
 
-for cat_id, cat_name in sorted(categories.items(), key=lambda x: x[0]):
-    result = supabase.table('courses').select('id', count='exact').eq('category_id', cat_id).execute()
-    count = result.count
-    print(f"{cat_name}: {count} courses")
+print_category_distribution(counts)
 
 print("="*80)
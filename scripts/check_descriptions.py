@@ -3,36 +3,24 @@
 Quick script to check description coverage in Supabase
 """
 
-import os
-import sys
-from dotenv import load_dotenv
-from supabase import create_client
+import argparse
 
-# Load environment variables
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-load_dotenv(os.path.join(project_root, '.env.local'))
+from catalog_mirror import add_catalog_arguments, catalog_from_args
 
-# Initialize Supabase
-supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+parser = argparse.ArgumentParser(description='Check description coverage')
+add_catalog_arguments(parser)
+args = parser.parse_args()
 
-if not supabase_url or not supabase_key:
-    print("[ERROR] Supabase credentials not found")
-    sys.exit(1)
-
-supabase = create_client(supabase_url, supabase_key)
+# Live API, or the local mirror with --mirror
+catalog = catalog_from_args(args)
 
 # Get total courses
-total_result = supabase.table('courses').select('id', count='exact').execute()
-total_courses = total_result.count
-
-# Get courses with descriptions
-with_desc_result = supabase.table('courses').select('id', count='exact').not_.is_('description', 'null').neq('description', '').execute()
-with_descriptions = with_desc_result.count
+total_courses = catalog.counts()['courses']
 
-# Get courses without descriptions
-without_desc_result = supabase.table('courses').select('id, title').or_('description.is.null,description.eq.').execute()
-without_descriptions = len(without_desc_result.data)
+# Get courses without descriptions (NULL or empty); every other course has one
+missing_descriptions = catalog.courses_without_description('id, title')
+without_descriptions = len(missing_descriptions)
+with_descriptions = total_courses - without_descriptions
 
 print("="*60)
 print("DESCRIPTION COVERAGE REPORT")
@@ -43,7 +31,7 @@ print(f"Without descriptions: {without_descriptions} ({without_descriptions/tota
 
 if without_descriptions > 0:
     print(f"\nCourses missing descriptions:")
-    for course in without_desc_result.data:
+    for course in missing_descriptions:
         print(f"  - ID {course['id']}: {course['title']}")
 
 print("="*60)
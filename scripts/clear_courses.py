@@ -1,50 +1,68 @@
 #!/usr/bin/env python3
 """Clear all courses and assets from database before re-scraping"""
 
-import os
-from dotenv import load_dotenv
-from supabase import create_client
+import sys
+import argparse
 
-# Load environment variables
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-load_dotenv(os.path.join(project_root, '.env.local'))
+from db_client import add_client_arguments, client_from_args
 
-supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
-supabase = create_client(supabase_url, supabase_key)
+parser = argparse.ArgumentParser(description='Clear all courses and assets before re-scraping')
+parser.add_argument('--rpc', action='store_true',
+                    help='Delete everything in one transaction via the reset_course_data() '
+                         'database function (supabase/migrations/002_reset_course_data.sql)')
+add_client_arguments(parser)
+args = parser.parse_args()
+
+supabase = client_from_args(args)
 
 print("="*60)
 print("CLEARING COURSES AND ASSETS")
 print("="*60)
 
 # Get counts before deletion
-courses_count = supabase.table('courses').select('id', count='exact').execute().count
-assets_count = supabase.table('course_assets').select('id', count='exact').execute().count
+courses_count = supabase.table('courses').select('id', count='exact').limit(1).execute().count
+assets_count = supabase.table('course_assets').select('id', count='exact').limit(1).execute().count
 
 print(f"\nBefore deletion:")
 print(f"  Courses: {courses_count}")
 print(f"  Assets: {assets_count}")
 
-# Delete assets first (foreign key constraint)
-print("\nDeleting course assets...")
-assets = supabase.table('course_assets').select('id').execute()
-for asset in assets.data:
-    supabase.table('course_assets').delete().eq('id', asset['id']).execute()
+if args.rpc:
+    # One request; the function deletes assets and courses in a single transaction
+    print("\nDeleting course assets and courses (reset_course_data)...")
+    result = supabase.rpc('reset_course_data').execute()
+    assets_deleted = result.data[0]['assets_deleted']
+    courses_deleted = result.data[0]['courses_deleted']
+else:
+    # One filtered delete per table ("id is not null" matches every row).
+    # Assets go first (foreign key constraint).
+    print("\nDeleting course assets...")
+    assets_deleted = supabase.table('course_assets').delete(count='exact', returning='minimal') \
+        .not_.is_('id', 'null').execute().count
+
+    print("Deleting courses...")
+    courses_deleted = supabase.table('courses').delete(count='exact', returning='minimal') \
+        .not_.is_('id', 'null').execute().count
 
-# Delete courses
-print("Deleting courses...")
-courses = supabase.table('courses').select('id').execute()
-for course in courses.data:
-    supabase.table('courses').delete().eq('id', course['id']).execute()
+print(f"  Deleted {assets_deleted} assets and {courses_deleted} courses")
 
 # Verify deletion
-courses_count_after = supabase.table('courses').select('id', count='exact').execute().count
-assets_count_after = supabase.table('course_assets').select('id', count='exact').execute().count
+courses_count_after = supabase.table('courses').select('id', count='exact').limit(1).execute().count
+assets_count_after = supabase.table('course_assets').select('id', count='exact').limit(1).execute().count
 
 print(f"\nAfter deletion:")
 print(f"  Courses: {courses_count_after}")
 print(f"  Assets: {assets_count_after}")
 
+if courses_count_after or assets_count_after:
+    print("\n[ERROR] Rows remain after deletion")
+    sys.exit(1)
+
+if courses_deleted != courses_count or assets_deleted != assets_count:
+    # Rows written by something else between the count and the delete
+    print(f"\n[WARN] Deleted counts differ from the counts before deletion "
+          f"(courses {courses_deleted}/{courses_count}, assets {assets_deleted}/{assets_count})")
+
 print("\n" + "="*60)
 print("Database cleared successfully!")
 print("Ready to run scraper: python scrape_videotile.py")
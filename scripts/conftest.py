@@ -0,0 +1,13 @@
+"""
+pytest setup for the scripts
+The scripts import each other by module name, so the scripts directory goes
+on sys.path. test_scraper_slugs.py is a manual check that scrapes the live
+site when imported, so it is not collected.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+collect_ignore = ['test_scraper_slugs.py']
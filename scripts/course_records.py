@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Compact course and asset records shared by the scripts
+CourseRecord/AssetRecord hold one course (or asset) in fixed __slots__
+attributes instead of a dict per row, build the Supabase payload only when
+it is written, and CourseIndex keeps records in order with O(1) lookup by
+course ID
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Columns of the courses table, in payload order
+COURSE_COLUMNS = ('id', 'title', 'slug', 'category_id', 'icon_url', 'description',
+                  'purchase_url', 'free_trial_url')
+
+class AssetRecord:
+    """One course_assets row: a promotional video embed or a PDF information sheet"""
+
+    __slots__ = ('type', 'url', 'label', 'id')
+
+    def __init__(self, type: str, url: str, label: Optional[str] = None, id: Optional[int] = None):
+        self.type = type
+        self.url = url
+        self.label = label
+        self.id = id    # database id, for assets read back from course_assets
+
+    def __repr__(self) -> str:
+        return f"AssetRecord({self.type!r}, {self.url!r})"
+
+    def to_payload(self, course_id: int) -> Dict:
+        """course_assets insert row"""
+        return {'course_id': course_id, 'type': self.type, 'url': self.url, 'label': self.label}
+
+class CourseRecord:
+    """
+    One course, scraped or read from the courses table.
+
+    suite_id is the VideoTile suite (1-5) a scraped course was listed
+    under; category_id is the categories table id, set for rows read from
+    the database or passed to to_payload() when writing. source records
+    which suite file a parsed description came from.
+    """
+
+    __slots__ = ('id', 'title', 'slug', 'category', 'suite_id', 'category_id', 'purchase_url',
+                 'free_trial_url', 'icon_url', 'description', 'assets', 'source')
+
+    def __init__(self, id: int, title: str, slug: Optional[str] = None, category: Optional[str] = None,
+                 suite_id: Optional[int] = None, category_id: Optional[int] = None,
+                 purchase_url: Optional[str] = None, free_trial_url: Optional[str] = None,
+                 icon_url: Optional[str] = None, description: Optional[str] = None,
+                 assets: Optional[List[AssetRecord]] = None, source: Optional[str] = None):
+        self.id = id
+        self.title = title
+        self.slug = slug
+        self.category = category
+        self.suite_id = suite_id
+        self.category_id = category_id
+        self.purchase_url = purchase_url
+        self.free_trial_url = free_trial_url
+        self.icon_url = icon_url
+        self.description = description
+        self.assets = assets if assets is not None else []
+        self.source = source
+
+    def __repr__(self) -> str:
+        return f"CourseRecord({self.id!r}, {self.title!r})"
+
+    @classmethod
+    def from_row(cls, row: Dict) -> 'CourseRecord':
+        """Record from a courses table row (any subset of COURSE_COLUMNS that includes id and title)"""
+        return cls(**{name: row[name] for name in COURSE_COLUMNS if name in row})
+
+    def to_payload(self, category_id: Optional[int] = None, columns: Sequence[str] = COURSE_COLUMNS) -> Dict:
+        """courses table row with `columns`; category_id overrides the stored one"""
+        payload = {name: getattr(self, name) for name in columns}
+        if category_id is not None and 'category_id' in columns:
+            payload['category_id'] = category_id
+        return payload
+
+    def asset_payloads(self) -> List[Dict]:
+        """course_assets rows for this course's assets"""
+        return [asset.to_payload(self.id) for asset in self.assets]
+
+class CourseIndex:
+    """Course records in insertion order with O(1) lookup by course ID"""
+
+    __slots__ = ('records', 'positions')
+
+    def __init__(self, records: Iterable[CourseRecord] = ()):
+        self.records: List[CourseRecord] = []
+        self.positions: Dict[int, int] = {}
+        for record in records:
+            self.add(record)
+
+    def add(self, record: CourseRecord, replace: bool = False) -> bool:
+        """
+        Add a record; an ID already present is kept unless replace is set,
+        in which case the new record takes the old one's place. Returns
+        whether the record was stored.
+        """
+        position = self.positions.get(record.id)
+        if position is None:
+            self.positions[record.id] = len(self.records)
+            self.records.append(record)
+            return True
+        if replace:
+            self.records[position] = record
+            return True
+        return False
+
+    def get(self, course_id: int) -> Optional[CourseRecord]:
+        position = self.positions.get(course_id)
+        return None if position is None else self.records[position]
+
+    def __contains__(self, course_id: int) -> bool:
+        return course_id in self.positions
+
+    def __getitem__(self, position):
+        return self.records[position]
+
+    def __iter__(self) -> Iterator[CourseRecord]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
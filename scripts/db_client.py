@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Shared Supabase client for the scripts
+One pooled, keep-alive HTTP connection set per process, request timeouts,
+and retries with jittered exponential backoff for requests that are safe to
+repeat. Every request is counted and timed so bulk jobs can report how many
+round trips they made and how long they took
+"""
+
+import os
+import sys
+import time
+import atexit
+import random
+import argparse
+import threading
+from typing import Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+from supabase import Client, create_client
+from supabase.lib.client_options import SyncClientOptions
+
+# Load environment variables
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(project_root, '.env.local'))
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_RETRIES = 4
+DEFAULT_POOL_SIZE = 10
+
+# Backoff before retry n is uniform(0, min(MAX_BACKOFF, BACKOFF_BASE * 2**n)) seconds
+BACKOFF_BASE = 0.5
+MAX_BACKOFF = 8.0
+
+# Transient server answers worth repeating (Cloudflare 52x included)
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504, 520, 521, 522, 523, 524}
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class RequestStats:
+    """Request counter and latency histogram (time to response headers)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.seconds = 0.0
+        self.by_method: Dict[str, int] = {}
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(self, method: str, seconds: float, failed: bool = False):
+        bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))
+        with self.lock:
+            self.requests += 1
+            self.seconds += seconds
+            self.by_method[method] = self.by_method.get(method, 0) + 1
+            self.histogram[bucket] += 1
+            if failed:
+                self.failures += 1
+
+    def retried(self):
+        with self.lock:
+            self.retries += 1
+
+    def summary(self) -> str:
+        """Multi-line report of the counts and histogram"""
+        methods = ', '.join(f"{method} {count}" for method, count in sorted(self.by_method.items()))
+        lines = [f"Database requests: {self.requests} ({methods or 'none'}), "
+                 f"{self.retries} retries, {self.failures} failed, {self.seconds:.2f}s total"]
+        lower = 0.0
+        for bound, count in zip(LATENCY_BUCKETS + (None,), self.histogram):
+            label = f"{lower * 1000:.0f}-{bound * 1000:.0f}ms" if bound else f">{lower * 1000:.0f}ms"
+            lines.append(f"  {label:<13} {count}")
+            lower = bound or lower
+        return '\n'.join(lines)
+
+# Shared by every client in the process
+request_stats = RequestStats()
+
+def is_idempotent(request: httpx.Request) -> bool:
+    """
+    Whether repeating request cannot change the outcome.
+
+    Reads, deletes and PATCH updates (fixed values) are; so are upserts,
+    which PostgREST sends as POST with resolution=merge-duplicates. Plain
+    inserts and RPC calls are not.
+    """
+    if request.method in ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'PATCH'):
+        return True
+    return request.method == 'POST' and 'resolution=merge-duplicates' in request.headers.get('Prefer', '')
+
+class RetryTransport(httpx.BaseTransport):
+    """
+    Wraps a transport with retries and request accounting.
+
+    Idempotent requests are retried on transport errors and RETRY_STATUSES.
+    Anything else is only retried when the connection was never made, since
+    the server cannot have seen it.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, retries: int = DEFAULT_RETRIES,
+                 stats: RequestStats = request_stats, sleep=time.sleep):
+        self.transport = transport
+        self.retries = retries
+        self.stats = stats
+        self.sleep = sleep
+
+    def _delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_BACKOFF)
+            except ValueError:
+                pass
+        return random.uniform(0, min(MAX_BACKOFF, BACKOFF_BASE * 2 ** attempt))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        idempotent = is_idempotent(request)
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError as e:
+                self.stats.record(request.method, time.perf_counter() - start, failed=True)
+                never_sent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                if attempt >= self.retries or not (idempotent or never_sent):
+                    raise
+                delay = self._delay(attempt, None)
+            else:
+                failed = response.status_code in RETRY_STATUSES
+                self.stats.record(request.method, time.perf_counter() - start, failed=failed)
+                if not failed or not idempotent or attempt >= self.retries:
+                    return response
+                response.read()
+                response.close()
+                delay = self._delay(attempt, response.headers.get('Retry-After'))
+
+            self.stats.retried()
+            attempt += 1
+            self.sleep(delay)
+
+    def close(self):
+        self.transport.close()
+
+def create_pooled_client(url: str, key: str, timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                         pool_size: int = DEFAULT_POOL_SIZE,
+                         transport: Optional[httpx.BaseTransport] = None) -> Client:
+    """Supabase client whose requests share one keep-alive pool and retry policy"""
+    http_client = httpx.Client(
+        transport=RetryTransport(
+            transport or httpx.HTTPTransport(limits=httpx.Limits(max_connections=pool_size,
+                                                                 max_keepalive_connections=pool_size)),
+            retries=retries
+        ),
+        timeout=httpx.Timeout(timeout, connect=min(timeout, DEFAULT_CONNECT_TIMEOUT))
+    )
+    return create_client(url, key, options=SyncClientOptions(httpx_client=http_client))
+
+_clients: Dict[tuple, Client] = {}
+
+def get_client(timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES) -> Client:
+    """
+    Service-role client from .env.local, created once per process.
+
+    Exits with an error if the credentials are missing. With FAKE_SUPABASE_DB
+    set, requests go to a fake_supabase database at that path instead
+    (FAKE_SUPABASE_LATENCY_MS adds a fixed delay per request).
+    """
+    key = (timeout, retries)
+    if key not in _clients and os.getenv('FAKE_SUPABASE_DB'):
+        from fake_supabase import FakeSupabase, LatencyModel
+        latency_ms = float(os.getenv('FAKE_SUPABASE_LATENCY_MS') or 0)
+        fake = FakeSupabase(os.environ['FAKE_SUPABASE_DB'],
+                            latency=LatencyModel(base=latency_ms / 1000) if latency_ms else None)
+        _clients[key] = fake.client(timeout=timeout, retries=retries)
+    if key not in _clients:
+        supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+        supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+        if not supabase_url or not supabase_key:
+            print("[ERROR] Supabase credentials not found in .env.local")
+            print("Required variables: NEXT_PUBLIC_SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY")
+            sys.exit(1)
+
+        _clients[key] = create_pooled_client(supabase_url, supabase_key, timeout=timeout, retries=retries)
+    return _clients[key]
+
+def print_request_stats():
+    print("\n" + request_stats.summary())
+
+def add_client_arguments(parser: argparse.ArgumentParser):
+    """Add the shared --db-timeout/--db-retries/--db-stats options to a script's parser"""
+    parser.add_argument('--db-timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'Seconds to wait for a database response (default: {DEFAULT_TIMEOUT})')
+    parser.add_argument('--db-retries', type=int, default=DEFAULT_RETRIES,
+                        help=f'Retries for transient database failures (default: {DEFAULT_RETRIES})')
+    parser.add_argument('--db-stats', action='store_true',
+                        help='Print database request counts and latencies on exit')
+
+def client_from_args(args: argparse.Namespace) -> Client:
+    """get_client configured by add_client_arguments options"""
+    if args.db_stats:
+        atexit.register(print_request_stats)
+    return get_client(timeout=args.db_timeout, retries=args.db_retries)
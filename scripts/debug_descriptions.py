@@ -3,13 +3,19 @@
 Debug script to investigate description HTML structure
 """
 
-import requests
+import argparse
 from bs4 import BeautifulSoup
 
+from http_cache import add_cache_arguments, cache_from_args
+
 ADMIN_URL = 'https://videotilehost.com/hamptonsafety/adminWebsiteContent.php'
 
+parser = argparse.ArgumentParser(description='Investigate description HTML structure')
+add_cache_arguments(parser)
+args = parser.parse_args()
+
 print("Fetching page...")
-response = requests.get(ADMIN_URL)
+response = cache_from_args(args).get(ADMIN_URL)
 soup = BeautifulSoup(response.content, 'lxml')
 
 print("\n=== Looking for 'Abrasive Wheels' description ===\n")
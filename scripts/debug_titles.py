@@ -1,14 +1,20 @@
 #!/usr/bin/env python3
 """Debug course title parsing"""
 
-import requests
+import argparse
 from bs4 import BeautifulSoup
 from urllib.parse import parse_qs, urlparse
 
+from http_cache import add_cache_arguments, cache_from_args
+
 ADMIN_URL = 'https://videotilehost.com/hamptonsafety/adminWebsiteContent.php'
 
+parser = argparse.ArgumentParser(description='Debug course title parsing')
+add_cache_arguments(parser)
+args = parser.parse_args()
+
 print("Fetching page...")
-response = requests.get(ADMIN_URL)
+response = cache_from_args(args).get(ADMIN_URL)
 soup = BeautifulSoup(response.content, 'lxml')
 
 # Find "Abrasive Wheels" course (nid=26)
@@ -3,14 +3,12 @@
 Diagnostic script to investigate video loading and mismatch issues
 """
 
-import os
-import sys
-from dotenv import load_dotenv
-from supabase import create_client, Client
+import argparse
+from typing import Dict, List
 
-# Load environment variables
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-load_dotenv(os.path.join(project_root, '.env.local'))
+from catalog_mirror import add_catalog_arguments, catalog_from_args
+from catalog_report import group_by_course
+from fuzzy_index import DEFAULT_MIN_SCORE, FuzzyTitleIndex
 
 # Courses with video loading issues
 NOT_LOADING = [
@@ -36,44 +34,58 @@ MISMATCHED = {
     'SMART objectives': 'Video on Social media marketing'
 }
 
-def normalize_for_search(title: str) -> str:
-    """Normalize title for fuzzy searching"""
-    return title.lower().strip()
+def print_match(problem_title: str, matches: List, course_assets: Dict[int, List[Dict]],
+                reported_issue: str = None):
+    """Details of the best-ranked course for a reported title, plus runners-up"""
+    score, course = matches[0]
+    print(f"\n[FOUND] '{problem_title}' (score {score:.2f})")
+    print(f"  Database Title: {course['title']}")
+    print(f"  Course ID: {course['id']}")
+    print(f"  Slug: {course['slug']}")
+    if reported_issue:
+        print(f"  Reported Issue: {reported_issue}")
+
+    # Check assets
+    course_id = course['id']
+    if course_assets.get(course_id):
+        for asset in course_assets[course_id]:
+            if asset['type'] == 'video':
+                print(f"  Video URL: {asset['url']}")
+                if reported_issue:
+                    print(f"  [ANALYSIS] Video URL uses course ID {course_id}")
+    else:
+        print(f"  [WARNING] No assets found for this course!")
+
+    for other_score, other in matches[1:]:
+        print(f"  Other candidate: {other['title']} (ID {other['id']}, score {other_score:.2f})")
 
 def main():
-    # Initialize Supabase
-    supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
-
-    if not supabase_url or not supabase_key:
-        print("[ERROR] Supabase credentials not found in .env.local")
-        sys.exit(1)
-
-    supabase: Client = create_client(supabase_url, supabase_key)
+    parser = argparse.ArgumentParser(description='Diagnose video loading and mismatch reports')
+    parser.add_argument('--titles', help='File of reported non-loading titles, one per line (replaces the built-in list)')
+    parser.add_argument('--limit', type=int, default=3, help='Ranked candidates shown per report (default: 3)')
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE,
+                        help=f'Lowest similarity reported as a match (default: {DEFAULT_MIN_SCORE})')
+    add_catalog_arguments(parser)
+    args = parser.parse_args()
+
+    not_loading = NOT_LOADING
+    if args.titles:
+        with open(args.titles, 'r', encoding='utf-8') as f:
+            not_loading = [line.strip() for line in f if line.strip()]
+
+    # Live API, or the local mirror with --mirror
+    catalog = catalog_from_args(args)
 
     print("="*80)
     print("VIDEO ISSUE DIAGNOSTIC REPORT")
     print("="*80)
 
     # Get all courses with their assets
-    courses_response = supabase.table('courses').select(
-        'id, title, slug, icon_url, description'
-    ).execute()
-
-    assets_response = supabase.table('course_assets').select(
-        'course_id, type, url, label'
-    ).execute()
-
-    courses = courses_response.data
-    assets = assets_response.data
+    courses = catalog.courses('id, title, slug, icon_url, description')
+    assets = catalog.assets('course_id, type, url, label')
 
-    # Build asset lookup
-    course_assets = {}
-    for asset in assets:
-        course_id = asset['course_id']
-        if course_id not in course_assets:
-            course_assets[course_id] = []
-        course_assets[course_id].append(asset)
+    course_assets = group_by_course(assets)
+    title_index = FuzzyTitleIndex(courses)
 
     print(f"\nTotal courses in database: {len(courses)}")
     print(f"Total assets in database: {len(assets)}")
@@ -86,36 +98,15 @@ def main():
     found_count = 0
     not_found = []
 
-    for problem_title in NOT_LOADING:
-        normalized_problem = normalize_for_search(problem_title)
-
-        # Try to find matching course
-        matches = []
-        for course in courses:
-            normalized_course = normalize_for_search(course['title'])
-            if normalized_problem in normalized_course or normalized_course in normalized_problem:
-                matches.append(course)
-
+    for problem_title in not_loading:
+        matches = title_index.search(problem_title, limit=args.limit, min_score=args.min_score)
         if matches:
-            for course in matches:
-                found_count += 1
-                print(f"\n[FOUND] '{problem_title}'")
-                print(f"  Database Title: {course['title']}")
-                print(f"  Course ID: {course['id']}")
-                print(f"  Slug: {course['slug']}")
-
-                # Check assets
-                course_id = course['id']
-                if course_id in course_assets:
-                    for asset in course_assets[course_id]:
-                        if asset['type'] == 'video':
-                            print(f"  Video URL: {asset['url']}")
-                else:
-                    print(f"  [WARNING] No assets found for this course!")
+            found_count += 1
+            print_match(problem_title, matches, course_assets)
         else:
             not_found.append(problem_title)
 
-    print(f"\n[SUMMARY] Found {found_count} matches for non-loading videos")
+    print(f"\n[SUMMARY] Matched {found_count}/{len(not_loading)} non-loading video reports")
     if not_found:
         print(f"[WARNING] Could not find matches for: {', '.join(not_found)}")
 
@@ -128,37 +119,14 @@ def main():
     mismatch_not_found = []
 
     for problem_title, wrong_video in MISMATCHED.items():
-        normalized_problem = normalize_for_search(problem_title)
-
-        # Try to find matching course
-        matches = []
-        for course in courses:
-            normalized_course = normalize_for_search(course['title'])
-            if normalized_problem in normalized_course or normalized_course in normalized_problem:
-                matches.append(course)
-
+        matches = title_index.search(problem_title, limit=args.limit, min_score=args.min_score)
         if matches:
-            for course in matches:
-                mismatch_found += 1
-                print(f"\n[FOUND] '{problem_title}'")
-                print(f"  Database Title: {course['title']}")
-                print(f"  Course ID: {course['id']}")
-                print(f"  Slug: {course['slug']}")
-                print(f"  Reported Issue: {wrong_video}")
-
-                # Check assets
-                course_id = course['id']
-                if course_id in course_assets:
-                    for asset in course_assets[course_id]:
-                        if asset['type'] == 'video':
-                            print(f"  Video URL: {asset['url']}")
-                            print(f"  [ANALYSIS] Video URL uses course ID {course_id}")
-                else:
-                    print(f"  [WARNING] No assets found for this course!")
+            mismatch_found += 1
+            print_match(problem_title, matches, course_assets, reported_issue=wrong_video)
         else:
             mismatch_not_found.append(problem_title)
 
-    print(f"\n[SUMMARY] Found {mismatch_found} matches for mismatched videos")
+    print(f"\n[SUMMARY] Matched {mismatch_found}/{len(MISMATCHED)} mismatched video reports")
     if mismatch_not_found:
         print(f"[WARNING] Could not find matches for: {', '.join(mismatch_not_found)}")
 
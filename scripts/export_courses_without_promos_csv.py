@@ -4,15 +4,14 @@ Export courses without promotional videos to CSV for client review
 """
 
 import os
-import sys
-import re
 import csv
-from dotenv import load_dotenv
-from supabase import create_client, Client
+import argparse
+
+from catalog_mirror import add_catalog_arguments, catalog_from_args
+from course_records import CourseRecord
+from promo_index import load_promo_index
 
-# Load environment variables
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-load_dotenv(os.path.join(project_root, '.env.local'))
 
 SUITE_NAMES = {
     1: 'Health & Safety',
@@ -25,64 +24,41 @@ SUITE_NAMES = {
 # Production URL
 PRODUCTION_URL = "https://hamptonsafety.co.uk"
 
-def parse_promotional_video_ids(file_path):
-    """Extract numeric video IDs from promotional video scrape"""
-    video_ids = set()
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Extract numeric IDs only
-    pattern = r'<iframe src="https://videotilehost\.com/embed/(\d+)"'
-    matches = re.findall(pattern, content)
-
-    for video_id in matches:
-        video_ids.add(int(video_id))
-
-    return video_ids
-
 def main():
-    # Initialize Supabase
-    supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+    parser = argparse.ArgumentParser(description='Export courses without promotional videos to CSV')
+    add_catalog_arguments(parser)
+    args = parser.parse_args()
 
-    if not supabase_url or not supabase_key:
-        print("[ERROR] Supabase credentials not found")
-        sys.exit(1)
-
-    supabase = create_client(supabase_url, supabase_key)
+    # Live API, or the local mirror with --mirror
+    catalog = catalog_from_args(args)
 
     print("="*80)
     print("EXPORTING COURSES WITHOUT PROMOTIONAL VIDEOS TO CSV")
     print("="*80)
 
     # Parse promotional videos
-    promo_file = os.path.join(project_root, 'docs', 'Promotional video scrape.md')
-    promotional_video_ids = parse_promotional_video_ids(promo_file)
+    promotional_video_ids = load_promo_index().video_ids
 
     print(f"\nTotal promotional videos available: {len(promotional_video_ids)}")
 
     # Get courses
-    courses_response = supabase.table('courses').select('id, title, slug, category_id').execute()
-    categories_response = supabase.table('categories').select('id, name, suite_id').execute()
-
-    courses = courses_response.data
-    categories = {cat['id']: cat for cat in categories_response.data}
+    courses = [CourseRecord.from_row(row) for row in catalog.courses('id, title, slug, category_id')]
+    categories = {cat['id']: cat for cat in catalog.categories('id, name, suite_id')}
 
     # Find courses without promotional videos
     courses_without_promos = []
 
     for course in courses:
-        if course['id'] not in promotional_video_ids:
-            category = categories.get(course['category_id'])
+        if course.id not in promotional_video_ids:
+            category = categories.get(course.category_id)
             suite_id = category['suite_id'] if category else None
             suite_name = SUITE_NAMES.get(suite_id, 'Unknown')
 
             courses_without_promos.append({
-                'Course Name': course['title'],
-                'Course ID': course['id'],
-                'Slug': course['slug'],
-                'Online URL': f"{PRODUCTION_URL}/training/{course['slug']}",
+                'Course Name': course.title,
+                'Course ID': course.id,
+                'Slug': course.slug,
+                'Online URL': f"{PRODUCTION_URL}/training/{course.slug}",
                 'Video Fallback Category': suite_name
             })
 
@@ -4,48 +4,26 @@ Export all promotional video categories to CSV for client dropdown
 """
 
 import os
-import re
 import csv
 
+from promo_index import PROMO_FILE, load_promo_index
+
 # Project root
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-def parse_promotional_video_titles(file_path):
-    """Extract video titles from promotional video scrape"""
-    video_titles = []
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Pattern to match video entries - title before the iframe
-    # Format: Title:\n<iframe src="https://videotilehost.com/embed/XX" ...
-    pattern = r'([^\n]+?):\s*\n\s*<iframe src="https://videotilehost\.com/embed/(\d+)"'
-
-    matches = re.findall(pattern, content)
-
-    for title, video_id in matches:
-        title = title.strip()
-        # Skip suite-level videos
-        if title in ['Generic eLearning Video', 'Business Skills', 'Health & Safety', 'Health & Social Care']:
-            continue
-        video_titles.append(title)
-
-    return sorted(video_titles)
-
 def main():
     print("="*80)
     print("EXPORTING PROMOTIONAL VIDEO CATEGORIES TO CSV")
     print("="*80)
 
     # Parse promotional videos
-    promo_file = os.path.join(project_root, 'docs', 'Promotional video scrape.md')
-
-    if not os.path.exists(promo_file):
-        print(f"[ERROR] File not found: {promo_file}")
+    if not os.path.exists(PROMO_FILE):
+        print(f"[ERROR] File not found: {PROMO_FILE}")
         return
 
-    print(f"\nParsing: {promo_file}")
-    video_categories = parse_promotional_video_titles(promo_file)
+    print(f"\nLoading: {PROMO_FILE}")
+    # Suite-level videos (SU1, ALL, ...) are not course videos and are not listed
+    video_categories = load_promo_index().titles()
 
     print(f"Found {len(video_categories)} promotional video categories")
 
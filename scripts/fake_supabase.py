@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the Supabase REST API, backed by SQLite
+FakeSupabase answers PostgREST requests (the subset the scripts use: select
+with filters, or/and/not, order, limit/offset and count=exact; insert,
+upsert, update, delete; the reset_course_data RPC and the catalog_counts
+view) from a SQLite database carrying the constraints of
+supabase/migrations/001. It plugs in below the real supabase-py client, so
+scripts run unchanged, and an injectable latency model makes round trips
+cost time the way they do against the hosted project
+
+Any script can be pointed at it through db_client:
+    FAKE_SUPABASE_DB=/tmp/catalog.sqlite python fix_videos_simple.py
+"""
+
+import re
+import json
+import time
+import random
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+FAKE_URL = 'http://fake.supabase.local'
+# Any well-formed JWT; the fake does not check it
+FAKE_KEY = 'eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.fake'
+
+# supabase/migrations/001 (+ course_assets.updated_at from 004) in SQLite terms.
+# VARCHAR limits become named CHECKs so they fail like Postgres length errors.
+SCHEMA = """
+PRAGMA foreign_keys = ON;
+CREATE TABLE IF NOT EXISTS categories (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name TEXT NOT NULL UNIQUE CONSTRAINT categories_name_length CHECK (length(name) <= 255),
+  suite_id INTEGER NOT NULL UNIQUE CONSTRAINT categories_suite_id_check CHECK (suite_id BETWEEN 1 AND 5),
+  purchase_url TEXT NOT NULL,
+  created_at TEXT,
+  updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS courses (
+  id INTEGER PRIMARY KEY,
+  title TEXT NOT NULL CONSTRAINT courses_title_length CHECK (length(title) <= 500),
+  slug TEXT NOT NULL UNIQUE CONSTRAINT courses_slug_length CHECK (length(slug) <= 500),
+  category_id INTEGER NOT NULL REFERENCES categories(id) ON DELETE CASCADE,
+  icon_url TEXT,
+  description TEXT,
+  purchase_url TEXT NOT NULL,
+  free_trial_url TEXT,
+  created_at TEXT,
+  updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_courses_category_id ON courses(category_id);
+CREATE TABLE IF NOT EXISTS course_assets (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+  type TEXT NOT NULL CONSTRAINT course_assets_type_check CHECK (type IN ('pdf', 'video')),
+  url TEXT NOT NULL,
+  label TEXT CONSTRAINT course_assets_label_length CHECK (label IS NULL OR length(label) <= 255),
+  created_at TEXT,
+  updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_course_assets_course_id ON course_assets(course_id);
+CREATE VIEW IF NOT EXISTS catalog_counts AS
+SELECT 'category' AS kind, cat.id AS sort_key, cat.name AS name, COUNT(c.id) AS total
+FROM categories cat LEFT JOIN courses c ON c.category_id = cat.id
+GROUP BY cat.id, cat.name
+UNION ALL
+SELECT 'asset_type', NULL, a.type, COUNT(*) FROM course_assets a GROUP BY a.type
+UNION ALL
+SELECT 'courses', NULL, 'total', COUNT(*) FROM courses
+UNION ALL
+SELECT 'assets', NULL, 'total', COUNT(*) FROM course_assets;
+"""
+
+SEED_CATEGORIES = [
+    ('Health & Safety', 1), ('Business Skills', 2), ('Health & Social Care', 3),
+    ('Mental Health & Wellbeing', 4), ('Hospitality', 5),
+]
+
+COMPARISONS = {'eq': '=', 'neq': '<>', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+
+# Query string keys that are not column filters
+RESERVED_PARAMS = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns'}
+
+class PostgrestError(Exception):
+    """An error response in PostgREST's JSON shape"""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+class LatencyModel:
+    """
+    Simulated cost of one request: base + per_row * rows, plus up to
+    `jitter` seconds of uniform noise (seeded, so runs are repeatable).
+    """
+
+    def __init__(self, base: float = 0.0, per_row: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.base = base
+        self.per_row = per_row
+        self.jitter = jitter
+        self.random = random.Random(seed)
+
+    def __call__(self, method: str, table: str, rows: int) -> float:
+        noise = self.random.uniform(0, self.jitter) if self.jitter else 0.0
+        return self.base + self.per_row * rows + noise
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def _split_top(text: str) -> List[str]:
+    """Split on commas outside parentheses and double quotes"""
+    parts, depth, quoted, current = [], 0, False, ''
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        if char == ',' and depth == 0 and not quoted:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    if current:
+        parts.append(current)
+    return parts
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+    return value
+
+def _like_to_glob(pattern: str) -> str:
+    """Case-sensitive LIKE as a GLOB (SQLite's LIKE ignores ASCII case)"""
+    escaped = ''.join(f'[{char}]' if char in '[]*?' else char for char in pattern.replace('*', '%'))
+    return escaped.replace('%', '*').replace('_', '?')
+
+class FakeSupabase(httpx.BaseTransport):
+    """
+    SQLite-backed PostgREST emulation usable as an httpx transport.
+
+    `latency(method, table, rows)` returns the seconds a request should
+    cost; they are slept with `sleep` (pass sleep=None to only add them to
+    stats['latency_seconds']). fail_next() queues error responses for
+    exercising retries.
+    """
+
+    def __init__(self, path: str = ':memory:', latency: Optional[Callable[[str, str, int], float]] = None,
+                 sleep: Optional[Callable[[float], None]] = time.sleep, seed_categories: bool = True):
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.latency = latency
+        self.sleep = sleep
+        self.failures: List[Tuple[int, Optional[Callable[[httpx.Request], bool]]]] = []
+        self.stats = {'requests': 0, 'by_operation': {}, 'rows_read': 0, 'rows_written': 0,
+                      'latency_seconds': 0.0}
+        self.columns = {
+            table: [row['name'] for row in self.conn.execute(f'PRAGMA table_info({table})')]
+            for table in ('categories', 'courses', 'course_assets', 'catalog_counts')
+        }
+        if seed_categories and not self.conn.execute('SELECT 1 FROM categories LIMIT 1').fetchone():
+            now = _now()
+            self.conn.executemany(
+                'INSERT INTO categories (name, suite_id, purchase_url, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+                [(name, suite_id, f'https://www.videotilehost.com/hamptonsafety/purchaseCourse.php?suite={suite_id}',
+                  now, now) for name, suite_id in SEED_CATEGORIES]
+            )
+
+    # ------------------------------------------------------------------
+    # Client helpers
+    # ------------------------------------------------------------------
+
+    def client(self, timeout: float = 30, retries: int = 4):
+        """A real supabase-py client whose requests are answered by this fake"""
+        from db_client import create_pooled_client
+        return create_pooled_client(FAKE_URL, FAKE_KEY, timeout=timeout, retries=retries, transport=self)
+
+    def fail_next(self, status: int = 503, count: int = 1,
+                  when: Optional[Callable[[httpx.Request], bool]] = None):
+        """
+        Answer the next `count` requests with `status` before touching the
+        database. With `when`, only requests it accepts are failed, so
+        concurrent callers fail the same request whatever order they run in.
+        """
+        self.failures.extend([(status, when)] * count)
+
+    def load(self, table: str, rows: List[Dict]):
+        """Seed rows directly (no request accounting); constraints still apply"""
+        with self.lock:
+            self._begin()
+            try:
+                self._insert_rows(table, rows, None, None)
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+
+    def rows(self, table: str) -> List[Dict]:
+        """Current contents of table in id order"""
+        return [dict(row) for row in self.conn.execute(f'SELECT * FROM {self._table(table)} ORDER BY id')]
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.split('/rest/v1/', 1)[-1]
+        with self.lock:
+            self.stats['requests'] += 1
+            operation = f"{request.method} {path}"
+            self.stats['by_operation'][operation] = self.stats['by_operation'].get(operation, 0) + 1
+
+            for index, (status, when) in enumerate(self.failures):
+                if when is None or when(request):
+                    del self.failures[index]
+                    return self._error(request, PostgrestError(status, 'FAKE', f'Injected failure ({status})'))
+
+            try:
+                if path.startswith('rpc/'):
+                    status, body, headers, rows = self._rpc(path[4:])
+                else:
+                    status, body, headers, rows = self._dispatch(request, path)
+            except PostgrestError as e:
+                return self._error(request, e)
+
+            seconds = self.latency(request.method, path, rows) if self.latency else 0.0
+            self.stats['latency_seconds'] += seconds
+
+        # Outside the lock: concurrent requests overlap their round trips as they would over the network
+        if self.sleep and seconds > 0:
+            self.sleep(seconds)
+
+        content = b'' if body is None else json.dumps(body).encode('utf-8')
+        headers.setdefault('Content-Type', 'application/json')
+        return httpx.Response(status, headers=headers, content=content, request=request)
+
+    def _error(self, request: httpx.Request, error: PostgrestError) -> httpx.Response:
+        body = {'code': error.code, 'message': error.message, 'details': None, 'hint': None}
+        return httpx.Response(error.status, json=body, request=request)
+
+    def _begin(self):
+        self.conn.execute('BEGIN')
+
+    def _dispatch(self, request: httpx.Request, path: str):
+        table = self._table(path)
+        params = request.url.params
+        prefer = request.headers.get('Prefer', '')
+        representation = 'return=representation' in prefer
+
+        if request.method in ('GET', 'HEAD'):
+            return self._select(table, params, prefer)
+
+        payload = json.loads(request.content) if request.content else {}
+        self._begin()
+        try:
+            if request.method == 'POST':
+                rows = payload if isinstance(payload, list) else [payload]
+                columns = [_unquote(name) for name in _split_top(params['columns'])] if 'columns' in params else None
+                if 'resolution=merge-duplicates' in prefer:
+                    mode = 'merge'
+                elif 'resolution=ignore-duplicates' in prefer:
+                    mode = 'ignore'
+                else:
+                    mode = None
+                conflict = [name.strip() for name in params['on_conflict'].split(',')] \
+                    if params.get('on_conflict') else None
+                if 'missing=default' not in prefer and columns is None and len(rows) > 1:
+                    columns = list(rows[0])
+                ids = self._insert_rows(table, rows, columns, mode, conflict,
+                                        missing_default='missing=default' in prefer)
+                status = 201
+            elif request.method == 'PATCH':
+                ids = self._update(table, params, payload)
+                status = 200
+            elif request.method == 'DELETE':
+                deleted = self._delete(table, params)
+                ids = None
+                status = 200
+            else:
+                raise PostgrestError(405, 'PGRST117', f'Unsupported HTTP method: {request.method}')
+            self.conn.execute('COMMIT')
+        except sqlite3.IntegrityError as e:
+            self.conn.execute('ROLLBACK')
+            raise self._constraint_error(str(e))
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+
+        result = deleted if ids is None else self._rows_by_id(table, ids)
+        self.stats['rows_written'] += len(result)
+        headers = {}
+        if 'count=exact' in prefer:
+            headers['Content-Range'] = f"*/{len(result)}"
+        if not representation:
+            return 204 if status == 200 else status, None, headers, len(result)
+        return status, result, headers, len(result)
+
+    def _rpc(self, name: str):
+        if name != 'reset_course_data':
+            raise PostgrestError(404, 'PGRST202', f'Could not find the function public.{name} in the schema cache')
+        self._begin()
+        try:
+            assets = self.conn.execute('DELETE FROM course_assets WHERE id IS NOT NULL').rowcount
+            courses = self.conn.execute('DELETE FROM courses WHERE id IS NOT NULL').rowcount
+            self.conn.execute('COMMIT')
+        except sqlite3.IntegrityError as e:
+            self.conn.execute('ROLLBACK')
+            raise self._constraint_error(str(e))
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        return 200, [{'assets_deleted': assets, 'courses_deleted': courses}], {}, assets + courses
+
+    # ------------------------------------------------------------------
+    # SQL building
+    # ------------------------------------------------------------------
+
+    def _table(self, name: str) -> str:
+        if name not in self.columns:
+            raise PostgrestError(404, '42P01', f'relation "public.{name}" does not exist')
+        return name
+
+    def _column(self, table: str, name: str) -> str:
+        if name not in self.columns[table]:
+            raise PostgrestError(400, '42703', f'column {table}.{name} does not exist')
+        return f'"{name}"'
+
+    def _condition(self, table: str, column: str, expression: str) -> Tuple[str, list]:
+        """SQL for one PostgREST filter such as 'eq.5', 'not.is.null' or 'in.(1,2)'"""
+        negate = expression.startswith('not.')
+        if negate:
+            expression = expression[4:]
+
+        if column in ('or', 'and'):
+            sql, params = self._logic(table, column, expression)
+        else:
+            operator, _, value = expression.partition('.')
+            target = self._column(table, column)
+            if operator in COMPARISONS:
+                sql, params = f'{target} {COMPARISONS[operator]} ?', [_unquote(value)]
+            elif operator == 'like':
+                sql, params = f'{target} GLOB ?', [_like_to_glob(_unquote(value))]
+            elif operator == 'ilike':
+                sql, params = f'{target} LIKE ?', [_unquote(value).replace('*', '%')]
+            elif operator == 'is':
+                keyword = {'null': 'NULL', 'true': '1', 'false': '0'}.get(value.lower())
+                if keyword is None:
+                    raise PostgrestError(400, 'PGRST100', f'Invalid is value: {value}')
+                sql, params = f'{target} IS {keyword}', []
+            elif operator == 'in':
+                items = [_unquote(item) for item in _split_top(value.strip('()'))]
+                sql, params = f"{target} IN ({', '.join('?' for _ in items)})", items
+            else:
+                raise PostgrestError(400, 'PGRST100', f'Unsupported operator: {operator}')
+
+        return (f'NOT ({sql})', params) if negate else (sql, params)
+
+    def _logic(self, table: str, joiner: str, expression: str) -> Tuple[str, list]:
+        """SQL for or=(a.eq.1,and(b.gt.2,c.is.null))"""
+        clauses, params = [], []
+        for part in _split_top(expression.strip()[1:-1]):
+            nested = re.match(r'(not\.)?(and|or)(\(.*\))$', part)
+            if nested:
+                sql, part_params = self._condition(table, nested.group(2), (nested.group(1) or '') + nested.group(3))
+            else:
+                column, _, rest = part.partition('.')
+                sql, part_params = self._condition(table, column, rest)
+            clauses.append(f'({sql})')
+            params.extend(part_params)
+        return f' {joiner.upper()} '.join(clauses) or '1', params
+
+    def _where(self, table: str, params: httpx.QueryParams) -> Tuple[str, list]:
+        clauses, values = [], []
+        for key, value in params.multi_items():
+            if key in RESERVED_PARAMS:
+                continue
+            sql, condition_params = self._condition(table, key, value)
+            clauses.append(f'({sql})')
+            values.extend(condition_params)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ''), values
+
+    def _select(self, table: str, params: httpx.QueryParams, prefer: str):
+        names = [name.strip() for name in params.get('select', '*').split(',')]
+        columns = '*' if names == ['*'] else ', '.join(self._column(table, name) for name in names)
+        where, values = self._where(table, params)
+
+        order = []
+        for term in filter(None, params.get('order', '').split(',')):
+            column, *modifiers = term.split('.')
+            direction = 'DESC' if 'desc' in modifiers else 'ASC'
+            nulls = 'NULLS FIRST' if 'nullsfirst' in modifiers or (direction == 'DESC' and 'nullslast' not in modifiers) \
+                else 'NULLS LAST'
+            order.append(f'{self._column(table, column)} {direction} {nulls}')
+        order_sql = f"ORDER BY {', '.join(order)}" if order else ''
+
+        limit = int(params['limit']) if 'limit' in params else -1
+        offset = int(params.get('offset', 0))
+        rows = [dict(row) for row in self.conn.execute(
+            f'SELECT {columns} FROM {table} {where} {order_sql} LIMIT ? OFFSET ?', values + [limit, offset])]
+        self.stats['rows_read'] += len(rows)
+
+        headers = {}
+        if 'count=exact' in prefer:
+            total = self.conn.execute(f'SELECT COUNT(*) FROM {table} {where}', values).fetchone()[0]
+            span = f"{offset}-{offset + len(rows) - 1}" if rows else '*'
+            headers['Content-Range'] = f"{span}/{total}"
+        return 200, rows, headers, len(rows)
+
+    def _insert_rows(self, table: str, rows: List[Dict], columns: Optional[List[str]], mode: Optional[str],
+                     conflict: Optional[List[str]] = None, missing_default: bool = False) -> List[int]:
+        """Insert (or upsert) rows one by one; returns the ids actually written"""
+        table_columns = self.columns[table]
+        conflict = conflict or ['id']
+        ids = []
+        for row in rows:
+            unknown = [key for key in row if key not in table_columns]
+            if unknown:
+                raise PostgrestError(400, 'PGRST204',
+                                     f"Could not find the '{unknown[0]}' column of '{table}' in the schema cache")
+            if columns is None or missing_default:
+                values = dict(row)
+            else:
+                # PostgREST fills keys missing from an object with NULL, not the default
+                values = {name: row.get(name) for name in columns}
+
+            now = _now()
+            inserted = dict(values)
+            inserted.setdefault('created_at', now)
+            if 'updated_at' in table_columns:
+                inserted.setdefault('updated_at', now)
+
+            names = ', '.join(self._column(table, name) for name in inserted)
+            sql = f"INSERT INTO {table} ({names}) VALUES ({', '.join('?' for _ in inserted)})"
+            if mode:
+                target = ', '.join(self._column(table, name) for name in conflict)
+                updates = [f'{self._column(table, name)} = excluded.{self._column(table, name)}'
+                           for name in values if name not in conflict and name != 'created_at']
+                if mode == 'merge' and updates:
+                    if 'updated_at' in table_columns and 'updated_at' not in values:
+                        updates.append('"updated_at" = excluded."updated_at"')
+                    sql += f" ON CONFLICT ({target}) DO UPDATE SET {', '.join(updates)}"
+                else:
+                    sql += f" ON CONFLICT ({target}) DO NOTHING"
+            written = self.conn.execute(sql + ' RETURNING id', list(inserted.values())).fetchone()
+            if written is not None:
+                ids.append(written['id'])
+        return ids
+
+    def _update(self, table: str, params: httpx.QueryParams, payload: Dict) -> List[int]:
+        where, values = self._where(table, params)
+        if not where:
+            raise PostgrestError(400, '21000', 'UPDATE requires a WHERE clause')
+        if not payload:
+            return []
+        ids = [row['id'] for row in self.conn.execute(f'SELECT id FROM {table} {where}', values)]
+        if ids:
+            changes = dict(payload)
+            if 'updated_at' in self.columns[table]:
+                # The update_updated_at_column trigger always wins
+                changes['updated_at'] = _now()
+            assignments = ', '.join(f'{self._column(table, name)} = ?' for name in changes)
+            self.conn.execute(
+                f"UPDATE {table} SET {assignments} WHERE id IN ({', '.join('?' for _ in ids)})",
+                list(changes.values()) + ids
+            )
+        return ids
+
+    def _delete(self, table: str, params: httpx.QueryParams) -> List[Dict]:
+        where, values = self._where(table, params)
+        if not where:
+            raise PostgrestError(400, '21000', 'DELETE requires a WHERE clause')
+        deleted = [dict(row) for row in self.conn.execute(f'SELECT * FROM {table} {where} ORDER BY id', values)]
+        self.conn.execute(f'DELETE FROM {table} {where}', values)
+        return deleted
+
+    def _rows_by_id(self, table: str, ids: List[int]) -> List[Dict]:
+        if not ids:
+            return []
+        found = {row['id']: dict(row) for row in self.conn.execute(
+            f"SELECT * FROM {table} WHERE id IN ({', '.join('?' for _ in ids)})", ids)}
+        return [found[row_id] for row_id in ids if row_id in found]
+
+    def _constraint_error(self, message: str) -> PostgrestError:
+        """sqlite3 IntegrityError text as the matching Postgres error"""
+        if message.startswith('UNIQUE'):
+            column = message.split(': ', 1)[-1].split(',')[0]
+            return PostgrestError(409, '23505', f'duplicate key value violates unique constraint on {column}')
+        if message.startswith('FOREIGN KEY'):
+            return PostgrestError(409, '23503', 'insert or update violates foreign key constraint')
+        if message.startswith('NOT NULL'):
+            column = message.split(': ', 1)[-1].split('.')[-1]
+            return PostgrestError(400, '23502', f'null value in column "{column}" violates not-null constraint')
+        if message.startswith('CHECK'):
+            constraint = message.split(': ', 1)[-1]
+            if constraint.endswith('_length'):
+                return PostgrestError(400, '22001', f'value too long ({constraint})')
+            return PostgrestError(400, '23514', f'new row violates check constraint "{constraint}"')
+        return PostgrestError(400, '23000', message)
@@ -1,25 +1,22 @@
 #!/usr/bin/env python3
 """Find duplicate course titles in scraped data"""
 
-import requests
+import argparse
 from bs4 import BeautifulSoup
 from urllib.parse import parse_qs, urlparse, urljoin
 from collections import Counter
 
+from http_cache import add_cache_arguments, cache_from_args
+from text_normalize import slugify
+
 ADMIN_URL = 'https://videotilehost.com/hamptonsafety/adminWebsiteContent.php'
 
-def slugify(title):
-    """Convert title to URL-friendly slug"""
-    import re
-    slug = title.lower().strip()
-    slug = re.sub(r'[\s_]+', '-', slug)
-    slug = re.sub(r'[^\w\-]', '', slug)
-    slug = slug.strip('-')
-    slug = re.sub(r'\-+', '-', slug)
-    return slug
+parser = argparse.ArgumentParser(description='Find duplicate course titles in scraped data')
+add_cache_arguments(parser)
+args = parser.parse_args()
 
 print("Fetching page...")
-response = requests.get(ADMIN_URL)
+response = cache_from_args(args).get(ADMIN_URL)
 soup = BeautifulSoup(response.content, 'lxml')
 
 print("Finding all course titles...")
@@ -3,28 +3,19 @@
 Fix course categorization based on course content and industry standards
 """
 
-import os
-import sys
-from dotenv import load_dotenv
-from supabase import create_client
+import re
 
-# Load environment variables
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-load_dotenv(os.path.join(project_root, '.env.local'))
+from batch_writer import DEFAULT_BATCH_SIZE, format_throughput, write_in_batches
+from catalog_report import fetch_counts, print_category_distribution
+from course_records import CourseRecord
+from db_client import get_client
+from table_reader import iter_rows
 
-# Initialize Supabase
-supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
-
-if not supabase_url or not supabase_key:
-    print("[ERROR] Supabase credentials not found")
-    sys.exit(1)
-
-supabase = create_client(supabase_url, supabase_key)
+# Initialize Supabase (pooled, retries transient failures)
+supabase = get_client()
 
 # Get category IDs
-categories_result = supabase.table('categories').select('*').execute()
-category_map = {cat['name']: cat['id'] for cat in categories_result.data}
+category_map = {cat['name']: cat['id'] for cat in iter_rows(supabase, 'categories', 'id, name')}
 
 HEALTH_SAFETY_ID = category_map['Health & Safety']
 BUSINESS_SKILLS_ID = category_map['Business Skills']
@@ -74,14 +65,29 @@ RECATEGORIZATION_RULES = {
     'haccp': HOSPITALITY_ID,
 }
 
+# All keywords in one pattern, matched as whole words. The lookahead reports
+# the longest keyword starting at each position; shorter keywords that are
+# words inside it are added from _CONTAINED_KEYWORDS.
+_KEYWORDS = sorted(RECATEGORIZATION_RULES, key=len, reverse=True)
+_KEYWORD_PATTERN = re.compile(r'(?=\b(' + '|'.join(re.escape(keyword) for keyword in _KEYWORDS) + r')\b)')
+_CONTAINED_KEYWORDS = {
+    keyword: [other for other in _KEYWORDS
+              if other != keyword and re.search(r'\b' + re.escape(other) + r'\b', keyword)]
+    for keyword in _KEYWORDS
+}
+_RULE_ORDER = {keyword: index for index, keyword in enumerate(RECATEGORIZATION_RULES)}
+
 def determine_correct_category(course_title: str, current_category_id: int) -> int:
     """Determine the correct category for a course based on its title"""
-    title_lower = course_title.lower()
+    found = set()
+    for match in _KEYWORD_PATTERN.finditer(course_title.lower()):
+        keyword = match.group(1)
+        found.add(keyword)
+        found.update(_CONTAINED_KEYWORDS[keyword])
 
-    # Check recategorization rules
-    for keyword, target_category_id in RECATEGORIZATION_RULES.items():
-        if keyword in title_lower:
-            return target_category_id
+    # Earliest rule wins when several keywords match
+    if found:
+        return RECATEGORIZATION_RULES[min(found, key=_RULE_ORDER.get)]
 
     # If no match found, keep current category
     return current_category_id
@@ -92,8 +98,7 @@ def main():
     print("="*80)
 
     # Get all courses
-    courses_result = supabase.table('courses').select('id, title, category_id').execute()
-    courses = courses_result.data
+    courses = [CourseRecord.from_row(row) for row in iter_rows(supabase, 'courses', 'id, title, category_id')]
 
     updates = []
     unchanged = 0
@@ -101,13 +106,13 @@ def main():
     print(f"\nAnalyzing {len(courses)} courses...")
 
     for course in courses:
-        correct_category_id = determine_correct_category(course['title'], course['category_id'])
+        correct_category_id = determine_correct_category(course.title, course.category_id)
 
-        if correct_category_id != course['category_id']:
+        if correct_category_id != course.category_id:
             updates.append({
-                'id': course['id'],
-                'title': course['title'],
-                'old_category': course['category_id'],
+                'id': course.id,
+                'title': course.title,
+                'old_category': course.category_id,
                 'new_category': correct_category_id
             })
         else:
@@ -137,24 +142,25 @@ def main():
     print("APPLYING CHANGES")
     print("="*80)
 
+    # One bulk update per target category
+    by_target = {}
+    for update in updates:
+        by_target.setdefault(update['new_category'], []).append(update)
+
     success_count = 0
     error_count = 0
 
-    for update in updates:
-        try:
-            result = supabase.table('courses').update({
-                'category_id': update['new_category']
-            }).eq('id', update['id']).execute()
-
-            if result.data:
-                success_count += 1
-                print(f"  [OK] Updated course {update['id']}")
-            else:
-                error_count += 1
-                print(f"  [ERROR] Failed to update course {update['id']}")
-        except Exception as e:
-            error_count += 1
-            print(f"  [ERROR] Course {update['id']}: {str(e)}")
+    for target_id, group in sorted(by_target.items()):
+        stats = write_in_batches(
+            f"courses update ({category_names[target_id]})", group,
+            lambda batch: supabase.table('courses').update({
+                'category_id': target_id
+            }).in_('id', [update['id'] for update in batch]).execute(),
+            DEFAULT_BATCH_SIZE
+        )
+        success_count += stats['written']
+        error_count += len(stats['failed_rows'])
+        print(f"  {format_throughput(category_names[target_id], stats)}")
 
     # Summary
     print("\n" + "="*80)
@@ -169,10 +175,7 @@ def main():
     print("NEW CATEGORY DISTRIBUTION")
     print("="*80)
 
-    for cat_name, cat_id in sorted(category_map.items(), key=lambda x: x[1]):
-        result = supabase.table('courses').select('id', count='exact').eq('category_id', cat_id).execute()
-        count = result.count
-        print(f"{cat_name}: {count} courses")
+    print_category_distribution(fetch_counts(supabase))
 
     print("="*80)
 
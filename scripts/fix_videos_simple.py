@@ -7,13 +7,13 @@ Otherwise -> use suite fallback /embed/SU{suite_id}
 
 import os
 import sys
-import re
-from dotenv import load_dotenv
-from supabase import create_client, Client
+import argparse
 
-# Load environment variables
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-load_dotenv(os.path.join(project_root, '.env.local'))
+from batch_writer import DEFAULT_BATCH_SIZE, format_throughput, write_in_batches
+from course_records import AssetRecord, CourseRecord
+from db_client import add_client_arguments, client_from_args
+from promo_index import PROMO_FILE, load_promo_index
+from table_reader import iter_rows
 
 SUITE_VIDEO_CODES = {
     1: 'SU1',  # Health & Safety
@@ -23,54 +23,31 @@ SUITE_VIDEO_CODES = {
     5: 'SU5',  # Hospitality
 }
 
-def parse_promotional_video_ids(file_path):
-    """Extract numeric video IDs from promotional video scrape"""
-    video_ids = set()
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Extract numeric IDs only (not SU1, SU2, etc)
-    pattern = r'<iframe src="https://videotilehost\.com/embed/(\d+)"'
-    matches = re.findall(pattern, content)
-
-    for video_id in matches:
-        video_ids.add(int(video_id))
-
-    return video_ids
-
 def main():
+    parser = argparse.ArgumentParser(description='Point every course at its promotional or suite fallback video')
+    add_client_arguments(parser)
+    args = parser.parse_args()
+
     print("="*80)
     print("SIMPLE VIDEO FIX - ID MATCHING")
     print("="*80)
 
-    # Initialize Supabase
-    supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
-
-    if not supabase_url or not supabase_key:
-        print("[ERROR] Supabase credentials not found")
-        sys.exit(1)
-
-    supabase = create_client(supabase_url, supabase_key)
+    # Initialize Supabase (pooled, retries transient failures; --db-stats prints request counts)
+    supabase = client_from_args(args)
 
     # Parse promotional videos
-    promo_file = os.path.join(project_root, 'docs', 'Promotional video scrape.md')
-    if not os.path.exists(promo_file):
-        print(f"[ERROR] File not found: {promo_file}")
+    if not os.path.exists(PROMO_FILE):
+        print(f"[ERROR] File not found: {PROMO_FILE}")
         sys.exit(1)
 
-    print(f"\nParsing promotional videos...")
-    promotional_video_ids = parse_promotional_video_ids(promo_file)
+    print(f"\nLoading promotional video index...")
+    promotional_video_ids = load_promo_index().video_ids
     print(f"Found {len(promotional_video_ids)} promotional videos")
 
     # Get courses
     print("\nFetching courses from database...")
-    courses_response = supabase.table('courses').select('id, title, category_id').execute()
-    categories_response = supabase.table('categories').select('id, suite_id').execute()
-
-    courses = courses_response.data
-    categories = {cat['id']: cat for cat in categories_response.data}
+    courses = [CourseRecord.from_row(row) for row in iter_rows(supabase, 'courses', 'id, title, category_id')]
+    categories = {cat['id']: cat for cat in iter_rows(supabase, 'categories', 'id, suite_id')}
 
     print(f"Found {len(courses)} courses")
 
@@ -79,24 +56,24 @@ def main():
     with_suite_fallback = []
 
     for course in courses:
-        category = categories.get(course['category_id'])
+        category = categories.get(course.category_id)
         if not category:
             continue
 
         suite_id = category['suite_id']
         suite_code = SUITE_VIDEO_CODES.get(suite_id, f'SU{suite_id}')
 
-        if course['id'] in promotional_video_ids:
+        if course.id in promotional_video_ids:
             with_promo_video.append({
-                'course_id': course['id'],
-                'title': course['title'],
-                'video_id': str(course['id']),
+                'course_id': course.id,
+                'title': course.title,
+                'video_id': str(course.id),
                 'video_type': 'individual'
             })
         else:
             with_suite_fallback.append({
-                'course_id': course['id'],
-                'title': course['title'],
+                'course_id': course.id,
+                'title': course.title,
                 'video_id': suite_code,
                 'video_type': 'suite',
                 'suite_id': suite_id
@@ -118,15 +95,27 @@ def main():
     for item in with_suite_fallback[:10]:
         print(f"  ID {item['course_id']:3} -> /embed/{item['video_id']:3} | {item['title'][:55]}")
 
+    # Build the complete video asset set up front
+    all_videos = with_promo_video + with_suite_fallback
+    new_assets = []
+    for item in all_videos:
+        label = f"{item['title']} - Promotional Video" if item['video_type'] == 'individual' else f"Suite Overview - Promotional Video"
+        video = AssetRecord('video', f"https://videotilehost.com/embed/{item['video_id']}", label)
+        new_assets.append(video.to_payload(item['course_id']))
+
+    # Existing video assets, replaced only once the new set is fully written
+    old_ids = [row['id'] for row in iter_rows(supabase, 'course_assets', 'id',
+                                              where=lambda query: query.eq('type', 'video'))]
+
     # Confirm
     print("\n" + "="*80)
     print("READY TO UPDATE DATABASE")
     print("="*80)
     print(f"\nThis will:")
-    print(f"  1. Delete all {len(courses)} existing video assets")
-    print(f"  2. Create {len(with_promo_video)} individual video assets")
-    print(f"  3. Create {len(with_suite_fallback)} suite fallback video assets")
-    print(f"  Total: {len(with_promo_video) + len(with_suite_fallback)} new video assets")
+    print(f"  1. Create {len(with_promo_video)} individual video assets")
+    print(f"  2. Create {len(with_suite_fallback)} suite fallback video assets")
+    print(f"  3. Delete the {len(old_ids)} existing video assets once all new ones are written")
+    print(f"  Total: {len(new_assets)} new video assets")
     print()
 
     response = input("Proceed? (yes/no): ")
@@ -140,60 +129,58 @@ def main():
     print("EXECUTING FIX")
     print("="*80)
 
-    # Step 1: Delete existing videos
-    print("\nStep 1: Deleting existing video assets...")
-    try:
-        delete_result = supabase.table('course_assets').delete().eq('type', 'video').execute()
-        print(f"  Deleted existing video assets")
-    except Exception as e:
-        print(f"  Error during deletion: {e}")
-
-    # Step 2: Create new video assets
-    print("\nStep 2: Creating new video assets...")
-    created = 0
-    errors = []
-
-    all_videos = with_promo_video + with_suite_fallback
-
-    for item in all_videos:
-        try:
-            label = f"{item['title']} - Promotional Video" if item['video_type'] == 'individual' else f"Suite Overview - Promotional Video"
-
-            asset_data = {
-                'course_id': item['course_id'],
-                'type': 'video',
-                'url': f"https://videotilehost.com/embed/{item['video_id']}",
-                'label': label
-            }
-
-            supabase.table('course_assets').insert(asset_data).execute()
-            created += 1
-
-            if created % 25 == 0:
-                print(f"  Progress: {created}/{len(all_videos)}...")
-
-        except Exception as e:
-            errors.append(f"Course {item['course_id']}: {str(e)}")
-
-    print(f"\n  Created {created} video assets")
+    # Step 1: Stage the new video assets alongside the old ones
+    print("\nStep 1: Writing new video assets...")
+    staged_ids = []
+
+    def insert_batch(batch):
+        result = supabase.table('course_assets').insert(batch).execute()
+        staged_ids.extend(row['id'] for row in result.data)
+
+    insert_stats = write_in_batches('course_assets insert', new_assets, insert_batch, DEFAULT_BATCH_SIZE)
+    print(f"  {format_throughput('Video inserts', insert_stats)}")
+
+    if insert_stats['errors']:
+        # Keep the old set live and take the partial new set back out
+        print(f"\n[ERROR] {insert_stats['errors']} insert batches failed - keeping existing videos")
+        rollback_stats = write_in_batches(
+            'course_assets rollback', [{'id': asset_id} for asset_id in staged_ids],
+            lambda batch: supabase.table('course_assets').delete().in_('id', [row['id'] for row in batch]).execute(),
+            DEFAULT_BATCH_SIZE
+        )
+        print(f"  {format_throughput('Rolled back', rollback_stats)}")
+        sys.exit(1)
 
-    if errors:
-        print(f"  {len(errors)} errors occurred:")
-        for error in errors[:5]:
-            print(f"    - {error}")
+    # Step 2: Swap - remove the old video assets
+    print("\nStep 2: Removing old video assets...")
+    delete_stats = write_in_batches(
+        'course_assets delete', [{'id': asset_id} for asset_id in old_ids],
+        lambda batch: supabase.table('course_assets').delete().in_('id', [row['id'] for row in batch]).execute(),
+        DEFAULT_BATCH_SIZE
+    )
+    print(f"  {format_throughput('Old video deletes', delete_stats)}")
 
-    # Step 3: Verify
+    # Step 3: Verify with counts only (no row transfer)
     print("\nStep 3: Verifying...")
-    new_videos = supabase.table('course_assets').select('url').eq('type', 'video').execute()
-
-    by_type = {
-        'individual': len([v for v in new_videos.data if 'SU' not in v['url']]),
-        'suite': len([v for v in new_videos.data if 'SU' in v['url']])
-    }
-
-    print(f"\n  Total video assets: {len(new_videos.data)}")
-    print(f"  Individual videos: {by_type['individual']}")
-    print(f"  Suite videos: {by_type['suite']}")
+    total_videos = supabase.table('course_assets').select('id', count='exact') \
+        .eq('type', 'video').limit(1).execute().count
+    suite_videos = supabase.table('course_assets').select('id', count='exact') \
+        .eq('type', 'video').like('url', '%SU%').limit(1).execute().count
+
+    print(f"\n  Total video assets: {total_videos}")
+    print(f"  Individual videos: {total_videos - suite_videos}")
+    print(f"  Suite videos: {suite_videos}")
+
+    if delete_stats['errors'] or total_videos != len(new_assets):
+        # Old and new videos are both live for some courses; list what is left to remove
+        old_id_set = set(old_ids)
+        leftover_ids = [row['id'] for row in iter_rows(supabase, 'course_assets', 'id',
+                                                       where=lambda query: query.eq('type', 'video'))
+                        if row['id'] in old_id_set]
+        print(f"\n[ERROR] Expected {len(new_assets)} video assets, found {total_videos} "
+              f"({delete_stats['errors']} delete batches failed)")
+        print(f"  {len(leftover_ids)} old video assets were not removed: {', '.join(map(str, leftover_ids))}")
+        sys.exit(1)
 
     print("\n" + "="*80)
     print("FIX COMPLETE!")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Fuzzy title index for matching reported course titles
+Character trigrams of the normalized titles go into an inverted index, so a
+lookup only scores courses that share trigrams with the query and returns
+them ranked by similarity
+"""
+
+from typing import Callable, Dict, Generic, List, Set, Tuple, TypeVar
+
+from text_normalize import normalize_title
+
+T = TypeVar('T')
+
+# Matches scoring below this are not reported
+DEFAULT_MIN_SCORE = 0.5
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of normalized text, padded so word edges count"""
+    padded = f" {normalize_title(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class FuzzyTitleIndex(Generic[T]):
+    """
+    Ranked fuzzy lookup over a fixed list of items (e.g. course rows).
+
+    The score is the mean of the Dice coefficient (overall similarity) and
+    the overlap coefficient (how much of the shorter title is contained in
+    the longer one), so abbreviated reports like 'COVID' still rank the full
+    course title first. Exact matches score 1.0.
+    """
+
+    def __init__(self, items: List[T], key: Callable[[T], str] = lambda item: item['title']):
+        self.items = items
+        self.grams: List[Set[str]] = []
+        self.postings: Dict[str, List[int]] = {}
+        for index, item in enumerate(items):
+            grams = trigrams(key(item))
+            self.grams.append(grams)
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(index)
+
+    def search(self, query: str, limit: int = 3, min_score: float = DEFAULT_MIN_SCORE) -> List[Tuple[float, T]]:
+        """Best matches for query as (score, item), highest score first"""
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        shared: Dict[int, int] = {}
+        for gram in query_grams:
+            for index in self.postings.get(gram, ()):
+                shared[index] = shared.get(index, 0) + 1
+
+        scored = []
+        for index, count in shared.items():
+            size = len(self.grams[index])
+            dice = 2 * count / (len(query_grams) + size)
+            overlap = count / min(len(query_grams), size)
+            score = (dice + overlap) / 2
+            if score >= min_score:
+                scored.append((score, index))
+
+        # Highest score first; ties keep the original item order
+        scored.sort(key=lambda entry: (-entry[0], entry[1]))
+        return [(score, self.items[index]) for score, index in scored[:limit]]
+
+    def best(self, query: str, min_score: float = DEFAULT_MIN_SCORE):
+        """Single best (score, item) for query, or None"""
+        matches = self.search(query, limit=1, min_score=min_score)
+        return matches[0] if matches else None
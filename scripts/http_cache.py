@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP cache for the VideoTile admin page
+Stores the last response body with its ETag/Last-Modified headers so repeat
+fetches are served locally (within the TTL) or revalidated with a
+conditional GET that returns 304 when nothing changed
+"""
+
+import os
+import json
+import time
+import hashlib
+import argparse
+from typing import Dict, Optional
+
+import requests
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'http')
+USER_AGENT = 'Mozilla/5.0 (Hampton Safety Course Scraper)'
+
+# Diagnostics scripts reuse a cached page for this long without revalidating
+DEFAULT_TTL = 60 * 60
+
+class HTTPCacheError(Exception):
+    """Raised when a page is not available under the requested cache policy"""
+
+class CachedResponse:
+    """Body of a fetched page plus where it came from"""
+
+    def __init__(self, url: str, content: bytes, source: str, meta: Dict):
+        self.url = url
+        self.content = content
+        # 'cache' (fresh within TTL or offline), 'not_modified' (304) or 'network' (200)
+        self.source = source
+        self.etag = meta.get('etag')
+        self.last_modified = meta.get('last_modified')
+        self.fetched_at = meta.get('fetched_at')
+
+    @property
+    def from_cache(self) -> bool:
+        return self.source != 'network'
+
+    @property
+    def sha256(self) -> str:
+        return hashlib.sha256(self.content).hexdigest()
+
+class HTTPCache:
+    """Conditional-GET cache keyed by URL"""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, ttl: float = DEFAULT_TTL, offline: bool = False,
+                 refresh: bool = False, session: Optional[requests.Session] = None, timeout: float = 30):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.offline = offline
+        self.refresh = refresh
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            session.headers.update({'User-Agent': USER_AGENT})
+        self.session = session
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return (os.path.join(self.cache_dir, f"{key}.json"),
+                os.path.join(self.cache_dir, f"{key}.body"))
+
+    def _load(self, url: str):
+        meta_path, body_path = self._paths(url)
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None, None
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            content = f.read()
+        return meta, content
+
+    def _store(self, url: str, meta: Dict, content: Optional[bytes] = None):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        meta_path, body_path = self._paths(url)
+        if content is not None:
+            with open(f"{body_path}.tmp", 'wb') as f:
+                f.write(content)
+            os.replace(f"{body_path}.tmp", body_path)
+        with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(f"{meta_path}.tmp", meta_path)
+
+    def cached(self, url: str) -> Optional[CachedResponse]:
+        """The stored copy of url whatever its age, or None; never touches the network"""
+        meta, content = self._load(url)
+        return None if content is None else CachedResponse(url, content, 'cache', meta)
+
+    def get(self, url: str) -> CachedResponse:
+        """Return the page at url, touching the network only when needed"""
+        meta, content = (None, None) if self.refresh else self._load(url)
+
+        if self.offline:
+            if content is None:
+                raise HTTPCacheError(f"Offline mode: no cached copy of {url}")
+            print(f"Using cached copy of {url} (offline)")
+            return CachedResponse(url, content, 'cache', meta)
+
+        if content is not None and time.time() - meta.get('fetched_at', 0) < self.ttl:
+            print(f"Using cached copy of {url} (age {time.time() - meta['fetched_at']:.0f}s)")
+            return CachedResponse(url, content, 'cache', meta)
+
+        headers = {}
+        if content is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        print(f"Fetching {url}...")
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and content is not None:
+            meta['fetched_at'] = time.time()
+            self._store(url, meta)
+            print("  Not modified since last fetch (304)")
+            return CachedResponse(url, content, 'not_modified', meta)
+
+        response.raise_for_status()
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+            'sha256': hashlib.sha256(response.content).hexdigest()
+        }
+        self._store(url, meta, response.content)
+        return CachedResponse(url, response.content, 'network', meta)
+
+def add_cache_arguments(parser: argparse.ArgumentParser, default_ttl: float = DEFAULT_TTL):
+    """Add the shared --offline/--cache-ttl/--refresh options to a script's parser"""
+    parser.add_argument('--offline', action='store_true',
+                        help='Use the cached admin page only; never touch the network')
+    parser.add_argument('--cache-ttl', type=float, default=default_ttl,
+                        help=f'Seconds a cached page is reused without revalidating (default: {default_ttl:g})')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Ignore the cached page and download it again')
+
+def cache_from_args(args: argparse.Namespace, session: Optional[requests.Session] = None) -> HTTPCache:
+    """Build an HTTPCache from parsed add_cache_arguments options"""
+    return HTTPCache(ttl=args.cache_ttl, offline=args.offline, refresh=args.refresh, session=session)
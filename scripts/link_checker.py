@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Concurrent availability check for constructed asset URLs
+Embed pages, information sheet PDFs and icons are checked with HEAD requests
+(falling back to GET) over one bounded connection pool, with a cap on
+requests per host. Definite answers are kept in an on-disk cache with a TTL
+so repeat runs only touch URLs that have expired
+
+Usage:
+    python link_checker.py URL [URL ...]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from course_records import CourseRecord
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'links.json')
+USER_AGENT = 'Mozilla/5.0 (Hampton Safety Course Scraper)'
+
+# A checked URL is trusted for this long before it is requested again
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_PER_HOST = 4
+DEFAULT_TIMEOUT = 15
+
+# Answers that say "try again later" rather than "gone": treated like a timeout
+TRANSIENT_STATUSES = {408, 429}
+
+class LinkChecker:
+    """
+    Checks URLs concurrently and caches the results.
+
+    Each result is {'url', 'ok', 'status', 'error', 'checked_at'}. 'ok' is
+    True for a final status below 400, False for a client error (404, 410,
+    ...), and None when no usable answer came back: a timeout, a connection
+    error, a 5xx or a 408/429. Unknown results are never cached and never
+    count as dead, so a network hiccup or an overloaded server cannot strip
+    assets from the catalogue.
+    """
+
+    def __init__(self, cache_file: Optional[str] = CACHE_FILE, ttl: float = DEFAULT_TTL,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS, per_host: int = DEFAULT_PER_HOST,
+                 timeout: float = DEFAULT_TIMEOUT, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.timeout = timeout
+        # Tests can pass httpx.MockTransport or point URLs at a local server
+        self.transport = transport
+        self.cache = self._load_cache()
+        self.stats = {'checked': 0, 'cached': 0, 'requests': 0}
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # A damaged cache only costs a re-check
+            return {}
+
+    def _save_cache(self):
+        if not self.cache_file:
+            return
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        now = time.time()
+        entries = {url: result for url, result in self.cache.items() if now - result['checked_at'] < self.ttl}
+        with open(f"{self.cache_file}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+        os.replace(f"{self.cache_file}.tmp", self.cache_file)
+
+    def _cached(self, url: str) -> Optional[Dict]:
+        result = self.cache.get(url)
+        if result is not None and time.time() - result['checked_at'] < self.ttl:
+            return result
+        return None
+
+    def check(self, urls: Iterable[str]) -> Dict[str, Dict]:
+        """Check urls (duplicates are checked once) and return results keyed by URL"""
+        return asyncio.run(self.check_async(urls))
+
+    async def check_async(self, urls: Iterable[str]) -> Dict[str, Dict]:
+        results: Dict[str, Dict] = {}
+        pending: List[str] = []
+        for url in dict.fromkeys(urls):
+            cached = self._cached(url)
+            if cached is not None:
+                results[url] = cached
+            else:
+                pending.append(url)
+        self.stats['cached'] += len(results)
+
+        if pending:
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_connections)
+            host_limits: Dict[str, asyncio.Semaphore] = {}
+            async with httpx.AsyncClient(limits=limits, timeout=self.timeout, follow_redirects=True,
+                                         headers={'User-Agent': USER_AGENT},
+                                         transport=self.transport) as client:
+                checked = await asyncio.gather(*(self._check_one(client, host_limits, url) for url in pending))
+
+            for result in checked:
+                results[result['url']] = result
+                if result['ok'] is not None:
+                    self.cache[result['url']] = result
+            self.stats['checked'] += len(pending)
+            self._save_cache()
+
+        return results
+
+    async def _check_one(self, client: httpx.AsyncClient, host_limits: Dict[str, asyncio.Semaphore],
+                         url: str) -> Dict:
+        host = urlparse(url).netloc
+        limit = host_limits.setdefault(host, asyncio.Semaphore(self.per_host))
+
+        status = None
+        error = None
+        async with limit:
+            try:
+                self.stats['requests'] += 1
+                response = await client.head(url)
+                status = response.status_code
+            except httpx.HTTPError as e:
+                error = f"HEAD: {e.__class__.__name__}"
+
+            # Some hosts reject or mishandle HEAD; confirm a failure with a GET
+            # (streamed, so the body is never downloaded)
+            if status is None or status >= 400:
+                try:
+                    self.stats['requests'] += 1
+                    async with client.stream('GET', url) as response:
+                        status = response.status_code
+                        error = None
+                except httpx.HTTPError as e:
+                    if status is None:
+                        error = f"GET: {e.__class__.__name__}"
+
+        ok = link_ok(status)
+        if ok is None and status is not None:
+            error = f"HTTP {status}"
+        return {
+            'url': url,
+            'ok': ok,
+            'status': status,
+            'error': error,
+            'checked_at': time.time()
+        }
+
+def link_ok(status: Optional[int]) -> Optional[bool]:
+    """True for a working link, False for a dead one, None when the status proves neither"""
+    if status is None or status >= 500 or status in TRANSIENT_STATUSES:
+        return None
+    return status < 400
+
+def mark_dead_links(courses: Iterable[CourseRecord], results: Dict[str, Dict]) -> Dict[str, int]:
+    """
+    Drop dead links from constructed courses before they are saved.
+
+    Dead icons become None (the site falls back to the category icon) and
+    dead assets are removed from course.assets. Returns the counts.
+    """
+    counts = {'dead_icons': 0, 'dead_assets': 0, 'unknown': 0}
+    for course in courses:
+        if course.icon_url:
+            result = results.get(course.icon_url)
+            if result and result['ok'] is False:
+                course.icon_url = None
+                counts['dead_icons'] += 1
+            elif result and result['ok'] is None:
+                counts['unknown'] += 1
+
+        kept = []
+        for asset in course.assets:
+            result = results.get(asset.url)
+            if result and result['ok'] is False:
+                counts['dead_assets'] += 1
+                continue
+            if result and result['ok'] is None:
+                counts['unknown'] += 1
+            kept.append(asset)
+        course.assets = kept
+    return counts
+
+def course_urls(courses: Iterable[CourseRecord]) -> List[str]:
+    """Every icon and asset URL of the constructed courses"""
+    urls = []
+    for course in courses:
+        if course.icon_url:
+            urls.append(course.icon_url)
+        urls.extend(asset.url for asset in course.assets)
+    return urls
+
+def add_link_arguments(parser: argparse.ArgumentParser):
+    """Add the shared link-checking options to a script's parser"""
+    parser.add_argument('--link-ttl', type=float, default=DEFAULT_TTL,
+                        help=f'Seconds a link check result is reused (default: {DEFAULT_TTL:g})')
+    parser.add_argument('--link-connections', type=int, default=DEFAULT_MAX_CONNECTIONS,
+                        help=f'Maximum open connections while checking links (default: {DEFAULT_MAX_CONNECTIONS})')
+    parser.add_argument('--link-per-host', type=int, default=DEFAULT_PER_HOST,
+                        help=f'Maximum concurrent link checks per host (default: {DEFAULT_PER_HOST})')
+
+def checker_from_args(args: argparse.Namespace) -> LinkChecker:
+    """Build a LinkChecker from parsed add_link_arguments options"""
+    return LinkChecker(ttl=args.link_ttl, max_connections=args.link_connections, per_host=args.link_per_host)
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that URLs are reachable')
+    parser.add_argument('urls', nargs='+', help='URLs to check')
+    add_link_arguments(parser)
+    args = parser.parse_args()
+
+    checker = checker_from_args(args)
+    results = checker.check(args.urls)
+
+    dead = 0
+    for url in dict.fromkeys(args.urls):
+        result = results[url]
+        if result['ok'] is False:
+            dead += 1
+            print(f"[DEAD] {url} ({result['status']})")
+        elif result['ok'] is None:
+            print(f"[WARN] {url} ({result['error']})")
+        else:
+            print(f"[OK] {url} ({result['status']})")
+
+    print(f"\n{len(results)} URLs, {dead} dead, {checker.stats['cached']} from cache, "
+          f"{checker.stats['requests']} requests")
+    sys.exit(1 if dead else 0)
+
+if __name__ == '__main__':
+    main()
@@ -7,31 +7,117 @@ Extracts course descriptions from static HTML files and updates Supabase databas
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional
 from pathlib import Path
 
 from bs4 import BeautifulSoup
-from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
+
+from batch_writer import DEFAULT_BATCH_SIZE, format_throughput, write_in_batches
+from course_records import CourseIndex, CourseRecord
+from db_client import add_client_arguments, client_from_args
+from table_reader import iter_rows, read_rows
 
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
-# Load environment variables from project root
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-load_dotenv(os.path.join(project_root, '.env.local'))
 
 # HTML files directory
 HTML_DIR = os.path.join(project_root, 'Hampton Safety New')
 
-# HTML files to parse
+# HTML files to parse, in merge order. Any other .html file in HTML_DIR
+# (e.g. a newly exported suite) is parsed after these, by name.
 HTML_FILES = [
     'Business Skills.html',
     'Health & Safety.html',
     'Health & Social Care.html'
 ]
 
+# Upsert is an insert that resolves the id conflict, so the NOT NULL columns
+# are sent back unchanged alongside the new description
+UPSERT_COLUMNS = ('id', 'title', 'slug', 'category_id', 'purchase_url', 'description')
+
+# ============================================================================
+# FILE PARSING
+# ============================================================================
+
+def list_html_files(html_dir: str) -> List[str]:
+    """Suite files to parse: HTML_FILES first, then any other .html files"""
+    extra = []
+    if os.path.isdir(html_dir):
+        extra = sorted(name for name in os.listdir(html_dir)
+                       if name.lower().endswith('.html') and name not in HTML_FILES)
+    return [os.path.join(html_dir, name) for name in HTML_FILES + extra]
+
+def parse_listing_file(file_path: str) -> Dict:
+    """
+    Extract (course_id, title, description) entries from one suite file.
+
+    Runs in a worker process in parallel mode, so it returns its warnings
+    instead of printing them; entries are in page order.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+
+    soup = BeautifulSoup(html_content, 'lxml')
+    entries = []
+    warnings = []
+
+    # Find all course sections (h2 elements with class "vtheading")
+    for heading in soup.find_all('h2', class_='vtheading'):
+        course_title = heading.get_text(strip=True)
+
+        # Find the description paragraph (next sibling with class "vtptext")
+        description_para = heading.find_next_sibling('p', class_='vtptext')
+        if not description_para:
+            continue
+
+        # Extract course ID from the icon image
+        icon_img = description_para.find('img', class_='vticons')
+        course_id = None
+
+        if icon_img and icon_img.get('src'):
+            # Extract ID from URL like: https://videotilehost.com/common/course-icons/course26.png
+            icon_src = icon_img['src']
+            match = re.search(r'course(\d+)\.png', icon_src)
+            if match:
+                course_id = int(match.group(1))
+
+        # If we didn't find ID in icon, try the purchase link
+        if not course_id:
+            details_para = description_para.find_next_sibling('p', class_='vtdetails')
+            if details_para:
+                buy_link = details_para.find_next_sibling('a', href=lambda h: h and 'purchaseCourse.php' in h)
+                if buy_link:
+                    match = re.search(r'nid=(\d+)', buy_link['href'])
+                    if match:
+                        course_id = int(match.group(1))
+
+        if not course_id:
+            warnings.append(f"Could not find course ID for: {course_title}")
+            continue
+
+        # Extract description text (remove the img tag)
+        description_text = description_para.get_text(strip=True)
+
+        # Clean up description - sometimes there are multiple <p> tags with vtptext
+        # Let's also check for additional paragraphs
+        full_description = description_text
+        next_para = description_para.find_next_sibling('p', class_='vtptext')
+        while next_para and 'vtdetails' not in next_para.get('class', []):
+            # This is a continuation paragraph
+            full_description += " " + next_para.get_text(strip=True)
+            next_para = next_para.find_next_sibling('p')
+            if not next_para or 'vtptext' not in next_para.get('class', []):
+                break
+
+        entries.append((course_id, course_title, full_description))
+
+    return {'file': os.path.basename(file_path), 'entries': entries, 'warnings': warnings}
+
 # ============================================================================
 # DESCRIPTION PARSER CLASS
 # ============================================================================
@@ -39,78 +125,43 @@ HTML_FILES = [
 class DescriptionParser:
     """Parses course descriptions from HTML files and updates Supabase"""
 
-    def __init__(self, supabase_client: Client, dry_run: bool = False):
+    def __init__(self, supabase_client: Client, dry_run: bool = False, html_dir: str = HTML_DIR,
+                 workers: int = 1, batch_size: int = DEFAULT_BATCH_SIZE):
         self.supabase = supabase_client
         self.dry_run = dry_run
-        self.descriptions: Dict[int, Dict] = {}  # course_id -> {title, description}
+        self.batch_size = batch_size
+        self.html_dir = html_dir
+        self.workers = workers
+        self.descriptions = CourseIndex()  # parsed title/description, source = suite file
+        self.conflicts: List[Dict] = []
 
     def parse_html_file(self, file_path: str) -> int:
         """Parse a single HTML file and extract course descriptions"""
-        print(f"\nParsing {os.path.basename(file_path)}...")
-
-        with open(file_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-
-        soup = BeautifulSoup(html_content, 'lxml')
-        courses_found = 0
-
-        # Find all course sections (h2 elements with class "vtheading")
-        for heading in soup.find_all('h2', class_='vtheading'):
-            course_title = heading.get_text(strip=True)
-
-            # Find the description paragraph (next sibling with class "vtptext")
-            description_para = heading.find_next_sibling('p', class_='vtptext')
-            if not description_para:
-                continue
-
-            # Extract course ID from the icon image
-            icon_img = description_para.find('img', class_='vticons')
-            course_id = None
-
-            if icon_img and icon_img.get('src'):
-                # Extract ID from URL like: https://videotilehost.com/common/course-icons/course26.png
-                icon_src = icon_img['src']
-                match = re.search(r'course(\d+)\.png', icon_src)
-                if match:
-                    course_id = int(match.group(1))
-
-            # If we didn't find ID in icon, try the purchase link
-            if not course_id:
-                details_para = description_para.find_next_sibling('p', class_='vtdetails')
-                if details_para:
-                    buy_link = details_para.find_next_sibling('a', href=lambda h: h and 'purchaseCourse.php' in h)
-                    if buy_link:
-                        match = re.search(r'nid=(\d+)', buy_link['href'])
-                        if match:
-                            course_id = int(match.group(1))
-
-            if not course_id:
-                print(f"  [WARN] Could not find course ID for: {course_title}")
-                continue
-
-            # Extract description text (remove the img tag)
-            description_text = description_para.get_text(strip=True)
-
-            # Clean up description - sometimes there are multiple <p> tags with vtptext
-            # Let's also check for additional paragraphs
-            full_description = description_text
-            next_para = description_para.find_next_sibling('p', class_='vtptext')
-            while next_para and 'vtdetails' not in next_para.get('class', []):
-                # This is a continuation paragraph
-                full_description += " " + next_para.get_text(strip=True)
-                next_para = next_para.find_next_sibling('p')
-                if not next_para or 'vtptext' not in next_para.get('class', []):
-                    break
+        return self.merge_file(parse_listing_file(file_path))
+
+    def merge_file(self, result: Dict) -> int:
+        """Add one file's entries; a later entry for the same course replaces the earlier one"""
+        print(f"\nParsing {result['file']}...")
+
+        for warning in result['warnings']:
+            print(f"  [WARN] {warning}")
+
+        for course_id, course_title, description in result['entries']:
+            previous = self.descriptions.get(course_id)
+            if previous and previous.description != description:
+                self.conflicts.append({
+                    'course_id': course_id,
+                    'title': course_title,
+                    'replaced': previous.source,
+                    'kept': result['file']
+                })
 
             # Store description
-            self.descriptions[course_id] = {
-                'title': course_title,
-                'description': full_description
-            }
-            courses_found += 1
+            self.descriptions.add(CourseRecord(course_id, course_title, description=description,
+                                               source=result['file']), replace=True)
 
-        print(f"  Found {courses_found} course descriptions")
-        return courses_found
+        print(f"  Found {len(result['entries'])} course descriptions")
+        return len(result['entries'])
 
     def parse_all_files(self) -> int:
         """Parse all HTML files in the directory"""
@@ -118,14 +169,31 @@ class DescriptionParser:
         print("PARSING COURSE DESCRIPTIONS FROM HTML FILES")
         print("="*60)
 
-        total_found = 0
-        for filename in HTML_FILES:
-            file_path = os.path.join(HTML_DIR, filename)
+        file_paths = []
+        for file_path in list_html_files(self.html_dir):
             if os.path.exists(file_path):
-                total_found += self.parse_html_file(file_path)
+                file_paths.append(file_path)
             else:
                 print(f"[WARN] File not found: {file_path}")
 
+        if self.workers > 1 and len(file_paths) > 1:
+            # Parse in parallel; map() keeps file order so the merge is deterministic
+            workers = min(self.workers, len(file_paths))
+            print(f"Parsing {len(file_paths)} files with {workers} worker processes")
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(parse_listing_file, file_paths))
+        else:
+            results = [parse_listing_file(file_path) for file_path in file_paths]
+
+        for result in results:
+            self.merge_file(result)
+
+        if self.conflicts:
+            print(f"\n[WARN] {len(self.conflicts)} conflicting descriptions (later file wins):")
+            for conflict in self.conflicts:
+                print(f"  ID {conflict['course_id']}: {conflict['title']} - "
+                      f"{conflict['kept']} replaces {conflict['replaced']}")
+
         print(f"\nTotal unique courses with descriptions: {len(self.descriptions)}")
         return len(self.descriptions)
 
@@ -133,54 +201,62 @@ class DescriptionParser:
         """Update Supabase database with extracted descriptions"""
         if self.dry_run:
             print("\n[DRY RUN] Would update the following courses:")
-            for course_id, data in list(self.descriptions.items())[:5]:
-                print(f"  ID {course_id}: {data['title']}")
-                print(f"    Description: {data['description'][:100]}...")
-            return {'updated': 0, 'not_found': 0, 'errors': 0}
+            for parsed in self.descriptions[:5]:
+                print(f"  ID {parsed.id}: {parsed.title}")
+                print(f"    Description: {parsed.description[:100]}...")
+            return {'updated': 0, 'unchanged': 0, 'not_found': 0, 'errors': 0}
 
         print("\n" + "="*60)
         print("UPDATING SUPABASE DATABASE")
         print("="*60)
 
-        updated = 0
+        # Every course with its current description (paginated), plus the
+        # other columns the upsert has to send back
+        existing = CourseIndex(CourseRecord.from_row(row) for row in iter_rows(
+            self.supabase, 'courses', ', '.join(UPSERT_COLUMNS)))
+
+        changes = []
+        unchanged = 0
         not_found = 0
-        errors = 0
-
-        for course_id, data in self.descriptions.items():
-            try:
-                # Check if course exists
-                result = self.supabase.table('courses').select('id, title').eq('id', course_id).execute()
-
-                if not result.data or len(result.data) == 0:
-                    print(f"  [WARN] Course ID {course_id} not found in database: {data['title']}")
-                    not_found += 1
-                    continue
-
-                # Update description
-                update_result = self.supabase.table('courses').update({
-                    'description': data['description']
-                }).eq('id', course_id).execute()
-
-                if update_result.data:
-                    updated += 1
-                    print(f"  [OK] Updated course {course_id}: {data['title']}")
-                else:
-                    errors += 1
-                    print(f"  [ERROR] Failed to update course {course_id}: {data['title']}")
-
-            except Exception as e:
-                errors += 1
-                print(f"  [ERROR] Error updating course {course_id}: {str(e)}")
+
+        for parsed in self.descriptions:
+            course = existing.get(parsed.id)
+            if course is None:
+                print(f"  [WARN] Course ID {parsed.id} not found in database: {parsed.title}")
+                not_found += 1
+            elif course.description == parsed.description:
+                unchanged += 1
+            else:
+                course.description = parsed.description
+                changes.append(course.to_payload(columns=UPSERT_COLUMNS))
+
+        print(f"  {len(changes)} changed, {unchanged} unchanged (skipped), {not_found} not found")
+
+        stats = write_in_batches(
+            'Description upsert', changes,
+            lambda batch: self.supabase.table('courses').upsert(batch).execute(),
+            self.batch_size
+        )
+        failed_ids = {row['id'] for row in stats['failed_rows']}
+        for row in changes:
+            if row['id'] not in failed_ids:
+                print(f"  [OK] Updated course {row['id']}: {self.descriptions.get(row['id']).title}")
+        if changes:
+            print(f"  {format_throughput('Descriptions', stats)}")
+
+        updated = stats['written']
+        errors = len(failed_ids)
 
         print("\n" + "="*60)
         print("UPDATE SUMMARY")
         print("="*60)
         print(f"[OK] Successfully updated: {updated}")
+        print(f"[OK] Unchanged (skipped): {unchanged}")
         print(f"[WARN] Not found in database: {not_found}")
         print(f"[ERROR] Errors: {errors}")
         print("="*60)
 
-        return {'updated': updated, 'not_found': not_found, 'errors': errors}
+        return {'updated': updated, 'unchanged': unchanged, 'not_found': not_found, 'errors': errors}
 
     def verify_coverage(self):
         """Verify description coverage in database"""
@@ -190,16 +266,17 @@ class DescriptionParser:
 
         try:
             # Get total courses
-            total_result = self.supabase.table('courses').select('id', count='exact').execute()
+            total_result = self.supabase.table('courses').select('id', count='exact').limit(1).execute()
             total_courses = total_result.count
 
             # Get courses with descriptions
-            with_desc_result = self.supabase.table('courses').select('id', count='exact').not_.is_('description', 'null').execute()
+            with_desc_result = self.supabase.table('courses').select('id', count='exact').not_.is_('description', 'null').limit(1).execute()
             with_descriptions = with_desc_result.count
 
             # Get courses without descriptions
-            without_desc_result = self.supabase.table('courses').select('id, title').is_('description', 'null').execute()
-            without_descriptions = without_desc_result.count
+            missing_descriptions = read_rows(self.supabase, 'courses', 'id, title',
+                                             where=lambda query: query.is_('description', 'null'))
+            without_descriptions = len(missing_descriptions)
 
             print(f"\nDatabase Coverage:")
             print(f"   Total courses: {total_courses}")
@@ -212,7 +289,7 @@ class DescriptionParser:
 
             if without_descriptions > 0 and without_descriptions <= 10:
                 print(f"\n[WARN] Courses missing descriptions:")
-                for course in without_desc_result.data:
+                for course in missing_descriptions:
                     print(f"     - ID {course['id']}: {course['title']}")
 
         except Exception as e:
@@ -237,7 +314,8 @@ class DescriptionParser:
             if not self.dry_run:
                 self.verify_coverage()
 
-            return stats['updated'] > 0
+            # A re-run with nothing left to change still succeeded
+            return stats['updated'] > 0 or stats['unchanged'] > 0
 
         except Exception as e:
             print(f"\n[ERROR] {str(e)}")
@@ -254,21 +332,25 @@ def main():
     import argparse
     parser = argparse.ArgumentParser(description='Parse course descriptions from HTML files')
     parser.add_argument('--dry-run', action='store_true', help='Parse without updating database')
+    parser.add_argument('--html-dir', default=HTML_DIR, help='Directory containing the suite HTML files')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Parse the HTML files in this many processes (default: 1)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Rows per database request (default: {DEFAULT_BATCH_SIZE})')
+    add_client_arguments(parser)
     args = parser.parse_args()
 
-    # Initialize Supabase client
-    supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
-
-    if not supabase_url or not supabase_key:
-        print("[ERROR] Supabase credentials not found in .env.local")
-        print("Required variables: NEXT_PUBLIC_SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY")
-        sys.exit(1)
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.batch_size < 1:
+        parser.error('--batch-size must be at least 1')
 
-    supabase_client = create_client(supabase_url, supabase_key)
+    # Initialize Supabase client
+    supabase_client = client_from_args(args)
 
     # Run parser
-    parser = DescriptionParser(supabase_client=supabase_client, dry_run=args.dry_run)
+    parser = DescriptionParser(supabase_client=supabase_client, dry_run=args.dry_run,
+                               html_dir=args.html_dir, workers=args.workers, batch_size=args.batch_size)
     success = parser.run()
 
     sys.exit(0 if success else 1)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Promotional video index built from docs/Promotional video scrape.md
+The scrape is parsed once into a versioned JSON artifact keyed by the source
+file's mtime and SHA-256; later loads read the artifact and skip the parse
+
+Usage:
+    python promo_index.py            # Build (if stale) and summarise
+    python promo_index.py --rebuild  # Parse the scrape again regardless
+"""
+
+import os
+import re
+import json
+import hashlib
+import argparse
+from typing import Dict, List, Optional
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROMO_FILE = os.path.join(project_root, 'docs', 'Promotional video scrape.md')
+INDEX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'promo_index.json')
+
+# Bump when the parse or the artifact layout changes; older artifacts are rebuilt
+INDEX_VERSION = 1
+
+# "Title:" (optionally followed by blank lines) then the embed iframe
+EMBED_PATTERN = re.compile(
+    r'(?:^([^\n<]+?):\s*\n\s*)?<iframe src="https://videotilehost\.com/embed/([A-Za-z0-9]+)"',
+    re.MULTILINE
+)
+SUITE_CODE_PATTERN = re.compile(r'SU(\d+)$')
+
+def parse_promo_file(file_path: str = PROMO_FILE) -> Dict:
+    """
+    Parse the scrape into {'videos': {id: title}, 'suites': {code: {...}},
+    'warnings': [...]}.
+
+    Numeric embed ids are course promo videos. Everything else (SU1, ALL)
+    is a suite-level video: 'suite_id' is the number in an SU code, None
+    for the generic video.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    videos: Dict[str, Optional[str]] = {}
+    suites: Dict[str, Dict] = {}
+    warnings: List[str] = []
+
+    for match in EMBED_PATTERN.finditer(content):
+        title = match.group(1).strip() if match.group(1) else None
+        video_id = match.group(2)
+        line = content.count('\n', 0, match.start(2)) + 1
+
+        if title is None:
+            warnings.append(f"line {line}: embed {video_id} has no title")
+
+        if video_id.isdigit():
+            if video_id in videos:
+                warnings.append(f"line {line}: duplicate embed {video_id} ignored")
+                continue
+            videos[video_id] = title
+        else:
+            suite = SUITE_CODE_PATTERN.match(video_id)
+            suites[video_id] = {'title': title, 'suite_id': int(suite.group(1)) if suite else None}
+
+    return {'videos': videos, 'suites': suites, 'warnings': warnings}
+
+class PromoVideoIndex:
+    """Loaded promo video index"""
+
+    def __init__(self, data: Dict, source: str):
+        # Artifact keys are strings (JSON); course ids are ints everywhere else
+        self.videos: Dict[int, Optional[str]] = {int(video_id): title for video_id, title in data['videos'].items()}
+        self.suites: Dict[str, Dict] = data['suites']
+        self.warnings: List[str] = data['warnings']
+        # 'cache' when the artifact was reused, 'parsed' when it was (re)built
+        self.source = source
+
+    @property
+    def video_ids(self) -> set:
+        return set(self.videos)
+
+    def titles(self) -> List[str]:
+        """Titles of the course promo videos (suite-level videos excluded), sorted"""
+        return sorted(title for title in self.videos.values() if title)
+
+    def title(self, video_id: int) -> Optional[str]:
+        return self.videos.get(video_id)
+
+def _sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _write_artifact(index_file: str, artifact: Dict):
+    os.makedirs(os.path.dirname(index_file), exist_ok=True)
+    with open(f"{index_file}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, indent=2, ensure_ascii=False)
+    os.replace(f"{index_file}.tmp", index_file)
+
+def load_promo_index(promo_file: str = PROMO_FILE, index_file: str = INDEX_FILE,
+                     rebuild: bool = False) -> PromoVideoIndex:
+    """
+    Load the index, parsing the scrape only when the artifact is missing,
+    from another INDEX_VERSION, or the source content has changed.
+
+    An unchanged mtime reuses the artifact without reading the source; a
+    changed mtime with the same SHA-256 (e.g. a fresh checkout) only
+    refreshes the recorded mtime.
+    """
+    mtime_ns = os.stat(promo_file).st_mtime_ns
+
+    artifact = None
+    if not rebuild and os.path.exists(index_file):
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                artifact = json.load(f)
+        except (OSError, ValueError):
+            artifact = None
+        if artifact and artifact.get('version') != INDEX_VERSION:
+            artifact = None
+
+    if artifact:
+        if artifact['source_mtime_ns'] == mtime_ns:
+            return PromoVideoIndex(artifact, 'cache')
+
+        sha256 = _sha256(promo_file)
+        if artifact['source_sha256'] == sha256:
+            artifact['source_mtime_ns'] = mtime_ns
+            _write_artifact(index_file, artifact)
+            return PromoVideoIndex(artifact, 'cache')
+    else:
+        sha256 = _sha256(promo_file)
+
+    artifact = {
+        'version': INDEX_VERSION,
+        'source_mtime_ns': mtime_ns,
+        'source_sha256': sha256,
+        **parse_promo_file(promo_file)
+    }
+    _write_artifact(index_file, artifact)
+    return PromoVideoIndex(artifact, 'parsed')
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the promotional video index')
+    parser.add_argument('--rebuild', action='store_true', help='Parse the scrape even if the index is current')
+    args = parser.parse_args()
+
+    index = load_promo_index(rebuild=args.rebuild)
+    print(f"Promotional video index: {INDEX_FILE}")
+    print(f"  Source: {'cached index' if index.source == 'cache' else 'parsed ' + PROMO_FILE}")
+    print(f"  Course videos: {len(index.videos)}")
+    print(f"  Suite videos: {', '.join(sorted(index.suites)) or 'none'}")
+    for warning in index.warnings:
+        print(f"  [WARN] {warning}")
+
+if __name__ == '__main__':
+    main()
@@ -5,29 +5,44 @@ Scrapes course data from VideoTile admin page and populates Supabase database
 """
 
 import os
-import re
 import sys
+import json
+import hashlib
 import argparse
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse, parse_qs
 
 import requests
 from bs4 import BeautifulSoup
-from dotenv import load_dotenv
-from supabase import create_client, Client
+from bs4.dammit import EncodingDetector
+from bs4.element import CData, NavigableString, PageElement, Tag
+from lxml import etree
+from supabase import Client
+
+from asset_reconciler import load_assets_by_course, reconcile_assets, reconcile_loaded
+from batch_writer import DEFAULT_BATCH_SIZE, DEFAULT_WRITERS, PipelinedWriter, format_throughput, write_in_batches
+from course_records import AssetRecord, CourseIndex, CourseRecord
+from db_client import add_client_arguments, client_from_args, request_stats
+from http_cache import HTTPCache, add_cache_arguments, cache_from_args
+from link_checker import LinkChecker, add_link_arguments, checker_from_args, course_urls, mark_dead_links
+from stage_metrics import StageRecorder, add_metrics_arguments, profiled
+from table_reader import iter_rows
+from text_normalize import expand_aliases, normalize_title, slugify
 
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
-# Load environment variables from project root
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-load_dotenv(os.path.join(project_root, '.env.local'))
-
 ADMIN_URL = 'https://videotilehost.com/hamptonsafety/adminWebsiteContent.php'
 USER_AGENT = 'Mozilla/5.0 (Hampton Safety Course Scraper)'
 
+# Fingerprints from the last incremental sync (--incremental)
+STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.scrape_state.json')
+
 # Suite mapping
 SUITE_MAPPING = {
     1: 'Health & Safety',
@@ -40,54 +55,10 @@ SUITE_MAPPING = {
 # Reverse mapping for category name -> suite_id
 CATEGORY_TO_SUITE = {v: k for k, v in SUITE_MAPPING.items()}
 
-# Icon alias table for matching course titles to icon labels
-ICON_ALIASES = {
-    'dse': 'display screen equipment',
-    'display screen equipment': 'assessing display screen equipment',
-    'nvq': 'nvq',
-    'food hygiene': 'food safety',
-    'cyber security': 'cybersecurity',
-    'h&s': 'health and safety',
-    'mental health': 'mental health awareness',
-    'first aid': 'emergency first aid',
-}
-
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def normalize_title(title: str) -> str:
-    """Normalize title for matching: lowercase, trim, collapse spaces, remove punctuation"""
-    normalized = title.lower().strip()
-    # Remove punctuation except hyphens and ampersands
-    normalized = re.sub(r'[^\w\s\-&]', '', normalized)
-    # Collapse multiple spaces
-    normalized = re.sub(r'\s+', ' ', normalized)
-    return normalized
-
-def slugify(title: str) -> str:
-    """Convert title to URL-friendly kebab-case slug"""
-    slug = title.lower().strip()
-    # Replace spaces and underscores with hyphens
-    slug = re.sub(r'[\s_]+', '-', slug)
-    # Remove non-alphanumeric characters except hyphens
-    slug = re.sub(r'[^\w\-]', '', slug)
-    # Remove leading/trailing hyphens
-    slug = slug.strip('-')
-    # Collapse multiple hyphens
-    slug = re.sub(r'\-+', '-', slug)
-    return slug
-
-def expand_aliases(text: str) -> List[str]:
-    """Expand text with known aliases for better matching"""
-    variants = [text]
-    for alias, expansion in ICON_ALIASES.items():
-        if alias in text:
-            variants.append(text.replace(alias, expansion))
-        if expansion in text:
-            variants.append(text.replace(expansion, alias))
-    return list(set(variants))
-
 def titles_match(title1: str, title2: str) -> bool:
     """Check if two titles match using normalization and aliases"""
     norm1 = normalize_title(title1)
@@ -123,6 +94,732 @@ def titles_match(title1: str, title2: str) -> bool:
 
     return False
 
+def course_fingerprint(course: CourseRecord) -> str:
+    """Stable hash of everything a course writes to the database"""
+    # Keys predate CourseRecord (category_id was the suite); kept so stored state stays valid
+    record = {
+        'id': course.id,
+        'title': course.title,
+        'slug': course.slug,
+        'category': course.category,
+        'category_id': course.suite_id,
+        'purchase_url': course.purchase_url,
+        'free_trial_url': course.free_trial_url,
+        'icon_url': course.icon_url,
+        'description': course.description,
+        'assets': sorted((a.type, a.url, a.label) for a in course.assets)
+    }
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def course_assets(course: CourseRecord) -> List[AssetRecord]:
+    """Video embed and PDF information sheet assets, built from the course ID"""
+    return [
+        AssetRecord('video', f"https://videotilehost.com/embed/{course.id}",
+                    f"{course.title} - Promotional Video"),
+        AssetRecord('pdf', f"https://videotilehost.com/common/courses/info_{course.id}.pdf",
+                    f"{course.title} - Course Information")
+    ]
+
+def load_sync_state(path: str) -> Dict:
+    """Load incremental sync state, or an empty state if none exists yet"""
+    if not os.path.exists(path):
+        return {'page_sha256': None, 'courses': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    state.setdefault('page_sha256', None)
+    state.setdefault('courses', {})
+    return state
+
+def save_sync_state(path: str, state: Dict):
+    """Write incremental sync state atomically"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+# ============================================================================
+# TITLE INDEX
+# ============================================================================
+
+class SubstringAutomaton:
+    """Aho-Corasick automaton reporting every pattern that occurs in a text"""
+
+    def __init__(self, patterns: List[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[str]] = [[]]
+
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append(pattern)
+
+        # Breadth-first failure links; outputs of the failure state are inherited
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find_all(self, text: str) -> Set[str]:
+        """Distinct patterns that occur somewhere in text"""
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            found.update(self.output[state])
+        return found
+
+class TitleIndex:
+    """
+    Precomputed lookup answering "which course does titles_match() pick for
+    this text" without comparing the text against every course.
+
+    Normalized titles and alias variants are computed once. Candidates come
+    from an inverted token index (token-overlap rule), an automaton over all
+    course variants (course variant inside the text) and a search of the
+    concatenated variants (text inside a course variant), so the result is
+    exactly what a scan of titles_match() over the courses in order gives.
+    Courses can be excluded once matched; exclusion is permanent.
+    """
+
+    SEPARATOR = '\x00'  # never survives normalize_title()
+
+    def __init__(self, titles: List[str]):
+        self.size = len(titles)
+        self.excluded = [False] * self.size
+        self.token_sets: List[Set[str]] = []
+        self.tokens: Dict[str, List[int]] = {}
+        self.variant_courses: Dict[str, deque] = {}
+        # Courses in title order; a course with an empty variant matches any text
+        self.all_courses = deque(range(self.size))
+        self.always = deque()
+
+        blocks = []
+        self.block_starts: List[int] = []
+        offset = 0
+        for index, title in enumerate(titles):
+            normalized = normalize_title(title)
+            variants = sorted(expand_aliases(normalized))
+
+            token_set = set(normalized.split())
+            self.token_sets.append(token_set)
+            for token in token_set:
+                self.tokens.setdefault(token, []).append(index)
+
+            for variant in variants:
+                if variant:
+                    self.variant_courses.setdefault(variant, deque()).append(index)
+                else:
+                    self.always.append(index)
+
+            block = self.SEPARATOR.join(variants) + self.SEPARATOR
+            self.block_starts.append(offset)
+            blocks.append(block)
+            offset += len(block)
+
+        self.haystack = ''.join(blocks)
+        self.automaton = SubstringAutomaton(list(self.variant_courses))
+
+    def exclude(self, index: int):
+        """Stop returning this course from first_match()"""
+        self.excluded[index] = True
+
+    def _first_open(self, indices: deque) -> Optional[int]:
+        # Indices are ascending and exclusion is permanent, so drop excluded heads
+        while indices and self.excluded[indices[0]]:
+            indices.popleft()
+        return indices[0] if indices else None
+
+    def _first_containing(self, text: str) -> Optional[int]:
+        """Lowest open course index with a variant containing text"""
+        position = self.haystack.find(text)
+        while position != -1:
+            index = bisect_right(self.block_starts, position) - 1
+            if not self.excluded[index]:
+                return index
+            next_block = self.block_starts[index + 1] if index + 1 < self.size else len(self.haystack)
+            position = self.haystack.find(text, next_block)
+        return None
+
+    def first_match(self, text: str) -> Optional[int]:
+        """Index of the first open course (in title order) for which titles_match(title, text)"""
+        normalized = normalize_title(text)
+        candidates = [self._first_open(self.always)]
+
+        for variant in expand_aliases(normalized):
+            # Text variant inside a course variant ('' is inside everything)
+            if variant:
+                candidates.append(self._first_containing(variant))
+            else:
+                candidates.append(self._first_open(self.all_courses))
+            # Course variant inside the text variant
+            for pattern in self.automaton.find_all(variant):
+                candidates.append(self._first_open(self.variant_courses[pattern]))
+
+        best = min((index for index in candidates if index is not None), default=None)
+
+        # Token overlap (at least 60% of the smaller token set)
+        token_set = set(normalized.split())
+        overlaps: Dict[int, int] = {}
+        for token in token_set:
+            for index in self.tokens.get(token, []):
+                overlaps[index] = overlaps.get(index, 0) + 1
+        for index, overlap in overlaps.items():
+            if (best is None or index < best) and not self.excluded[index]:
+                if overlap / min(len(self.token_sets[index]), len(token_set)) >= 0.6:
+                    best = index
+
+        return best
+
+# ============================================================================
+# COURSE EXTRACTION
+# ============================================================================
+
+# Elements whose links are considered, in document order. A short element
+# (under CATEGORY_HEADER_MAX_LEN characters of text) that mentions a suite
+# name switches the current category.
+COURSE_CONTAINER_TAGS = {'h2', 'h3', 'p', 'li', 'div'}
+CATEGORY_HEADER_MAX_LEN = 100
+COURSE_NAME_CLASS = 'webContent_courseName'
+
+# String types Tag.get_text() counts for the container tags above
+TEXT_STRING_TYPES = (NavigableString, CData)
+
+def is_valid_title(title: Optional[str]) -> bool:
+    """Reject empty, too-short and URL-looking course titles"""
+    return bool(title) and len(title) >= 3 and not title.startswith('http')
+
+def find_category(text: str) -> Optional[str]:
+    """Category named by a short header text, if any"""
+    if len(text) >= CATEGORY_HEADER_MAX_LEN:
+        return None
+    lowered = text.lower()
+    for category in CATEGORY_TO_SUITE.keys():
+        if category.lower() in lowered:
+            return category
+    return None
+
+def walk_document(root: Tag) -> Iterator[Tuple[PageElement, bool]]:
+    """Yield (node, True) for every node in document order and (tag, False) when a tag closes"""
+    stack = [iter(root.contents)]
+    parents = [root]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            yield parents.pop(), False
+        elif isinstance(child, Tag):
+            yield child, True
+            stack.append(iter(child.contents))
+            parents.append(child)
+        else:
+            yield child, True
+
+class _Container:
+    """A course container element that is open during the document walk"""
+
+    __slots__ = ('tag', 'order', 'end', 'category', 'name_elem', 'trial_index', 'name_index',
+                 'first_categorized', 'first_titled', 'module_div')
+
+    def __init__(self, tag: Tag, order: int, category: Optional[str], name_elem: Optional[Tag],
+                 trial_index: int, name_index: int):
+        self.tag = tag
+        self.order = order
+        self.end = order
+        self.category = category
+        self.name_elem = name_elem      # last course-name paragraph before this element
+        self.trial_index = trial_index  # free trial links seen before this element
+        self.name_index = name_index    # course-name paragraphs seen before this element
+        # Outermost open container (this one or an ancestor) with a category, and
+        # with a category and a valid title; nearest enclosing moduleListWhite div
+        self.first_categorized = None
+        self.first_titled = None
+        self.module_div = None
+
+def extract_courses(soup: BeautifulSoup) -> List[CourseRecord]:
+    """
+    Extract course records from the admin page in linear time.
+
+    Each purchase link is claimed by the outermost enclosing container
+    element seen after a category header. The title is the last course-name
+    paragraph before that container or, failing that, the first course-name
+    paragraph of the link's moduleListWhite div. When neither gives a valid
+    title the next container inwards is tried. For each course ID the first
+    container/link pair in document order wins, and the free trial link is
+    the first one inside the winning container.
+
+    One bottom-up pass records the text of short elements (for category
+    headers). A single ordered walk then tracks the open containers, the
+    current category and the last course name as state, so no element is
+    rescanned and no backward search is needed.
+    """
+    # Stripped text of each tag, or None once it reaches the header length limit
+    short_text: Dict[int, Optional[str]] = {}
+    for node, entering in walk_document(soup):
+        if entering:
+            continue
+        parts = []
+        length = 0
+        for child in node.contents:
+            if isinstance(child, Tag):
+                text = short_text[id(child)]
+                if text is None:
+                    length = CATEGORY_HEADER_MAX_LEN
+                    break
+            elif type(child) in TEXT_STRING_TYPES:
+                text = child.strip()
+            else:
+                continue
+            parts.append(text)
+            length += len(text)
+            if length >= CATEGORY_HEADER_MAX_LEN:
+                break
+        short_text[id(node)] = ''.join(parts) if length < CATEGORY_HEADER_MAX_LEN else None
+
+    name_titles: Dict[int, str] = {}
+
+    def name_title(name_elem: Optional[Tag]) -> Optional[str]:
+        if name_elem is None:
+            return None
+        if id(name_elem) not in name_titles:
+            name_titles[id(name_elem)] = name_elem.get_text(strip=True).rstrip(':').strip()
+        return name_titles[id(name_elem)]
+
+    def first_inside(items: List[Tuple[int, Tag]], start: int, container: _Container) -> Optional[Tag]:
+        if start < len(items) and items[start][0] <= container.end:
+            return items[start][1]
+        return None
+
+    current_category = None
+    last_name = None
+    course_names: List[Tuple[int, Tag]] = []
+    trial_links: List[Tuple[int, Tag]] = []
+    open_containers: List[_Container] = []
+    purchase_links = []
+    order = 0
+
+    for node, entering in walk_document(soup):
+        if not isinstance(node, Tag) or node is soup:
+            continue
+
+        if not entering:
+            if open_containers and open_containers[-1].tag is node:
+                open_containers.pop().end = order
+            continue
+
+        order += 1
+
+        if node.name == 'a':
+            href = node.get('href')
+            if href and 'freeTrial.php' in href:
+                trial_links.append((order, node))
+            if href is not None and 'purchaseCourse.php' in href and 'nid=' in href and open_containers:
+                top = open_containers[-1]
+                if top.first_categorized is not None:
+                    purchase_links.append((order, href, top.first_categorized, top.first_titled, top.module_div))
+
+        if node.name in COURSE_CONTAINER_TAGS:
+            text = short_text[id(node)]
+            category = find_category(text) if text is not None else None
+            if category:
+                current_category = category
+                print(f"  Processing category: {current_category}")
+
+            container = _Container(node, order, current_category, last_name, len(trial_links), len(course_names))
+            parent = open_containers[-1] if open_containers else None
+            if parent and parent.first_categorized:
+                container.first_categorized = parent.first_categorized
+            elif current_category:
+                container.first_categorized = container
+            if parent and parent.first_titled:
+                container.first_titled = parent.first_titled
+            elif current_category and is_valid_title(name_title(last_name)):
+                container.first_titled = container
+            if node.name == 'div' and 'moduleListWhite' in node.get('class', []):
+                container.module_div = container
+            elif parent:
+                container.module_div = parent.module_div
+            open_containers.append(container)
+
+        if node.name == 'p' and COURSE_NAME_CLASS in node.get('class', []):
+            last_name = node
+            course_names.append((order, node))
+
+    # Resolve each purchase link to the container that claims it
+    links = []
+    for link_order, href, first_categorized, first_titled, module_div in purchase_links:
+        fallback = None
+        if module_div is not None:
+            fallback = name_title(first_inside(course_names, module_div.name_index, module_div))
+        links.append((link_order, href, first_categorized, first_titled, fallback))
+
+    def trial_href(container: _Container) -> Optional[str]:
+        trial_link = first_inside(trial_links, container.trial_index, container)
+        return trial_link['href'] if trial_link else None
+
+    return assemble_courses(links, lambda container: name_title(container.name_elem), trial_href)
+
+def assemble_courses(links: List[Tuple], title_of: Callable[[object], Optional[str]],
+                     trial_href_of: Callable[[object], Optional[str]]) -> List[CourseRecord]:
+    """
+    Build course records from resolved purchase links.
+
+    Each link is (link_order, href, first_categorized, first_titled, fallback)
+    where the containers have `order` and `category`, and fallback is the
+    title from the link's moduleListWhite div. title_of/trial_href_of give a
+    container's course-name title and first free trial href.
+    """
+    best: Dict[int, Tuple[Tuple[int, int], Dict]] = {}
+    for link_order, href, first_categorized, first_titled, fallback in links:
+        purchase_url = urljoin(ADMIN_URL, href)
+        params = parse_qs(urlparse(purchase_url).query)
+        if 'nid' not in params:
+            continue
+        course_id = int(params['nid'][0])
+
+        if is_valid_title(fallback):
+            container = first_categorized
+            title = title_of(container)
+            if not is_valid_title(title):
+                title = fallback
+        elif first_titled is not None:
+            container = first_titled
+            title = title_of(container)
+        else:
+            # Skip this course if we can't find a proper title
+            continue
+
+        key = (container.order, link_order)
+        if course_id in best and best[course_id][0] <= key:
+            continue
+
+        trial_href = trial_href_of(container)
+        # Note: Append course ID to slug to handle duplicate titles
+        best[course_id] = (key, CourseRecord(
+            id=course_id,
+            title=title,
+            slug=f"{slugify(title)}-{course_id}",
+            category=container.category,
+            suite_id=CATEGORY_TO_SUITE[container.category],
+            purchase_url=purchase_url,
+            free_trial_url=urljoin(ADMIN_URL, trial_href) if trial_href else None
+        ))
+
+    return [course for _, course in sorted(best.values(), key=lambda item: item[0])]
+
+# ============================================================================
+# STREAMING EXTRACTION
+# ============================================================================
+
+# Bytes handed to the parser per feed() call
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Elements parse_descriptions() treats as title paragraphs, description
+# boxes and the end of a title's siblings
+DESCRIPTION_TITLE_TAGS = {'paragraph', 'p', 'strong', 'b'}
+DESCRIPTION_BOX_TAGS = {'textbox', 'textarea', 'input'}
+DESCRIPTION_STOP_TAGS = {'paragraph', 'h2', 'h3', 'h4'}
+MIN_DESCRIPTION_LEN = 20
+
+# Strings inside these are scripts, stylesheets etc., which get_text() skips
+NON_TEXT_TAGS = {'script', 'style', 'template', 'rt', 'rp'}
+
+_PENDING = object()
+
+class _Text:
+    """Stripped strings of an open element, joined when it closes"""
+
+    __slots__ = ('order', 'parts', 'text')
+
+    def __init__(self, order: int):
+        self.order = order
+        self.parts: List[str] = []
+        self.text: Optional[str] = None
+
+    def close(self) -> str:
+        self.text = ''.join(self.parts)
+        self.parts = None
+        return self.text
+
+class _StreamContainer:
+    """
+    A course container seen by the streaming parser.
+
+    Whether an element is a category header is only known when it closes, so
+    the category in effect at its start is stored as a reference: either a
+    known category (`before`) or "whatever the parent container resolves to"
+    (`defer`). Resolution happens once the document is complete.
+    """
+
+    __slots__ = ('order', 'parent', 'before', 'defer', 'parts', 'length', 'qualifies', 'inner',
+                 'category', 'name', 'trial_href', 'first_name', 'is_module')
+
+    def __init__(self, order: int, parent: Optional['_StreamContainer'], before: Optional[str],
+                 name: Optional[_Text], is_module: bool):
+        self.order = order
+        self.parent = parent
+        self.before = before
+        self.defer = parent if before is None else None
+        self.parts: Optional[List[str]] = []  # None once the text is too long for a header
+        self.length = 0
+        self.qualifies: Optional[str] = None  # category this element names as a header
+        self.inner: Optional[str] = None      # latest header category among closed descendants
+        self.category = _PENDING
+        self.name = name                      # last course-name paragraph before this element
+        self.trial_href: Optional[str] = None
+        self.first_name: Optional[_Text] = None
+        self.is_module = is_module
+
+class _Frame:
+    """An open element and what it is tracking"""
+
+    __slots__ = ('container', 'para', 'name', 'box', 'non_text', 'searching')
+
+    def __init__(self):
+        self.container: Optional[_StreamContainer] = None
+        self.para: Optional[_Text] = None
+        self.name: Optional[_Text] = None
+        self.box: Optional[_Text] = None
+        self.non_text = False
+        # Closed title paragraphs among this element's children still looking
+        # for a description box in their following siblings
+        self.searching: List[_Text] = []
+
+class StreamingExtractor:
+    """
+    lxml parser target that extracts courses and description candidates
+    from parse events, without building a document tree.
+
+    Gives the same result as extract_courses() and the sibling search of
+    parse_descriptions() on the tree BeautifulSoup builds from the same
+    lxml events. Memory is bounded by the element nesting depth plus the
+    links and descriptions found, not by the size of the page.
+    """
+
+    def __init__(self):
+        self.order = 0
+        self.buffer: List[str] = []
+        self.frames: List[_Frame] = [_Frame()]
+        self.non_text_depth = 0
+
+        self.containers: List[_StreamContainer] = []
+        self.module_divs: List[_StreamContainer] = []
+        self.root_inner: Optional[str] = None
+        self.last_name: Optional[_Text] = None
+        self.open_texts: List[_Text] = []  # open course names, title paragraphs and boxes
+        self.purchase_links = []
+        self.descriptions: List[Tuple[int, str, str]] = []
+
+    # lxml target interface ------------------------------------------------
+
+    def start(self, tag: str, attrib, nsmap=None):
+        self._flush()
+        self.order += 1
+        parent_frame = self.frames[-1]
+        frame = _Frame()
+
+        if parent_frame.searching and tag in DESCRIPTION_STOP_TAGS:
+            parent_frame.searching = []
+
+        if tag == 'a':
+            href = attrib.get('href')
+            if href and 'freeTrial.php' in href:
+                # Every open container without a trial link gets this one
+                for container in reversed(self.containers):
+                    if container.trial_href is not None:
+                        break
+                    container.trial_href = href
+            if href is not None and 'purchaseCourse.php' in href and 'nid=' in href and self.containers:
+                module_div = self.module_divs[-1] if self.module_divs else None
+                self.purchase_links.append((self.order, href, tuple(self.containers), module_div))
+
+        classes = attrib.get('class', '').split()
+
+        if tag in COURSE_CONTAINER_TAGS:
+            parent = self.containers[-1] if self.containers else None
+            before = parent.inner if parent else self.root_inner
+            is_module = tag == 'div' and 'moduleListWhite' in classes
+            container = _StreamContainer(self.order, parent, before, self.last_name, is_module)
+            frame.container = container
+            self.containers.append(container)
+            if is_module:
+                self.module_divs.append(container)
+
+        if tag == 'p' and COURSE_NAME_CLASS in classes:
+            frame.name = _Text(self.order)
+            self.last_name = frame.name
+            self.open_texts.append(frame.name)
+            for module_div in reversed(self.module_divs):
+                if module_div.first_name is not None:
+                    break
+                module_div.first_name = frame.name
+
+        if tag in DESCRIPTION_TITLE_TAGS:
+            frame.para = _Text(self.order)
+            self.open_texts.append(frame.para)
+        if tag in DESCRIPTION_BOX_TAGS:
+            frame.box = _Text(self.order)
+            self.open_texts.append(frame.box)
+        if tag in NON_TEXT_TAGS:
+            frame.non_text = True
+            self.non_text_depth += 1
+
+        self.frames.append(frame)
+
+    def end(self, tag: str):
+        self._flush()
+        frame = self.frames.pop()
+        parent_frame = self.frames[-1]
+
+        container = frame.container
+        if container is not None:
+            self.containers.pop()
+            if container.is_module:
+                self.module_divs.pop()
+            if container.parts is not None:
+                container.qualifies = find_category(''.join(container.parts))
+                container.parts = None
+                if container.qualifies:
+                    print(f"  Processing category: {container.qualifies}")
+            latest = container.inner if container.inner is not None else container.qualifies
+            if latest is not None:
+                if container.parent is not None:
+                    container.parent.inner = latest
+                else:
+                    self.root_inner = latest
+
+        for text in (frame.name, frame.para, frame.box):
+            if text is not None:
+                self.open_texts.remove(text)
+                text.close()
+
+        if frame.non_text:
+            self.non_text_depth -= 1
+
+        # This element is the next sibling of any title paragraph still searching
+        if frame.box is not None and len(frame.box.text) > MIN_DESCRIPTION_LEN:
+            for para in parent_frame.searching:
+                self.descriptions.append((para.order, para.text, frame.box.text))
+            parent_frame.searching = []
+        if frame.para is not None:
+            parent_frame.searching.append(frame.para)
+
+    def data(self, data: str):
+        self.buffer.append(data)
+
+    def comment(self, text: str):
+        self._flush()
+
+    def pi(self, target: str, data: str):
+        self._flush()
+
+    def doctype(self, name: str, pubid: str, system: str):
+        self._flush()
+
+    def close(self):
+        self._flush()
+        while len(self.frames) > 1:
+            self.end(None)
+
+    # ----------------------------------------------------------------------
+
+    def _flush(self):
+        """Handle the text since the last event as one string, as BeautifulSoup stores it"""
+        if not self.buffer:
+            return
+        text = ''.join(self.buffer).strip()
+        self.buffer = []
+        if not text or self.non_text_depth:
+            return
+
+        # Text is shared by all open containers; the short ones are innermost
+        for container in reversed(self.containers):
+            if container.parts is None:
+                break
+            container.parts.append(text)
+            container.length += len(text)
+            if container.length >= CATEGORY_HEADER_MAX_LEN:
+                container.parts = None
+        for open_text in self.open_texts:
+            open_text.parts.append(text)
+
+    @staticmethod
+    def _category(container: _StreamContainer) -> Optional[str]:
+        """Category in effect at a container, following deferred references"""
+        chain = []
+        node = container
+        while node.category is _PENDING:
+            chain.append(node)
+            if node.qualifies or node.defer is None:
+                break
+            node = node.defer
+        for node in reversed(chain):
+            if node.qualifies:
+                node.category = node.qualifies
+            elif node.defer is None:
+                node.category = node.before
+            else:
+                node.category = node.defer.category
+        return container.category
+
+    def courses(self) -> List[CourseRecord]:
+        """Course records, as extract_courses() returns them"""
+        def title_of(container: _StreamContainer) -> Optional[str]:
+            return container.name.text.rstrip(':').strip() if container.name else None
+
+        links = []
+        for link_order, href, containers, module_div in self.purchase_links:
+            categorized = [container for container in containers if self._category(container)]
+            if not categorized:
+                continue
+            first_titled = next((container for container in categorized
+                                 if is_valid_title(title_of(container))), None)
+            fallback = None
+            if module_div is not None and module_div.first_name is not None:
+                fallback = module_div.first_name.text.rstrip(':').strip()
+            links.append((link_order, href, categorized[0], first_titled, fallback))
+
+        return assemble_courses(links, title_of, lambda container: container.trial_href)
+
+    def description_candidates(self) -> List[Tuple[str, str]]:
+        """(title paragraph text, description) pairs in page order"""
+        return [(text, description) for _, text, description in sorted(self.descriptions)]
+
+def stream_extract(content: bytes) -> StreamingExtractor:
+    """
+    Run the page through StreamingExtractor in chunks.
+
+    Encodings are tried in the order BeautifulSoup tries them, so the text
+    seen is the same as in the tree-based parse.
+    """
+    detector = EncodingDetector(content, is_html=True)
+    error = None
+    for encoding in detector.encodings:
+        extractor = StreamingExtractor()
+        parser = etree.HTMLParser(target=extractor, recover=True, encoding=encoding)
+        try:
+            for start in range(0, max(len(detector.markup), 1), STREAM_CHUNK_SIZE):
+                parser.feed(detector.markup[start:start + STREAM_CHUNK_SIZE])
+            parser.close()
+            return extractor
+        except (UnicodeDecodeError, LookupError, etree.ParserError) as e:
+            error = e
+    raise ValueError(f"Could not parse page in any candidate encoding: {error}")
+
 # ============================================================================
 # SCRAPER CLASS
 # ============================================================================
@@ -130,14 +827,44 @@ def titles_match(title1: str, title2: str) -> bool:
 class VideoTileScraper:
     """Scrapes course data from VideoTile admin page"""
 
-    def __init__(self, supabase_client: Optional[Client] = None, dry_run: bool = False):
+    def __init__(self, supabase_client: Optional[Client] = None, dry_run: bool = False,
+                 batch_size: int = DEFAULT_BATCH_SIZE, incremental: bool = False,
+                 state_file: str = STATE_FILE, http_cache: Optional[HTTPCache] = None,
+                 streaming: bool = False, link_checker: Optional[LinkChecker] = None,
+                 metrics_file: Optional[str] = None, pipelined: bool = False,
+                 writers: int = DEFAULT_WRITERS):
         self.supabase = supabase_client
         self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.incremental = incremental
+        self.state_file = state_file
+        self.streaming = streaming
+        # Only set when dead links should be dropped before saving
+        self.link_checker = link_checker
+        # Write courses on `writers` threads as soon as they are complete
+        self.pipelined = pipelined
+        self.writers = writers
+        self.writer: Optional[PipelinedWriter] = None
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': USER_AGENT})
+        # Always revalidate by default; an unchanged page comes back as a 304
+        self.http_cache = http_cache or HTTPCache(ttl=0, session=self.session)
+
+        # Per-stage timings and request counts; written to metrics_file (with
+        # memory peaks, which cost extra) only when one is given
+        self.metrics_file = metrics_file
+        self.http_counts = {'requests': 0, 'bytes': 0}
+        self.http_cache.session.hooks['response'].append(self._count_response)
+        self.metrics = StageRecorder({
+            'http_requests': lambda: self.http_counts['requests'],
+            'http_bytes': lambda: self.http_counts['bytes'],
+            'link_requests': lambda: self.link_checker.stats['requests'] if self.link_checker else 0,
+            'db_requests': lambda: request_stats.requests,
+            'db_retries': lambda: request_stats.retries,
+        }, trace_memory=bool(metrics_file))
 
         # Data storage
-        self.courses: List[Dict] = []
+        self.courses = CourseIndex()
         self.stats = {
             'total_courses': 0,
             'with_icons': 0,
@@ -146,106 +873,42 @@ class VideoTileScraper:
             'with_assets': 0
         }
 
+    def _count_response(self, response: requests.Response, *args, **kwargs):
+        self.http_counts['requests'] += 1
+        self.http_counts['bytes'] += len(response.content)
+
+    def download_page(self) -> bytes:
+        """Download the raw VideoTile admin page (via the on-disk HTTP cache)"""
+        return self.http_cache.get(ADMIN_URL).content
+
     def fetch_page(self) -> BeautifulSoup:
         """Fetch and parse the VideoTile admin page"""
-        print(f"Fetching {ADMIN_URL}...")
-        response = self.session.get(ADMIN_URL, timeout=30)
-        response.raise_for_status()
-        return BeautifulSoup(response.content, 'lxml')
+        return BeautifulSoup(self.download_page(), 'lxml')
 
     def parse_courses(self, soup: BeautifulSoup):
         """Parse course lists from Links section"""
         print("Parsing course listings...")
 
-        current_category = None
-        category_id = None
+        self.add_courses(extract_courses(soup))
 
-        # Look for course listings - they're typically in a specific format
-        for element in soup.find_all(['h2', 'h3', 'p', 'li', 'div']):
-            text = element.get_text(strip=True)
+    def parse_page_streaming(self, content: bytes) -> List[Tuple[str, str]]:
+        """
+        Parse course lists straight from the raw page without building a tree.
 
-            # Check if this is a category header
-            for category in CATEGORY_TO_SUITE.keys():
-                if category.lower() in text.lower() and len(text) < 100:
-                    current_category = category
-                    category_id = CATEGORY_TO_SUITE[category]
-                    print(f"  Processing category: {current_category}")
-                    break
+        Returns the (title paragraph, description) candidates for
+        apply_descriptions(), found in the same pass.
+        """
+        print("Parsing course listings (streaming)...")
 
-            if not current_category:
-                continue
+        extractor = stream_extract(content)
+        self.add_courses(extractor.courses())
+        return extractor.description_candidates()
 
-            # Look for purchase links
-            links = element.find_all('a', href=True)
-            for link in links:
-                href = link['href']
-
-                # Parse purchase URL
-                if 'purchaseCourse.php' in href and 'nid=' in href:
-                    purchase_url = urljoin(ADMIN_URL, href)
-
-                    # Extract course ID from URL
-                    parsed = urlparse(purchase_url)
-                    params = parse_qs(parsed.query)
-                    if 'nid' not in params:
-                        continue
-
-                    course_id = int(params['nid'][0])
-
-                    # Extract title from webContent_courseName paragraph
-                    title = None
-                    course_name_elem = element.find_previous('p', class_='webContent_courseName')
-                    if course_name_elem:
-                        title_text = course_name_elem.get_text(strip=True)
-                        title = title_text.rstrip(':').strip()
-
-                    # Fallback: try to find title in parent div structure
-                    if not title or len(title) < 3 or title.startswith('http'):
-                        parent_div = link.find_parent('div', class_='moduleListWhite')
-                        if parent_div:
-                            course_name_elem = parent_div.find('p', class_='webContent_courseName')
-                            if course_name_elem:
-                                title_text = course_name_elem.get_text(strip=True)
-                                title = title_text.rstrip(':').strip()
-
-                    if not title or len(title) < 3 or title.startswith('http'):
-                        # Skip this course if we can't find a proper title
-                        continue
-
-                    # Check for free trial URL
-                    free_trial_url = None
-                    trial_link = element.find('a', href=lambda h: h and 'freeTrial.php' in h)
-                    if trial_link:
-                        free_trial_url = urljoin(ADMIN_URL, trial_link['href'])
-
-                    # Create course record
-                    # Note: Append course ID to slug to handle duplicate titles
-                    course = {
-                        'id': course_id,
-                        'title': title,
-                        'slug': f"{slugify(title)}-{course_id}",
-                        'category': current_category,
-                        'category_id': category_id,
-                        'purchase_url': purchase_url,
-                        'free_trial_url': free_trial_url,
-                        'icon_url': None,
-                        'description': None,
-                        'assets': []
-                    }
-
-                    # Avoid duplicates by course ID
-                    if not any(c['id'] == course_id for c in self.courses):
-                        self.courses.append(course)
-
-        # Deduplicate by ID (in case we missed any)
-        seen_ids = set()
-        unique_courses = []
-        for course in self.courses:
-            if course['id'] not in seen_ids:
-                seen_ids.add(course['id'])
-                unique_courses.append(course)
-
-        self.courses = unique_courses
+    def add_courses(self, courses: List[CourseRecord]):
+        """Merge extracted courses into self.courses"""
+        # Keep anything already collected; first occurrence of an ID wins
+        for course in courses:
+            self.courses.add(course)
         print(f"  Found {len(self.courses)} unique courses")
 
     def construct_icons(self):
@@ -254,142 +917,303 @@ class VideoTileScraper:
 
         for course in self.courses:
             # VideoTile pattern: https://videotilehost.com/common/course-icons/course{ID}.png
-            course['icon_url'] = f"https://videotilehost.com/common/course-icons/course{course['id']}.png"
+            course.icon_url = f"https://videotilehost.com/common/course-icons/course{course.id}.png"
 
-        with_icons = sum(1 for c in self.courses if c['icon_url'])
+        with_icons = sum(1 for c in self.courses if c.icon_url)
         self.stats['with_icons'] = with_icons
         print(f"  Constructed {with_icons}/{len(self.courses)} icon URLs ({with_icons/len(self.courses)*100:.1f}%)")
 
-    def parse_descriptions(self, soup: BeautifulSoup):
-        """Parse course descriptions from textboxes in HTML"""
+    def parse_descriptions(self, soup: BeautifulSoup, on_described: Optional[Callable[[CourseRecord], None]] = None):
+        """
+        Parse course descriptions from textboxes in HTML.
+
+        on_described is called with each course as it gets its description.
+        """
         print("Parsing course descriptions...")
 
         # Find all textareas and text inputs that might contain descriptions
         # They appear as: <paragraph>Course Title</paragraph> followed by <textbox>Description...</textbox>
         descriptions_found = 0
+        title_index = self.description_index()
 
         # Find all paragraph elements that might be course titles
         for para in soup.find_all(['paragraph', 'p', 'strong', 'b']):
             para_text = para.get_text(strip=True)
 
-            # Try to match this text to a course title
-            for course in self.courses:
-                if course['description']:  # Skip if already found
-                    continue
-
-                if titles_match(course['title'], para_text):
-                    # Look for next textbox/textarea sibling
-                    for sibling in para.find_next_siblings():
-                        if sibling.name in ['textbox', 'textarea', 'input']:
-                            description = sibling.get_text(strip=True)
-                            if description and len(description) > 20:  # Reasonable description length
-                                course['description'] = description
-                                descriptions_found += 1
-                                break
-                        # Don't search too far
-                        if sibling.name in ['paragraph', 'h2', 'h3', 'h4']:
-                            break
+            # First course without a description whose title matches this text
+            index = title_index.first_match(para_text)
+            if index is None:
+                continue
+            course = self.courses[index]
+
+            # Look for next textbox/textarea sibling
+            for sibling in para.find_next_siblings():
+                if sibling.name in ['textbox', 'textarea', 'input']:
+                    description = sibling.get_text(strip=True)
+                    if description and len(description) > 20:  # Reasonable description length
+                        course.description = description
+                        title_index.exclude(index)
+                        descriptions_found += 1
+                        if on_described:
+                            on_described(course)
+                        break
+                # Don't search too far
+                if sibling.name in ['paragraph', 'h2', 'h3', 'h4']:
                     break
 
         self.stats['with_descriptions'] = descriptions_found
         print(f"  Parsed {descriptions_found}/{len(self.courses)} descriptions ({descriptions_found/len(self.courses)*100:.1f}%)")
 
+    def apply_descriptions(self, candidates: List[Tuple[str, str]],
+                           on_described: Optional[Callable[[CourseRecord], None]] = None):
+        """Assign streamed (title paragraph, description) pairs the way parse_descriptions() does"""
+        print("Parsing course descriptions...")
+
+        descriptions_found = 0
+        title_index = self.description_index()
+
+        for para_text, description in candidates:
+            index = title_index.first_match(para_text)
+            if index is None:
+                continue
+            self.courses[index].description = description
+            title_index.exclude(index)
+            descriptions_found += 1
+            if on_described:
+                on_described(self.courses[index])
+
+        self.stats['with_descriptions'] = descriptions_found
+        print(f"  Parsed {descriptions_found}/{len(self.courses)} descriptions ({descriptions_found/len(self.courses)*100:.1f}%)")
+
+    def description_index(self) -> TitleIndex:
+        """Index course titles once; courses drop out of the index once described"""
+        title_index = TitleIndex([course.title for course in self.courses])
+        for index, course in enumerate(self.courses):
+            if course.description:
+                title_index.exclude(index)
+        return title_index
+
     def construct_assets(self):
         """Construct video and PDF assets from course IDs"""
         print("Constructing course assets...")
 
         total_assets = 0
         for course in self.courses:
-            course_id = course['id']
-            course_title = course['title']
-
-            # Video embed URL
-            video_asset = {
-                'type': 'video',
-                'url': f"https://videotilehost.com/embed/{course_id}",
-                'label': f"{course_title} - Promotional Video"
-            }
-
-            # PDF information sheet URL
-            pdf_asset = {
-                'type': 'pdf',
-                'url': f"https://videotilehost.com/common/courses/info_{course_id}.pdf",
-                'label': f"{course_title} - Course Information"
-            }
-
-            course['assets'] = [video_asset, pdf_asset]
-            total_assets += 2
-
-        self.stats['with_assets'] = len([c for c in self.courses if c['assets']])
+            course.assets = course_assets(course)
+            total_assets += len(course.assets)
+
+        self.stats['with_assets'] = len([c for c in self.courses if c.assets])
         print(f"  Constructed {total_assets} assets for {len(self.courses)} courses ({total_assets} total)")
 
-    def save_to_supabase(self):
-        """Save courses and assets to Supabase database"""
+    def check_links(self):
+        """Check every icon and asset URL and drop the dead ones before saving"""
+        urls = course_urls(self.courses)
+        print(f"Checking {len(set(urls))} links...")
+
+        results = self.link_checker.check(urls)
+        counts = mark_dead_links(self.courses, results)
+
+        self.stats['with_icons'] = sum(1 for c in self.courses if c.icon_url)
+        self.stats['with_assets'] = sum(1 for c in self.courses if c.assets)
+        self.stats['dead_links'] = counts['dead_icons'] + counts['dead_assets']
+
+        checker_stats = self.link_checker.stats
+        print(f"  {checker_stats['cached']} from cache, {checker_stats['requests']} requests")
+        print(f"  Dropped {counts['dead_icons']} dead icons and {counts['dead_assets']} dead assets")
+        if counts['unknown']:
+            print(f"  [WARN] {counts['unknown']} links could not be checked and were kept")
+
+    def save_to_supabase(self, courses: Optional[List[CourseRecord]] = None) -> Set[int]:
+        """
+        Save courses (default: all scraped courses) and their assets to
+        Supabase in batches. Returns the IDs that were fully written.
+        """
         if self.dry_run:
             print("\n[DRY RUN] Skipping database insertion")
-            return
+            return set()
 
         if not self.supabase:
             print("\n[ERROR] No Supabase client available")
-            return
+            return set()
 
-        print("\nSaving courses to Supabase...")
+        if courses is None:
+            courses = self.courses
+
+        print(f"\nSaving courses to Supabase (batch size {self.batch_size})...")
 
         # Get category IDs from database
-        categories_response = self.supabase.table('categories').select('id, name, suite_id').execute()
-        category_map = {cat['suite_id']: cat['id'] for cat in categories_response.data}
+        category_map = {cat['suite_id']: cat['id'] for cat in iter_rows(self.supabase, 'categories', 'id, suite_id')}
+
+        course_rows = []
+        for course in courses:
+            # Get database category_id
+            db_category_id = category_map.get(course.suite_id)
+            if not db_category_id:
+                print(f"  [WARN] Category ID {course.suite_id} not found for course: {course.title}")
+                continue
 
-        # Insert/update courses
-        courses_saved = 0
-        assets_saved = 0
-        errors = 0
+            course_rows.append(course.to_payload(db_category_id))
+
+        # Upsert courses
+        course_stats = write_in_batches(
+            'courses', course_rows,
+            lambda batch: self.supabase.table('courses').upsert(batch).execute(),
+            self.batch_size
+        )
+
+        # Reconcile the assets of every course that was actually saved; an
+        # empty asset list (all links dead) removes the stored rows
+        failed_ids = {row['id'] for row in course_stats['failed_rows']}
+        asset_course_ids = [course.id for course in courses
+                            if course.id not in failed_ids and category_map.get(course.suite_id)]
+
+        desired_assets = [row for course in courses for row in course.asset_payloads()]
+
+        print(f"  {format_throughput('Courses', course_stats)}")
+        asset_stats = reconcile_assets(self.supabase, asset_course_ids, desired_assets, self.batch_size)
+
+        errors = course_stats['errors'] + asset_stats['errors']
+        print(f"  Saved {course_stats['written']} courses; assets {asset_stats['inserted']} inserted, "
+              f"{asset_stats['updated']} updated, {asset_stats['deleted']} deleted ({errors} failed batches)")
+
+        # Courses whose assets may be partially written are not reported as saved
+        saved_ids = {row['id'] for row in course_rows if row['id'] not in failed_ids}
+        if asset_stats['errors']:
+            saved_ids -= set(asset_course_ids)
+        return saved_ids
+
+    def start_pipeline(self):
+        """
+        Start the writer threads for a pipelined save.
+
+        Courses passed to queue_course() are upserted in batches, each
+        followed by its assets, while parsing continues. Stored assets are
+        loaded in the background meanwhile so each batch can be diffed
+        without another full read.
+        """
+        print(f"\nSaving courses to Supabase as they are parsed "
+              f"(batch size {self.batch_size}, {self.writers} writers)...")
+
+        self.category_map = {cat['suite_id']: cat['id']
+                             for cat in iter_rows(self.supabase, 'categories', 'id, suite_id')}
+        self.asset_loader = ThreadPoolExecutor(max_workers=1)
+        self.stored_assets = self.asset_loader.submit(load_assets_by_course, self.supabase)
+        self.queued_ids: Set[int] = set()
+        self.writer = PipelinedWriter('courses', self.write_course_batch, self.batch_size, self.writers)
+
+    def queue_course(self, course: CourseRecord):
+        """Hand a finished course (description settled) to the writers"""
+        if course.id in self.queued_ids:
+            return
+        self.queued_ids.add(course.id)
+
+        db_category_id = self.category_map.get(course.suite_id)
+        if not db_category_id:
+            print(f"  [WARN] Category ID {course.suite_id} not found for course: {course.title}")
+            return
 
+        course.assets = course_assets(course)
+        self.writer.put({'course': course, 'category_id': db_category_id})
+
+    def write_course_batch(self, batch: List[Dict]) -> Dict:
+        """Writer thread: upsert one batch of courses, then reconcile their assets"""
+        courses = [item['course'] for item in batch]
+        self.supabase.table('courses').upsert(
+            [item['course'].to_payload(item['category_id']) for item in batch]).execute()
+
+        course_ids = [course.id for course in courses]
+        try:
+            stored = self.stored_assets.result()
+        except Exception as e:
+            # The courses are written; only their assets could not be reconciled
+            result = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0,
+                      'errors': [f"course_assets load failed: {str(e)}"]}
+        else:
+            existing = [row for course_id in course_ids for row in stored.get(course_id, [])]
+            desired = [row for course in courses for row in course.asset_payloads()]
+            result = reconcile_loaded(self.supabase, existing, desired)
+        result['saved_ids'] = [course.id for course in courses]
+        result['asset_course_ids'] = course_ids
+        return result
+
+    def finish_pipeline(self) -> Set[int]:
+        """Queue the courses that never got a description, wait for the writers and report"""
         for course in self.courses:
-            try:
-                # Get database category_id
-                db_category_id = category_map.get(course['category_id'])
-                if not db_category_id:
-                    print(f"  [WARN] Category ID {course['category_id']} not found for course: {course['title']}")
-                    continue
-
-                course_data = {
-                    'id': course['id'],
-                    'title': course['title'],
-                    'slug': course['slug'],
-                    'category_id': db_category_id,
-                    'icon_url': course['icon_url'],
-                    'description': course['description'],
-                    'purchase_url': course['purchase_url'],
-                    'free_trial_url': course['free_trial_url']
-                }
-
-                # Upsert course
-                result = self.supabase.table('courses').upsert(course_data).execute()
-
-                if result.data:
-                    courses_saved += 1
-
-                    # Save assets
-                    if course.get('assets'):
-                        # Delete existing assets for this course
-                        self.supabase.table('course_assets').delete().eq('course_id', course['id']).execute()
-
-                        # Insert new assets
-                        for asset in course['assets']:
-                            asset_data = {
-                                'course_id': course['id'],
-                                'type': asset['type'],
-                                'url': asset['url'],
-                                'label': asset['label']
-                            }
-                            self.supabase.table('course_assets').insert(asset_data).execute()
-                            assets_saved += 1
-
-            except Exception as e:
-                errors += 1
-                print(f"  [ERROR] Failed to save course {course['id']}: {str(e)}")
-
-        print(f"  Saved {courses_saved} courses and {assets_saved} assets ({errors} errors)")
+            self.queue_course(course)
+
+        course_stats = self.writer.close()
+        self.writer = None
+        self.asset_loader.shutdown()
+
+        # Results arrive in batch order, so totals and messages do not depend on thread timing
+        totals = {'inserted': 0, 'updated': 0, 'deleted': 0}
+        asset_errors = 0
+        saved_ids = set()
+        for result in course_stats['results']:
+            for key in totals:
+                totals[key] += result[key]
+            for error in result['errors']:
+                print(f"  [ERROR] {error}")
+            # Courses whose assets may be partially written are not reported as saved
+            if result['errors']:
+                asset_errors += 1
+                saved_ids.update(set(result['saved_ids']) - set(result['asset_course_ids']))
+            else:
+                saved_ids.update(result['saved_ids'])
+
+        errors = course_stats['errors'] + asset_errors
+        print(f"  {format_throughput('Courses', course_stats)}")
+        print(f"  Saved {course_stats['written']} courses; assets {totals['inserted']} inserted, "
+              f"{totals['updated']} updated, {totals['deleted']} deleted ({errors} failed batches)")
+        return saved_ids
+
+    def delete_courses(self, course_ids: List[int]) -> Set[int]:
+        """Delete courses by ID in batches (their assets cascade). Returns the IDs deleted."""
+        stats = write_in_batches(
+            'courses delete', [{'id': course_id} for course_id in course_ids],
+            lambda batch: self.supabase.table('courses').delete().in_(
+                'id', [row['id'] for row in batch]).execute(),
+            self.batch_size
+        )
+        print(f"  {format_throughput('Course deletes', stats)}")
+        failed_ids = {row['id'] for row in stats['failed_rows']}
+        return {course_id for course_id in course_ids if course_id not in failed_ids}
+
+    def sync_incremental(self, state: Dict, page_sha256: str):
+        """Write only courses whose fingerprint changed and delete courses that disappeared"""
+        fingerprints = {course.id: course_fingerprint(course) for course in self.courses}
+        previous = {int(course_id): fp for course_id, fp in state['courses'].items()}
+
+        changed = [course for course in self.courses if previous.get(course.id) != fingerprints[course.id]]
+        removed = sorted(course_id for course_id in previous if course_id not in fingerprints)
+
+        print(f"\nIncremental sync: {len(changed)} changed, {len(self.courses) - len(changed)} unchanged, "
+              f"{len(removed)} removed")
+        self.stats['changed'] = len(changed)
+        self.stats['removed'] = len(removed)
+
+        if self.dry_run:
+            print("[DRY RUN] Skipping database writes and state update")
+            return
+
+        if not self.supabase:
+            print("[ERROR] No Supabase client available")
+            return
+
+        saved_ids = self.save_to_supabase(changed) if changed else set()
+        deleted_ids = self.delete_courses(removed) if removed else set()
+
+        # Keep old fingerprints for anything that failed so the next run retries it
+        new_fingerprints = {course_id: fp for course_id, fp in previous.items() if course_id not in deleted_ids}
+        for course_id in saved_ids:
+            new_fingerprints[course_id] = fingerprints[course_id]
+
+        complete = len(saved_ids) == len(changed) and len(deleted_ids) == len(removed)
+        save_sync_state(self.state_file, {
+            'page_sha256': page_sha256 if complete else None,
+            'courses': {str(course_id): fp for course_id, fp in sorted(new_fingerprints.items())}
+        })
+        print(f"  State saved to {self.state_file}")
 
     def print_summary(self):
         """Print scraping summary"""
@@ -399,23 +1223,25 @@ class VideoTileScraper:
         print(f"Total courses:        {len(self.courses)}")
         print(f"With icons:           {self.stats['with_icons']} ({self.stats['with_icons']/max(len(self.courses),1)*100:.1f}%)")
         print(f"With descriptions:    {self.stats['with_descriptions']} ({self.stats['with_descriptions']/max(len(self.courses),1)*100:.1f}%)")
-        print(f"With purchase URLs:   {sum(1 for c in self.courses if c.get('purchase_url'))} ({sum(1 for c in self.courses if c.get('purchase_url'))/max(len(self.courses),1)*100:.1f}%)")
-        print(f"With free trial URLs: {sum(1 for c in self.courses if c.get('free_trial_url'))} ({sum(1 for c in self.courses if c.get('free_trial_url'))/max(len(self.courses),1)*100:.1f}%)")
+        print(f"With purchase URLs:   {sum(1 for c in self.courses if c.purchase_url)} ({sum(1 for c in self.courses if c.purchase_url)/max(len(self.courses),1)*100:.1f}%)")
+        print(f"With free trial URLs: {sum(1 for c in self.courses if c.free_trial_url)} ({sum(1 for c in self.courses if c.free_trial_url)/max(len(self.courses),1)*100:.1f}%)")
         print(f"With assets:          {self.stats.get('with_assets', 0)} courses")
 
-        total_assets = sum(len(c.get('assets', [])) for c in self.courses)
+        total_assets = sum(len(c.assets) for c in self.courses)
         print(f"Total assets:         {total_assets} (videos + PDFs)")
+        if 'dead_links' in self.stats:
+            print(f"Dead links dropped:   {self.stats['dead_links']}")
 
         if self.dry_run:
             print("\n[DRY RUN MODE] No data written to database")
             print("\nSample courses:")
             for course in self.courses[:3]:
-                print(f"\n  ID: {course['id']}")
-                print(f"  Title: {course['title']}")
-                print(f"  Category: {course['category']}")
-                print(f"  Icon: {'✓' if course['icon_url'] else '✗'}")
-                print(f"  Description: {'✓' if course['description'] else '✗'}")
-                print(f"  Assets: {len(course.get('assets', []))}")
+                print(f"\n  ID: {course.id}")
+                print(f"  Title: {course.title}")
+                print(f"  Category: {course.category}")
+                print(f"  Icon: {'✓' if course.icon_url else '✗'}")
+                print(f"  Description: {'✓' if course.description else '✗'}")
+                print(f"  Assets: {len(course.assets)}")
 
         print("="*60 + "\n")
 
@@ -425,25 +1251,69 @@ class VideoTileScraper:
         print("VideoTile Course Scraper - Updated Version")
         print("="*60 + "\n")
 
+        stage = self.metrics.stage
         try:
             # Fetch page
-            soup = self.fetch_page()
-
-            # Parse course data
-            self.parse_courses(soup)
-
-            # Construct icons from course IDs (100% coverage)
-            self.construct_icons()
-
-            # Parse descriptions from HTML textboxes
-            self.parse_descriptions(soup)
+            with stage('fetch_page'):
+                content = self.download_page()
+            page_sha256 = hashlib.sha256(content).hexdigest()
+
+            if self.incremental:
+                state = load_sync_state(self.state_file)
+                if state['page_sha256'] == page_sha256:
+                    print("\nAdmin page unchanged since last incremental sync - nothing to write")
+                    return True
+
+            # Pipelined: courses are written while the description pass runs
+            on_described = None
+            if self.pipelined and not self.dry_run and self.supabase:
+                with stage('start_writers'):
+                    self.start_pipeline()
+                on_described = self.queue_course
+
+            if self.streaming:
+                # Courses and description candidates in one pass, no document tree
+                with stage('parse_courses'):
+                    candidates = self.parse_page_streaming(content)
+                with stage('construct_icons'):
+                    self.construct_icons()
+                with stage('parse_descriptions'):
+                    self.apply_descriptions(candidates, on_described)
+            else:
+                with stage('build_tree'):
+                    soup = BeautifulSoup(content, 'lxml')
+
+                # Parse course data
+                with stage('parse_courses'):
+                    self.parse_courses(soup)
+
+                # Construct icons from course IDs (100% coverage)
+                with stage('construct_icons'):
+                    self.construct_icons()
+
+                # Parse descriptions from HTML textboxes
+                with stage('parse_descriptions'):
+                    self.parse_descriptions(soup, on_described)
 
             # Construct video and PDF assets from course IDs
-            self.construct_assets()
+            with stage('construct_assets'):
+                self.construct_assets()
+
+            # Drop unreachable icons and assets
+            if self.link_checker:
+                with stage('check_links'):
+                    self.check_links()
 
             # Save to database
-            if not self.dry_run and self.supabase:
-                self.save_to_supabase()
+            if self.incremental:
+                with stage('sync_incremental'):
+                    self.sync_incremental(state, page_sha256)
+            elif self.writer:
+                with stage('save_to_supabase'):
+                    self.finish_pipeline()
+            elif not self.dry_run and self.supabase:
+                with stage('save_to_supabase'):
+                    self.save_to_supabase()
 
             # Print summary
             self.print_summary()
@@ -456,6 +1326,18 @@ class VideoTileScraper:
             traceback.print_exc()
             return False
 
+        finally:
+            if self.writer:
+                # Let batches already handed over finish, but do not write a
+                # half-built batch from a run that failed
+                self.writer.close(flush=False)
+                self.writer = None
+                self.asset_loader.shutdown()
+            if self.metrics_file:
+                self.metrics.write(self.metrics_file, courses=len(self.courses), stats=self.stats,
+                                   streaming=self.streaming, incremental=self.incremental,
+                                   dry_run=self.dry_run)
+
 # ============================================================================
 # MAIN
 # ============================================================================
@@ -464,31 +1346,56 @@ def main():
     parser = argparse.ArgumentParser(description='Scrape VideoTile course data')
     parser.add_argument('--dry-run', action='store_true', help='Parse data without writing to database')
     parser.add_argument('--strict', action='store_true', help='Throw error if any course missing required fields')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Rows per database request (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only write courses that changed since the last incremental run')
+    parser.add_argument('--state-file', default=STATE_FILE,
+                        help='Fingerprint state file used by --incremental')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Parse the page in one streaming pass instead of building a full document tree')
+    parser.add_argument('--check-links', action='store_true',
+                        help='Check icon, embed and PDF URLs and drop dead ones before saving')
+    parser.add_argument('--pipelined', action='store_true',
+                        help='Write courses in batches on background threads while the page is still being parsed')
+    parser.add_argument('--writers', type=int, default=DEFAULT_WRITERS,
+                        help=f'Concurrent write requests in --pipelined mode (default: {DEFAULT_WRITERS})')
+    add_cache_arguments(parser, default_ttl=0)
+    add_link_arguments(parser)
+    add_client_arguments(parser)
+    add_metrics_arguments(parser)
     args = parser.parse_args()
 
+    if args.batch_size < 1:
+        parser.error('--batch-size must be at least 1')
+    if args.writers < 1:
+        parser.error('--writers must be at least 1')
+    if args.pipelined and (args.incremental or args.check_links):
+        # Both need the complete course list before anything is written
+        parser.error('--pipelined cannot be combined with --incremental or --check-links')
+
     # Initialize Supabase client
     supabase_client = None
     if not args.dry_run:
-        supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-        supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
-
-        if not supabase_url or not supabase_key:
-            print("[ERROR] Supabase credentials not found in .env.local")
-            print("Required variables: NEXT_PUBLIC_SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY")
-            sys.exit(1)
-
-        supabase_client = create_client(supabase_url, supabase_key)
+        supabase_client = client_from_args(args)
 
     # Run scraper
-    scraper = VideoTileScraper(supabase_client=supabase_client, dry_run=args.dry_run)
-    success = scraper.run()
+    scraper = VideoTileScraper(supabase_client=supabase_client, dry_run=args.dry_run,
+                               batch_size=args.batch_size, incremental=args.incremental,
+                               state_file=args.state_file, http_cache=cache_from_args(args),
+                               streaming=args.streaming,
+                               link_checker=checker_from_args(args) if args.check_links else None,
+                               metrics_file=args.metrics_json, pipelined=args.pipelined,
+                               writers=args.writers)
+    with profiled(args.profile):
+        success = scraper.run()
 
     # Strict mode validation
     if args.strict and success:
         missing_fields = []
         for course in scraper.courses:
-            if not course['purchase_url']:
-                missing_fields.append(f"Course {course['id']} missing purchase_url")
+            if not course.purchase_url:
+                missing_fields.append(f"Course {course.id} missing purchase_url")
 
         if missing_fields:
             print("\n[ERROR] Strict mode violations:")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing, memory and request accounting for long-running scripts
+StageRecorder times named stages (as a context manager or decorator),
+records the tracemalloc peak of each one and the change in any counters it
+is given (HTTP requests, database round trips, ...), and writes the result
+as a JSON report. Nothing is printed, so instrumented scripts keep their
+normal console output
+"""
+
+import os
+import json
+import time
+import pstats
+import cProfile
+import argparse
+import tracemalloc
+from contextlib import ContextDecorator, contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional
+
+class _Stage(ContextDecorator):
+    """One timed stage; usable as `with recorder.stage(name):` or `@recorder.stage(name)`"""
+
+    def __init__(self, recorder: 'StageRecorder', name: str):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.counters = self.recorder.read_counters()
+        if self.recorder.trace_memory:
+            self.memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        entry = {'name': self.name, 'seconds': round(seconds, 6), 'ok': exc_type is None}
+        if self.recorder.trace_memory:
+            entry['peak_memory_bytes'] = max(tracemalloc.get_traced_memory()[1] - self.memory, 0)
+        after = self.recorder.read_counters()
+        entry.update({name: after[name] - value for name, value in self.counters.items()})
+        self.recorder.stages.append(entry)
+        return False
+
+class StageRecorder:
+    """
+    Collects one entry per stage run, in order.
+
+    `counters` maps names to zero-argument callables returning running
+    totals; each stage records how much every total grew while it ran.
+    Memory tracing slows Python allocation noticeably, so it is opt-in.
+    """
+
+    def __init__(self, counters: Optional[Dict[str, Callable[[], int]]] = None, trace_memory: bool = False):
+        self.counters = counters or {}
+        self.trace_memory = trace_memory
+        self.stages: List[Dict] = []
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.start = time.perf_counter()
+        # Counters may be process-wide; totals are reported relative to this reading
+        self.baseline = self.read_counters()
+        # Only stop tracing in write() if it was not already on
+        self.started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+
+    def read_counters(self) -> Dict[str, int]:
+        return {name: read() for name, read in self.counters.items()}
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    def report(self, **extra) -> Dict:
+        """Stages plus counter totals since the recorder was created; extra keys are included as given"""
+        after = self.read_counters()
+        report = {
+            'started_at': self.started_at,
+            'total_seconds': round(time.perf_counter() - self.start, 6),
+            'stages': self.stages,
+            'totals': {name: after[name] - value for name, value in self.baseline.items()},
+        }
+        if self.trace_memory and tracemalloc.is_tracing():
+            report['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        report.update(extra)
+        return report
+
+    def write(self, path: str, **extra):
+        """Write report() as JSON (atomically) and stop memory tracing if this recorder started it"""
+        report = self.report(**extra)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        os.replace(f"{path}.tmp", path)
+        if self.started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self.started_tracing = False
+
+@contextmanager
+def profiled(path: Optional[str]) -> Iterator[None]:
+    """Run the block under cProfile and dump the stats to path (no-op when path is None)"""
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        pstats.Stats(profiler).dump_stats(path)
+
+def add_metrics_arguments(parser: argparse.ArgumentParser):
+    """Add the shared --metrics-json/--profile options to a script's parser"""
+    parser.add_argument('--metrics-json', metavar='PATH',
+                        help='Write per-stage time, peak memory and request counts to PATH as JSON')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='Write cProfile stats to PATH (view with: python -m pstats PATH)')
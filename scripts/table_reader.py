@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Paginated reads of whole Supabase tables
+PostgREST caps every response (1000 rows by default), so a bare
+select().execute() silently truncates large tables. iter_rows pages through
+a table with keyset pagination on id and yields rows one at a time, fetching
+the next page in the background while the current one is consumed
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Rows per request; matches the PostgREST default max-rows
+DEFAULT_PAGE_SIZE = 1000
+
+def _fetch_page(supabase, table: str, columns: str, where: Optional[Callable],
+                after_id: Optional[int], page_size: int) -> List[Dict]:
+    query = supabase.table(table).select(columns)
+    if where is not None:
+        query = where(query)
+    if after_id is not None:
+        query = query.gt('id', after_id)
+    return query.order('id').limit(page_size).execute().data
+
+def iter_rows(supabase, table: str, columns: str = '*', where: Optional[Callable] = None,
+              page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Dict]:
+    """
+    Yield every row of table matching `where`, in id order.
+
+    `where` receives the select query and returns it with filters applied,
+    e.g. lambda query: query.eq('type', 'video'). The id column is always
+    fetched for the cursor but only yielded if it was asked for. With
+    prefetch, the next page is requested on a worker thread while the
+    caller works through the current one, so at most two pages are held.
+    """
+    names = [name.strip() for name in columns.split(',')]
+    strip_id = '*' not in names and 'id' not in names
+    if strip_id:
+        columns = f"id, {columns}"
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        page = _fetch_page(supabase, table, columns, where, None, page_size)
+        while page:
+            pending = None
+            if len(page) == page_size:
+                args = (supabase, table, columns, where, page[-1]['id'], page_size)
+                pending = executor.submit(_fetch_page, *args) if executor else args
+
+            for row in page:
+                if strip_id:
+                    row = {key: value for key, value in row.items() if key != 'id'}
+                yield row
+
+            if pending is None:
+                return
+            page = pending.result() if executor else _fetch_page(*pending)
+    finally:
+        if executor:
+            # An abandoned generator leaves at most one request in flight
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def read_rows(supabase, table: str, columns: str = '*', where: Optional[Callable] = None,
+              page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> List[Dict]:
+    """Every matching row as a list (for callers that need random access)"""
+    return list(iter_rows(supabase, table, columns, where, page_size, prefetch))
@@ -17,7 +17,7 @@ scraper.parse_courses(soup)
 print(f"\nTotal courses after parsing: {len(scraper.courses)}")
 
 # Check for duplicate slugs
-slugs = [c['slug'] for c in scraper.courses]
+slugs = [c.slug for c in scraper.courses]
 slug_counts = Counter(slugs)
 
 duplicates = {slug: count for slug, count in slug_counts.items() if count > 1}
@@ -29,8 +29,8 @@ if duplicates:
 
     for slug, count in sorted(duplicates.items()):
         print(f"\nSlug: '{slug}' ({count} occurrences)")
-        matching_courses = [c for c in scraper.courses if c['slug'] == slug]
+        matching_courses = [c for c in scraper.courses if c.slug == slug]
         for course in matching_courses:
-            print(f"  - ID {course['id']}: {course['title']}")
+            print(f"  - ID {course.id}: {course.title}")
 else:
     print("\nNo duplicate slugs in scraped data!")
@@ -0,0 +1,52 @@
+"""sync_mirror against fake_supabase, including rows with no updated_at"""
+
+import sqlite3
+
+import pytest
+
+import catalog_mirror
+from catalog_mirror import sync_mirror
+from fake_supabase import FakeSupabase
+
+STAMP = '2026-10-01T12:00:00+00:00'
+
+def course_row(course_id: int, updated_at) -> dict:
+    return {'id': course_id, 'title': f"Course {course_id}", 'slug': f"course-{course_id}", 'category_id': 1,
+            'purchase_url': f"https://example.test/{course_id}", 'updated_at': updated_at}
+
+@pytest.fixture
+def fake(monkeypatch) -> FakeSupabase:
+    # Small pages so the cursors cross page boundaries
+    monkeypatch.setattr(catalog_mirror, 'PAGE_SIZE', 2)
+    fake = FakeSupabase()
+    # Pages of the timestamp pass would end on NULL rows if they were included
+    fake.load('courses', [course_row(course_id, None if course_id % 3 == 0 else STAMP)
+                          for course_id in range(1, 10)])
+    return fake
+
+def mirrored(path: str, table: str):
+    conn = sqlite3.connect(path)
+    try:
+        return [row[0] for row in conn.execute(f'SELECT title FROM {table} ORDER BY id')]
+    finally:
+        conn.close()
+
+def test_sync_mirrors_rows_without_updated_at(fake, tmp_path):
+    path = str(tmp_path / 'catalog.sqlite')
+    client = fake.client(retries=0)
+
+    results = sync_mirror(client, path)
+    assert results['courses']['fetched'] == 9
+    assert results['courses']['high_water'] == STAMP
+    assert mirrored(path, 'courses') == [f"Course {course_id}" for course_id in range(1, 10)]
+
+    # Incremental: the unstamped rows are always re-read, plus rows at or past the high-water mark
+    client.table('courses').update({'title': 'Renamed'}).eq('id', 4).execute()
+    results = sync_mirror(client, path)
+    assert results['courses']['fetched'] == 3 + 6
+    assert mirrored(path, 'courses')[3] == 'Renamed'
+
+    client.table('courses').delete().eq('id', 6).execute()
+    results = sync_mirror(client, path)
+    assert results['courses']['deleted'] == 1
+    assert len(mirrored(path, 'courses')) == 8
@@ -0,0 +1,41 @@
+"""catalog_report.fetch_counts with and without the catalog_counts view"""
+
+from catalog_report import count_catalog, fetch_counts
+from fake_supabase import FakeSupabase
+
+def make_fake() -> FakeSupabase:
+    fake = FakeSupabase()
+    fake.load('courses', [{'id': course_id, 'title': f"Course {course_id}", 'slug': f"course-{course_id}",
+                           'category_id': 1 if course_id < 4 else 3,
+                           'purchase_url': f"https://example.test/{course_id}"}
+                          for course_id in range(1, 6)])
+    # Every course has a video; the last one has no PDF
+    fake.load('course_assets', [{'course_id': course_id, 'type': asset_type,
+                                 'url': f"https://example.test/{asset_type}/{course_id}"}
+                                for course_id in range(1, 6) for asset_type in ('video', 'pdf')][:-1])
+    return fake
+
+def test_paginated_counts_match_the_view():
+    fake = make_fake()
+    client = fake.client(retries=0)
+    counts = fetch_counts(client)
+
+    assert counts['courses'] == 5
+    assert counts['assets'] == 9
+    assert counts['asset_types'] == {'video': 5, 'pdf': 4}
+    assert [(category['name'], category['total']) for category in counts['categories']] == [
+        ('Health & Safety', 3), ('Business Skills', 0), ('Health & Social Care', 2),
+        ('Mental Health & Wellbeing', 0), ('Hospitality', 0)]
+    assert count_catalog(client) == counts
+
+def test_missing_view_falls_back_to_paginated_counts(capsys):
+    fake = make_fake()
+    client = fake.client(retries=0)
+    expected = fetch_counts(client)
+
+    # A database without supabase/migrations/003_catalog_counts.sql
+    fake.conn.execute('DROP VIEW catalog_counts')
+    del fake.columns['catalog_counts']
+
+    assert fetch_counts(client) == expected
+    assert '[WARN] catalog_counts view not found' in capsys.readouterr().out
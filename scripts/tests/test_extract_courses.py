@@ -0,0 +1,52 @@
+"""
+extract_courses() and StreamingExtractor.courses() against the original
+parse_courses() loop
+
+fixtures/admin_page.html is a trimmed admin page covering the layouts the
+extractors have to handle (headers in h2/h3/p/div, nested containers,
+title fallbacks, duplicates, missing nid). fixtures/admin_page_courses.json
+is what the original nested-scan parse_courses() produced for it.
+"""
+
+import json
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+import scrape_videotile
+from scrape_videotile import extract_courses, stream_extract
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def course_fields(course) -> dict:
+    return {
+        'id': course.id,
+        'title': course.title,
+        'slug': course.slug,
+        'category': course.category,
+        'category_id': course.suite_id,
+        'purchase_url': course.purchase_url,
+        'free_trial_url': course.free_trial_url,
+    }
+
+@pytest.fixture(scope='module')
+def page() -> bytes:
+    with open(os.path.join(FIXTURES, 'admin_page.html'), 'rb') as f:
+        return f.read()
+
+@pytest.fixture(scope='module')
+def expected() -> list:
+    with open(os.path.join(FIXTURES, 'admin_page_courses.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+def test_extract_courses_matches_original(page, expected):
+    courses = extract_courses(BeautifulSoup(page, 'lxml'))
+    assert [course_fields(course) for course in courses] == expected
+
+@pytest.mark.parametrize('chunk_size', [64 * 1024, 7])
+def test_streaming_extractor_matches_original(page, expected, chunk_size, monkeypatch):
+    # Small chunks split tags and text across feed() calls
+    monkeypatch.setattr(scrape_videotile, 'STREAM_CHUNK_SIZE', chunk_size)
+    courses = stream_extract(page).courses()
+    assert [course_fields(course) for course in courses] == expected
@@ -0,0 +1,214 @@
+"""
+fake_supabase through the real supabase-py client, and scripts run against it
+
+clear_courses.py runs as a subprocess through db_client's FAKE_SUPABASE_DB
+hook; fix_videos_simple.main() runs in-process on a fake client.
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+
+import fix_videos_simple
+from fake_supabase import FAKE_URL, FakeSupabase
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def course_row(course_id: int, category_id: int = 1, **overrides) -> dict:
+    row = {
+        'id': course_id,
+        'title': f"Course {course_id}",
+        'slug': f"course-{course_id}",
+        'category_id': category_id,
+        'purchase_url': f"https://videotilehost.com/hamptonsafety/purchaseCourse.php?nid={course_id}",
+    }
+    row.update(overrides)
+    return row
+
+def asset_row(course_id: int, asset_type: str = 'video', url: str = None) -> dict:
+    return {'course_id': course_id, 'type': asset_type,
+            'url': url or f"https://videotilehost.com/embed/{course_id}", 'label': None}
+
+def seed(fake: FakeSupabase, courses: int = 6):
+    fake.load('courses', [course_row(course_id, course_id % 5 + 1) for course_id in range(1, courses + 1)])
+    fake.load('course_assets', [asset_row(course_id) for course_id in range(1, courses + 1)]
+              + [asset_row(course_id, 'pdf', f"https://videotilehost.com/common/courses/info_{course_id}.pdf")
+                 for course_id in range(1, courses + 1)])
+
+@pytest.fixture
+def fake() -> FakeSupabase:
+    fake = FakeSupabase()
+    seed(fake)
+    return fake
+
+# ============================================================================
+# Constraints and counts
+# ============================================================================
+
+@pytest.mark.parametrize('table, row, code', [
+    ('courses', course_row(1, slug='course-2'), '23505'),              # duplicate slug
+    ('courses', course_row(99, category_id=42), '23503'),              # unknown category
+    ('courses', course_row(99, title=None), '23502'),                  # missing title
+    ('courses', course_row(99, title='x' * 501), '22001'),             # VARCHAR(500)
+    ('course_assets', asset_row(99), '23503'),                         # unknown course
+    ('course_assets', asset_row(1, 'audio'), '23514'),                 # type check
+])
+def test_constraint_errors(fake, table, row, code):
+    client = fake.client(retries=0)
+    before = fake.rows(table)
+    with pytest.raises(APIError) as error:
+        client.table(table).upsert(row).execute()
+    assert error.value.code == code
+    assert fake.rows(table) == before
+
+def test_failed_batch_is_rolled_back(fake):
+    client = fake.client(retries=0)
+    with pytest.raises(APIError):
+        client.table('courses').upsert([course_row(50), course_row(51, slug='course-1')]).execute()
+    assert 50 not in [row['id'] for row in fake.rows('courses')]
+
+def test_exact_counts(fake):
+    client = fake.client(retries=0)
+    result = client.table('course_assets').select('id', count='exact').eq('type', 'video').limit(1).execute()
+    assert result.count == 6
+    assert len(result.data) == 1
+
+    with httpx.Client(transport=fake, base_url=FAKE_URL) as http:
+        response = http.get('/rest/v1/courses', params={'select': 'id', 'offset': '2', 'limit': '3'},
+                            headers={'Prefer': 'count=exact'})
+        assert response.headers['Content-Range'] == '2-4/6'
+        response = http.get('/rest/v1/courses', params={'select': 'id', 'id': 'gt.100'},
+                            headers={'Prefer': 'count=exact'})
+        assert response.headers['Content-Range'] == '*/0'
+
+    deleted = client.table('course_assets').delete(count='exact', returning='minimal') \
+        .eq('type', 'pdf').execute()
+    assert deleted.count == 6
+    assert deleted.data == []
+
+def test_unfiltered_delete_is_refused(fake):
+    client = fake.client(retries=0)
+    with pytest.raises(APIError) as error:
+        client.table('courses').delete().execute()
+    assert error.value.code == '21000'
+    assert len(fake.rows('courses')) == 6
+
+# ============================================================================
+# reset_course_data RPC
+# ============================================================================
+
+class FailingConnection:
+    """sqlite3 connection whose statements matching `fail_on` raise"""
+
+    def __init__(self, conn: sqlite3.Connection, fail_on: str):
+        self.conn = conn
+        self.fail_on = fail_on
+
+    def execute(self, sql: str, *args):
+        if sql.startswith(self.fail_on):
+            raise sqlite3.OperationalError('database is locked')
+        return self.conn.execute(sql, *args)
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+def test_rpc_reset_course_data(fake):
+    result = fake.client(retries=0).rpc('reset_course_data').execute()
+    assert result.data == [{'assets_deleted': 12, 'courses_deleted': 6}]
+    assert fake.rows('courses') == []
+    assert fake.rows('course_assets') == []
+
+def test_rpc_failure_rolls_back(fake):
+    client = fake.client(retries=0)
+    conn = fake.conn
+    fake.conn = FailingConnection(conn, 'DELETE FROM courses')
+    with pytest.raises(sqlite3.OperationalError):
+        client.rpc('reset_course_data').execute()
+    fake.conn = conn
+
+    # Nothing was deleted and the connection is out of the transaction
+    assert len(fake.rows('course_assets')) == 12
+    assert len(fake.rows('courses')) == 6
+    client.table('courses').upsert(course_row(7)).execute()
+    assert len(fake.rows('courses')) == 7
+
+# ============================================================================
+# Scripts
+# ============================================================================
+
+def run_script(tmp_path, *args):
+    path = str(tmp_path / 'catalog.sqlite')
+    env = dict(os.environ, FAKE_SUPABASE_DB=path)
+    return subprocess.run([sys.executable, *args], cwd=SCRIPTS_DIR, env=env,
+                          capture_output=True, text=True, timeout=60)
+
+@pytest.mark.parametrize('args', [[], ['--rpc']])
+def test_clear_courses(tmp_path, args):
+    fake = FakeSupabase(str(tmp_path / 'catalog.sqlite'))
+    seed(fake)
+    fake.conn.close()
+
+    result = run_script(tmp_path, 'clear_courses.py', *args)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "Courses: 6\n  Assets: 12" in result.stdout
+    assert "Deleted 12 assets and 6 courses" in result.stdout
+    assert "Courses: 0\n  Assets: 0" in result.stdout
+    assert '[WARN]' not in result.stdout
+
+    fake = FakeSupabase(str(tmp_path / 'catalog.sqlite'))
+    assert fake.rows('courses') == []
+    assert len(fake.rows('categories')) == 5
+
+def use_fake_client(monkeypatch, fake: FakeSupabase):
+    """Run fix_videos_simple.main() with no options against fake"""
+    monkeypatch.setattr(sys, 'argv', ['fix_videos_simple.py'])
+    monkeypatch.setattr(fix_videos_simple, 'client_from_args', lambda args: fake.client(retries=0))
+
+def test_fix_videos_simple(fake, monkeypatch, capsys):
+    use_fake_client(monkeypatch, fake)
+    monkeypatch.setattr('builtins.input', lambda prompt: 'yes')
+
+    fix_videos_simple.main()
+    output = capsys.readouterr().out
+
+    videos = [row for row in fake.rows('course_assets') if row['type'] == 'video']
+    assert sorted(row['course_id'] for row in videos) == list(range(1, 7))
+    assert len([row for row in fake.rows('course_assets') if row['type'] == 'pdf']) == 6
+    assert "Total video assets: 6" in output
+    assert '[WARN]' not in output and '[ERROR]' not in output
+    # Request stats are only printed with --db-stats
+    assert 'Database requests' not in output
+
+def test_fix_videos_simple_keeps_old_videos_when_an_insert_fails(fake, monkeypatch, capsys):
+    use_fake_client(monkeypatch, fake)
+    monkeypatch.setattr('builtins.input', lambda prompt: 'yes')
+    before = fake.rows('course_assets')
+    fake.fail_next(500, when=lambda request: request.method == 'POST'
+                   and request.url.path.endswith('/course_assets'))
+
+    with pytest.raises(SystemExit) as exit_info:
+        fix_videos_simple.main()
+    assert exit_info.value.code == 1
+    assert '[ERROR] 1 insert batches failed - keeping existing videos' in capsys.readouterr().out
+    assert fake.rows('course_assets') == before
+
+def test_fix_videos_simple_fails_when_old_videos_are_left(fake, monkeypatch, capsys):
+    use_fake_client(monkeypatch, fake)
+    monkeypatch.setattr('builtins.input', lambda prompt: 'yes')
+    old_ids = [row['id'] for row in fake.rows('course_assets') if row['type'] == 'video']
+    fake.fail_next(500, when=lambda request: request.method == 'DELETE'
+                   and request.url.path.endswith('/course_assets'))
+
+    with pytest.raises(SystemExit) as exit_info:
+        fix_videos_simple.main()
+    assert exit_info.value.code == 1
+
+    output = capsys.readouterr().out
+    assert '[ERROR] Expected 6 video assets, found 12 (1 delete batches failed)' in output
+    assert f"6 old video assets were not removed: {', '.join(map(str, old_ids))}" in output
+    assert 'FIX COMPLETE!' not in output
@@ -0,0 +1,113 @@
+"""
+LinkChecker status classification and caching, over httpx.MockTransport,
+and dead links removed from the database on save (fake_supabase)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from asset_reconciler import load_assets_by_course
+from course_records import AssetRecord, CourseIndex, CourseRecord
+from fake_supabase import FakeSupabase
+from link_checker import LinkChecker, course_urls, mark_dead_links
+from scrape_videotile import VideoTileScraper, course_assets
+
+BASE = 'https://example.test'
+
+def handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path == '/ok':
+        return httpx.Response(200)
+    if path == '/missing':
+        return httpx.Response(404)
+    if path == '/gone':
+        return httpx.Response(410)
+    if path == '/unavailable':
+        return httpx.Response(503)
+    if path == '/throttled':
+        return httpx.Response(429)
+    if path == '/slow':
+        raise httpx.ReadTimeout('timed out', request=request)
+    return httpx.Response(500)
+
+def check(tmp_path, paths):
+    checker = LinkChecker(cache_file=str(tmp_path / 'links.json'), transport=httpx.MockTransport(handler))
+    return checker, checker.check(f"{BASE}{path}" for path in paths)
+
+def test_status_classification(tmp_path):
+    _, results = check(tmp_path, ['/ok', '/missing', '/gone', '/unavailable', '/throttled', '/slow'])
+    ok = {url[len(BASE):]: result['ok'] for url, result in results.items()}
+    assert ok == {'/ok': True, '/missing': False, '/gone': False,
+                  '/unavailable': None, '/throttled': None, '/slow': None}
+    assert results[f"{BASE}/unavailable"]['status'] == 503
+    assert results[f"{BASE}/unavailable"]['error'] == 'HTTP 503'
+    assert results[f"{BASE}/throttled"]['error'] == 'HTTP 429'
+    assert results[f"{BASE}/slow"]['status'] is None
+    assert results[f"{BASE}/slow"]['error'] == 'GET: ReadTimeout'
+
+def test_only_definite_answers_are_cached(tmp_path):
+    paths = ['/ok', '/missing', '/unavailable', '/throttled', '/slow']
+    checker, _ = check(tmp_path, paths)
+    assert sorted(url[len(BASE):] for url in checker.cache) == ['/missing', '/ok']
+
+    # A second run reuses the cached answers and re-checks the unknown ones
+    checker, _ = check(tmp_path, paths)
+    assert checker.stats['cached'] == 2
+    assert checker.stats['checked'] == 3
+
+def test_unknown_results_keep_assets(tmp_path):
+    course = CourseRecord(1, 'Fire Safety', icon_url=f"{BASE}/unavailable", assets=[
+        AssetRecord('video', f"{BASE}/ok"),
+        AssetRecord('video', f"{BASE}/missing"),
+        AssetRecord('pdf', f"{BASE}/throttled"),
+        AssetRecord('pdf', f"{BASE}/slow"),
+    ])
+    _, results = check(tmp_path, [course.icon_url[len(BASE):]] + [asset.url[len(BASE):] for asset in course.assets])
+    counts = mark_dead_links([course], results)
+    assert counts == {'dead_icons': 0, 'dead_assets': 1, 'unknown': 3}
+    assert course.icon_url == f"{BASE}/unavailable"
+    assert [asset.url[len(BASE):] for asset in course.assets] == ['/ok', '/throttled', '/slow']
+
+def seeded_fake(course: CourseRecord) -> FakeSupabase:
+    """Fake database holding course with the assets a previous sync stored for it"""
+    fake = FakeSupabase()
+    fake.load('courses', [course.to_payload(course.suite_id)])
+    fake.load('course_assets', [asset.to_payload(course.id) for asset in course_assets(course)])
+    return fake
+
+def dead_course() -> CourseRecord:
+    """A course whose icon and assets all answered 404"""
+    course = CourseRecord(7, 'Fire Safety', slug='fire-safety-7', suite_id=1,
+                          purchase_url='https://videotilehost.com/hamptonsafety/purchaseCourse.php?nid=7',
+                          icon_url='https://videotilehost.com/common/course-icons/course7.png')
+    course.assets = course_assets(course)
+    results = {url: {'url': url, 'ok': False, 'status': 404, 'error': None, 'checked_at': 0}
+               for url in course_urls([course])}
+    assert mark_dead_links([course], results) == {'dead_icons': 1, 'dead_assets': 2, 'unknown': 0}
+    assert course.assets == []
+    return course
+
+def test_dead_assets_are_deleted_on_save(capsys):
+    course = dead_course()
+    fake = seeded_fake(course)
+    assert len(fake.rows('course_assets')) == 2
+
+    scraper = VideoTileScraper(supabase_client=fake.client(retries=0))
+    scraper.courses = CourseIndex([course])
+    assert scraper.save_to_supabase() == {7}
+
+    assert fake.rows('course_assets') == []
+    assert fake.rows('courses')[0]['icon_url'] is None
+    assert '0 to insert, 0 to update, 2 to delete' in capsys.readouterr().out
+
+def test_dead_assets_are_deleted_by_a_pipelined_batch():
+    course = dead_course()
+    fake = seeded_fake(course)
+
+    scraper = VideoTileScraper(supabase_client=fake.client(retries=0), pipelined=True)
+    scraper.stored_assets = ThreadPoolExecutor(max_workers=1).submit(load_assets_by_course, scraper.supabase)
+    result = scraper.write_course_batch([{'course': course, 'category_id': 1}])
+
+    assert (result['deleted'], result['errors'], result['asset_course_ids']) == (2, [], [7])
+    assert fake.rows('course_assets') == []
@@ -0,0 +1,133 @@
+"""
+PipelinedWriter and the pipelined scraper save against fake_supabase
+
+Injected failures are tied to a batch's rows (fail_next's `when`), so the
+same batch fails whichever writer thread sends it; jittered latency shuffles
+the order the writers finish in between runs.
+"""
+
+import json
+
+from batch_writer import PipelinedWriter, write_in_batches
+from course_records import CourseIndex, CourseRecord
+from fake_supabase import FakeSupabase, LatencyModel
+from scrape_videotile import VideoTileScraper, course_assets
+
+BATCH_SIZE = 5
+COURSE_IDS = list(range(1, 24))
+FAILING_IDS = (7, 18)   # batches 2 and 4
+
+def course_upsert_with(course_id: int):
+    """Matches the courses upsert whose payload contains course_id"""
+    def when(request) -> bool:
+        return (request.method == 'POST' and request.url.path.endswith('/courses')
+                and any(row['id'] == course_id for row in json.loads(request.content)))
+    return when
+
+def make_fake(seed: int = 0) -> FakeSupabase:
+    fake = FakeSupabase(latency=LatencyModel(base=0.001, jitter=0.004, seed=seed))
+    for course_id in FAILING_IDS:
+        fake.fail_next(503, when=course_upsert_with(course_id))
+    return fake
+
+def make_courses():
+    return [CourseRecord(course_id, f"Course {course_id}", slug=f"course-{course_id}",
+                         suite_id=course_id % 5 + 1,
+                         purchase_url=f"https://videotilehost.com/hamptonsafety/purchaseCourse.php?nid={course_id}")
+            for course_id in COURSE_IDS]
+
+def table_contents(fake: FakeSupabase, table: str, columns):
+    return sorted(tuple(row[column] for column in columns) for row in fake.rows(table))
+
+def error_lines(output: str):
+    return [line for line in output.splitlines() if '[ERROR]' in line]
+
+# ============================================================================
+# PipelinedWriter
+# ============================================================================
+
+def course_rows():
+    return [course.to_payload(course.suite_id) for course in make_courses()]
+
+def comparable(stats):
+    return {key: value for key, value in stats.items() if key not in ('seconds', 'results')}
+
+def test_pipelined_writer_matches_write_in_batches(capsys):
+    fake = make_fake()
+    client = fake.client(retries=0)
+    expected = write_in_batches('courses', course_rows(),
+                                lambda batch: client.table('courses').upsert(batch).execute(), BATCH_SIZE)
+    expected_output = capsys.readouterr().out
+    expected_rows = table_contents(fake, 'courses', ('id', 'title'))
+
+    assert expected['errors'] == 2
+    assert [row['id'] for row in expected['failed_rows']] == [6, 7, 8, 9, 10, 16, 17, 18, 19, 20]
+
+    for seed in range(5):
+        fake = make_fake(seed)
+        client = fake.client(retries=0)
+        writer = PipelinedWriter('courses', lambda batch: client.table('courses').upsert(batch).execute(),
+                                 BATCH_SIZE, workers=4)
+        for row in course_rows():
+            writer.put(row)
+        stats = writer.close()
+
+        assert comparable(stats) == comparable(expected)
+        assert capsys.readouterr().out == expected_output
+        assert table_contents(fake, 'courses', ('id', 'title')) == expected_rows
+
+# ============================================================================
+# Scraper save
+# ============================================================================
+
+def make_scraper(fake: FakeSupabase, pipelined: bool) -> VideoTileScraper:
+    scraper = VideoTileScraper(supabase_client=fake.client(retries=0), batch_size=BATCH_SIZE,
+                               pipelined=pipelined, writers=4)
+    scraper.courses = CourseIndex(make_courses())
+    return scraper
+
+def save_sequential(fake: FakeSupabase):
+    scraper = make_scraper(fake, pipelined=False)
+    for course in scraper.courses:
+        course.assets = course_assets(course)
+    return scraper.save_to_supabase()
+
+def save_pipelined(fake: FakeSupabase):
+    scraper = make_scraper(fake, pipelined=True)
+    scraper.start_pipeline()
+    return scraper.finish_pipeline()
+
+def test_pipelined_save_matches_save_to_supabase(capsys):
+    fake = make_fake()
+    expected_ids = save_sequential(fake)
+    expected_errors = error_lines(capsys.readouterr().out)
+    expected_courses = table_contents(fake, 'courses', ('id', 'title', 'slug', 'category_id'))
+    expected_assets = table_contents(fake, 'course_assets', ('course_id', 'type', 'url', 'label'))
+
+    assert expected_ids == set(COURSE_IDS) - set(range(6, 11)) - set(range(16, 21))
+    assert len(expected_errors) == 2
+
+    for seed in range(3):
+        fake = make_fake(seed)
+        assert save_pipelined(fake) == expected_ids
+        assert error_lines(capsys.readouterr().out) == expected_errors
+        assert table_contents(fake, 'courses', ('id', 'title', 'slug', 'category_id')) == expected_courses
+        assert table_contents(fake, 'course_assets', ('course_id', 'type', 'url', 'label')) == expected_assets
+
+def test_pipelined_asset_load_failure_is_an_asset_error(capsys):
+    fake = FakeSupabase()
+    # 500, not 503: postgrest-py repeats GETs answered 503 on its own
+    fake.fail_next(500, when=lambda request: request.method == 'GET'
+                   and request.url.path.endswith('/course_assets'))
+
+    saved_ids = save_pipelined(fake)
+    output = capsys.readouterr().out
+
+    # Every course is written, but none is reported saved since its assets were not
+    assert saved_ids == set()
+    assert [row['id'] for row in fake.rows('courses')] == COURSE_IDS
+    assert fake.rows('course_assets') == []
+    assert output.count('[ERROR] course_assets load failed') == 5
+    assert 'Saved 23 courses' in output
+    assert '(5 failed batches)' in output
+    assert '[ERROR] courses batch' not in output
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Shared title normalization for the VideoTile scripts
+Precompiled patterns and memoized normalize_title/slugify/expand_aliases,
+used by the scraper and the diagnostic scripts
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Alias table for matching course titles to icon labels
+ICON_ALIASES: Dict[str, str] = {
+    'dse': 'display screen equipment',
+    'display screen equipment': 'assessing display screen equipment',
+    'nvq': 'nvq',
+    'food hygiene': 'food safety',
+    'cyber security': 'cybersecurity',
+    'h&s': 'health and safety',
+    'mental health': 'mental health awareness',
+    'first aid': 'emergency first aid',
+}
+
+# Enough for every title and paragraph on the admin page several times over
+CACHE_SIZE = 8192
+
+_PUNCTUATION = re.compile(r'[^\w\s\-&]')
+_WHITESPACE = re.compile(r'\s+')
+_SLUG_SEPARATORS = re.compile(r'[\s_]+')
+_SLUG_INVALID = re.compile(r'[^\w\-]')
+_SLUG_HYPHENS = re.compile(r'\-+')
+
+# Every alias and expansion in one pattern. The lookahead reports the longest
+# key starting at each position; shorter keys that are substrings of a found
+# key are added from _CONTAINED_KEYS, so together they find every key present.
+_ALIAS_KEYS = sorted(set(ICON_ALIASES) | set(ICON_ALIASES.values()), key=len, reverse=True)
+_ALIAS_PATTERN = re.compile('(?=(' + '|'.join(re.escape(key) for key in _ALIAS_KEYS) + '))')
+_CONTAINED_KEYS = {key: [other for other in _ALIAS_KEYS if other != key and other in key] for key in _ALIAS_KEYS}
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_title(title: str) -> str:
+    """Normalize title for matching: lowercase, trim, collapse spaces, remove punctuation"""
+    normalized = title.lower().strip()
+    # Remove punctuation except hyphens and ampersands
+    normalized = _PUNCTUATION.sub('', normalized)
+    # Collapse multiple spaces
+    normalized = _WHITESPACE.sub(' ', normalized)
+    return normalized
+
+@lru_cache(maxsize=CACHE_SIZE)
+def slugify(title: str) -> str:
+    """Convert title to URL-friendly kebab-case slug"""
+    slug = title.lower().strip()
+    # Replace spaces and underscores with hyphens
+    slug = _SLUG_SEPARATORS.sub('-', slug)
+    # Remove non-alphanumeric characters except hyphens
+    slug = _SLUG_INVALID.sub('', slug)
+    # Remove leading/trailing hyphens
+    slug = slug.strip('-')
+    # Collapse multiple hyphens
+    slug = _SLUG_HYPHENS.sub('-', slug)
+    return slug
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _alias_variants(text: str) -> Tuple[str, ...]:
+    found = set()
+    for match in _ALIAS_PATTERN.finditer(text):
+        key = match.group(1)
+        found.add(key)
+        found.update(_CONTAINED_KEYS[key])
+
+    if not found:
+        return (text,)
+
+    variants = {text}
+    for alias, expansion in ICON_ALIASES.items():
+        if alias in found:
+            variants.add(text.replace(alias, expansion))
+        if expansion in found:
+            variants.add(text.replace(expansion, alias))
+    return tuple(variants)
+
+def expand_aliases(text: str) -> List[str]:
+    """Expand text with known aliases for better matching"""
+    return list(_alias_variants(text))
+
+def clear_caches():
+    """Drop memoized results (e.g. between benchmark runs)"""
+    normalize_title.cache_clear()
+    slugify.cache_clear()
+    _alias_variants.cache_clear()
@@ -7,7 +7,9 @@ Run this before executing the scraper to ensure everything is set up correctly
 import os
 import sys
 from dotenv import load_dotenv
-from supabase import create_client
+
+from db_client import create_pooled_client
+from table_reader import read_rows
 
 # Load environment variables
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -39,7 +41,7 @@ def validate_connection():
     # Initialize Supabase client
     print("2. Connecting to Supabase...")
     try:
-        supabase = create_client(supabase_url, supabase_key)
+        supabase = create_pooled_client(supabase_url, supabase_key)
         print("   [OK] Supabase client initialized successfully")
         print()
     except Exception as e:
@@ -49,8 +51,7 @@ def validate_connection():
     # Test categories table
     print("3. Validating 'categories' table...")
     try:
-        response = supabase.table('categories').select('*').execute()
-        categories = response.data
+        categories = read_rows(supabase, 'categories')
 
         if len(categories) == 0:
             print("   [!] Categories table exists but is empty")
@@ -93,7 +94,7 @@ def validate_connection():
         print(f"   [OK] Courses table exists")
 
         # Check if empty (expected before scraping)
-        count_response = supabase.table('courses').select('id', count='exact').execute()
+        count_response = supabase.table('courses').select('id', count='exact').limit(1).execute()
         course_count = count_response.count if count_response.count else 0
 
         if course_count == 0:
@@ -0,0 +1,32 @@
+-- Bulk reset of scraped course data
+-- Created: 2026-10-18
+-- Purpose: Let scripts/clear_courses.py --rpc wipe courses and assets in one request
+
+-- =====================================================
+-- RESET FUNCTION
+-- =====================================================
+-- Runs as a single transaction: either both tables are emptied or neither is.
+-- Categories (seed data) are left alone.
+CREATE OR REPLACE FUNCTION reset_course_data()
+RETURNS TABLE (assets_deleted BIGINT, courses_deleted BIGINT) AS $$
+DECLARE
+  deleted_assets BIGINT;
+  deleted_courses BIGINT;
+BEGIN
+  -- Assets first (foreign key constraint)
+  DELETE FROM course_assets WHERE id IS NOT NULL;
+  GET DIAGNOSTICS deleted_assets = ROW_COUNT;
+
+  DELETE FROM courses WHERE id IS NOT NULL;
+  GET DIAGNOSTICS deleted_courses = ROW_COUNT;
+
+  RETURN QUERY SELECT deleted_assets, deleted_courses;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION reset_course_data() IS 'Delete all courses and course assets in one transaction (used before a full re-scrape)';
+
+-- Only the service role (Python scripts) may reset the catalogue
+REVOKE EXECUTE ON FUNCTION reset_course_data() FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION reset_course_data() FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION reset_course_data() TO service_role;
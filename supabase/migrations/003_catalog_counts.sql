@@ -0,0 +1,28 @@
+-- Catalogue counts for the health-check scripts
+-- Created: 2026-10-18
+-- Purpose: Course counts per category and asset counts per type in a single query
+
+-- =====================================================
+-- CATALOG_COUNTS VIEW
+-- =====================================================
+-- One row per (kind, name):
+--   category   - courses in each category (sort_key = categories.id)
+--   asset_type - course_assets rows of each type
+--   courses    - total courses
+--   assets     - total course_assets rows
+CREATE OR REPLACE VIEW catalog_counts
+WITH (security_invoker = true) AS
+SELECT 'category'::TEXT AS kind, cat.id AS sort_key, cat.name::TEXT AS name, COUNT(c.id) AS total
+FROM categories cat
+LEFT JOIN courses c ON c.category_id = cat.id
+GROUP BY cat.id, cat.name
+UNION ALL
+SELECT 'asset_type', NULL::INTEGER, a.type::TEXT, COUNT(*)
+FROM course_assets a
+GROUP BY a.type
+UNION ALL
+SELECT 'courses', NULL::INTEGER, 'total', COUNT(*) FROM courses
+UNION ALL
+SELECT 'assets', NULL::INTEGER, 'total', COUNT(*) FROM course_assets;
+
+COMMENT ON VIEW catalog_counts IS 'Course and asset counts for scripts/catalog_report.py (one round trip)';
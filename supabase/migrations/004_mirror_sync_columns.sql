@@ -0,0 +1,26 @@
+-- Change tracking for the local catalogue mirror
+-- Created: 2026-10-18
+-- Purpose: Give every mirrored table an updated_at high-water mark for scripts/catalog_mirror.py
+
+-- =====================================================
+-- COURSE_ASSETS.UPDATED_AT
+-- =====================================================
+-- Asset labels are updated in place by the scraper's reconcile step, so
+-- created_at alone cannot tell the mirror which rows changed.
+-- Existing rows are stamped with the migration time.
+ALTER TABLE course_assets ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+
+COMMENT ON COLUMN course_assets.updated_at IS 'Last insert/update time (mirror sync high-water mark)';
+
+DROP TRIGGER IF EXISTS update_course_assets_updated_at ON course_assets;
+CREATE TRIGGER update_course_assets_updated_at
+  BEFORE UPDATE ON course_assets
+  FOR EACH ROW
+  EXECUTE FUNCTION update_updated_at_column();
+
+-- =====================================================
+-- SYNC INDEXES
+-- =====================================================
+-- The mirror pages through changed rows ordered by (updated_at, id)
+CREATE INDEX IF NOT EXISTS idx_courses_updated_at ON courses(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_course_assets_updated_at ON course_assets(updated_at, id);